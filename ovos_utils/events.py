@@ -1,7 +1,12 @@
+import heapq
+import math
 import time
 from datetime import datetime, timedelta
 from inspect import signature
-from typing import Callable, Optional, Union
+from itertools import count
+from threading import Condition, Lock, Thread, Timer, current_thread
+from time import monotonic
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
 
 from ovos_utils.fakebus import FakeMessage as Message, FakeBus, dig_for_message
 from ovos_utils.file_utils import to_alnum
@@ -17,13 +22,24 @@ def unmunge_message(message, skill_id: str):
     Returns:
         Message without clear keywords
     """
+    return _unmunge_message(message, to_alnum(skill_id))
+
+
+def _unmunge_message(message, prefix: str):
+    """
+    Restore message keywords by removing an already letterified skill ID.
+    Args:
+        message (Message): Intent result message
+        prefix (str): letterified skill identifier
+    Returns:
+        Message without clear keywords
+    """
     if isinstance(message, Message) and \
             isinstance(message.data, dict):
-        skill_id = to_alnum(skill_id)
         for key in list(message.data.keys()):
-            if key.startswith(skill_id):
+            if key.startswith(prefix):
                 # replace the munged key with the real one
-                new_key = key[len(skill_id):]
+                new_key = key[len(prefix):]
                 message.data[new_key] = message.data.pop(key)
 
     return message
@@ -45,6 +61,18 @@ def get_handler_name(handler: Callable) -> str:
         return handler.__name__
 
 
+def _count_parameters(func: Callable) -> Optional[int]:
+    """
+    Count the parameters of a callable, used to decide how to call it
+    @param func: callable to inspect
+    @return: number of parameters, None if the signature can't be inspected
+    """
+    try:
+        return len(signature(func).parameters)
+    except (TypeError, ValueError):
+        return None
+
+
 def create_wrapper(handler: Callable[..., None],
                    skill_id: str,
                    on_start: Callable[..., None],
@@ -56,6 +84,9 @@ def create_wrapper(handler: Callable[..., None],
     This wrapper handles things like metrics, reporting handler start/stop
     and errors.
 
+    The signatures of `handler` and `on_error` are inspected once here, not
+    for every message the wrapper handles.
+
     @param handler: method/function to call
     @param skill_id: skill_id for associated skill
     @param on_start: function to call before executing the handler. Called
@@ -65,27 +96,59 @@ def create_wrapper(handler: Callable[..., None],
         exception, and optionally the Message associated with the exception
     @return: callable implementing the passed methods
     """
+    prefix = to_alnum(skill_id)
+    no_args = _count_parameters(handler) == 0
+
+    if not on_error:
+        def report_error(e, message):
+            pass
+    elif _count_parameters(on_error) == 2:
+        report_error = on_error
+    else:
+        def report_error(e, message):
+            on_error(e)
 
-    def wrapper(message):
-        try:
-            message = unmunge_message(message, skill_id)
-            if on_start:
-                on_start(message)
-
-            if len(signature(handler).parameters) == 0:
+    if not on_start and not on_end:
+        if no_args:
+            def wrapper(message):
+                try:
+                    message = _unmunge_message(message, prefix)
+                    handler()
+                except Exception as e:
+                    report_error(e, message)
+        else:
+            def wrapper(message):
+                try:
+                    message = _unmunge_message(message, prefix)
+                    handler(message)
+                except Exception as e:
+                    report_error(e, message)
+        return wrapper
+
+    if no_args:
+        def wrapper(message):
+            try:
+                message = _unmunge_message(message, prefix)
+                if on_start:
+                    on_start(message)
                 handler()
-            else:
+            except Exception as e:
+                report_error(e, message)
+            finally:
+                if on_end:
+                    on_end(message)
+    else:
+        def wrapper(message):
+            try:
+                message = _unmunge_message(message, prefix)
+                if on_start:
+                    on_start(message)
                 handler(message)
-
-        except Exception as e:
-            if on_error:
-                if len(signature(on_error).parameters) == 2:
-                    on_error(e, message)
-                else:
-                    on_error(e)
-        finally:
-            if on_end:
-                on_end(message)
+            except Exception as e:
+                report_error(e, message)
+            finally:
+                if on_end:
+                    on_end(message)
 
     return wrapper
 
@@ -98,7 +161,8 @@ def create_basic_wrapper(handler: Callable[..., None],
     Create the default skill handler wrapper.
 
     This wrapper handles things like metrics, reporting handler start/stop
-    and errors.
+    and errors. The signature of `handler` is inspected once, not for every
+    message.
 
     Arguments:
         handler (callable): method/function to call
@@ -108,16 +172,22 @@ def create_basic_wrapper(handler: Callable[..., None],
         Wrapped callable
     """
 
-    def wrapper(message):
-        try:
-            if len(signature(handler).parameters) == 0:
+    if _count_parameters(handler) == 0:
+        def wrapper(message):
+            try:
                 handler()
-            else:
+            except Exception as e:
+                LOG.exception(e)
+                if on_error:
+                    on_error(e)
+    else:
+        def wrapper(message):
+            try:
                 handler(message)
-        except Exception as e:
-            LOG.exception(e)
-            if on_error:
-                on_error(e)
+            except Exception as e:
+                LOG.exception(e)
+                if on_error:
+                    on_error(e)
 
     return wrapper
 
@@ -132,11 +202,52 @@ class EventContainer:
 
     def __init__(self, bus=None):
         self.bus = bus or FakeBus()
-        self.events = []
+        # registration number -> (name, handler), in registration order
+        self._events: Dict[int, Tuple[str, Callable[..., None]]] = {}
+        # name -> registration numbers of the handlers for that name
+        self._names: Dict[str, List[int]] = {}
+        self._counter = count()
+
+    @property
+    def events(self) -> List[Tuple[str, Callable[..., None]]]:
+        """
+        Registered events as (name, handler) tuples, in registration order.
+        This is a copy, modifying it does not change the registered events.
+        """
+        return list(self._events.values())
+
+    @events.setter
+    def events(self, events: List[Tuple[str, Callable[..., None]]]):
+        self._events = {}
+        self._names = {}
+        for name, handler in events:
+            self._track(name, handler)
+
+    def _track(self, name: str, handler: Callable[..., None]):
+        idx = next(self._counter)
+        self._events[idx] = (name, handler)
+        self._names.setdefault(name, []).append(idx)
+
+    def _untrack(self, name: str) -> bool:
+        indexes = self._names.pop(name, None)
+        for idx in indexes or []:
+            self._events.pop(idx, None)
+        return bool(indexes)
 
     def set_bus(self, bus):
         self.bus = bus
 
+    def _once_wrapper(self, name: str, handler: Callable[..., None]) \
+            -> Callable[..., None]:
+
+        def once_wrapper(message):
+            # Remove registered one-time handler before invoking,
+            # allowing them to re-schedule themselves.
+            self.remove(name)
+            handler(message)
+
+        return once_wrapper
+
     def add(self, name: str, handler: Callable[..., None],
             once: bool = False):
         """
@@ -145,23 +256,38 @@ class EventContainer:
         @param handler: Callback method to register to `name`
         @param once: If true, only call `handler` once
         """
-
-        def once_wrapper(message):
-            # Remove registered one-time handler before invoking,
-            # allowing them to re-schedule themselves.
-            self.remove(name)
-            handler(message)
-
         if handler:
             if once:
+                once_wrapper = self._once_wrapper(name, handler)
                 self.bus.once(name, once_wrapper)
-                self.events.append((name, once_wrapper))
+                self._track(name, once_wrapper)
             else:
                 self.bus.on(name, handler)
-                self.events.append((name, handler))
+                self._track(name, handler)
 
             LOG.debug(f'Added event: {name}')
 
+    def add_many(self, events: Iterable[Tuple[str, Callable[..., None]]],
+                 once: bool = False):
+        """
+        Create event handlers for several events at once, see `add`.
+        @param events: (name, handler) tuples to register
+        @param once: If true, only call each handler once
+        """
+        names = []
+        for name, handler in events:
+            if not handler:
+                continue
+            if once:
+                handler = self._once_wrapper(name, handler)
+                self.bus.once(name, handler)
+            else:
+                self.bus.on(name, handler)
+            self._track(name, handler)
+            names.append(name)
+        if names:
+            LOG.debug(f'Added events: {names}')
+
     def remove(self, name: str) -> bool:
         """
         Removes an event from bus emitter and events list.
@@ -169,15 +295,8 @@ class EventContainer:
         @return: True if found and removed, False if not found
         """
         LOG.debug(f"Removing event {name}")
-        removed = False
-        for _name, _handler in list(self.events):
-            if name == _name:
-                try:
-                    self.events.remove((_name, _handler))
-                except ValueError:
-                    LOG.error(f'Failed to remove event {name}')
-                    pass
-                removed = True
+        if not self._untrack(name):
+            return False
 
         # Because of function wrappers, the emitter doesn't always directly
         # hold the _handler function, it sometimes holds something like
@@ -186,8 +305,22 @@ class EventContainer:
         # will not find it, leaving an event handler with that name left behind
         # waiting to fire if it is ever re-installed and triggered.
         # Remove all handlers with the given name, regardless of handler.
-        if removed:
-            self.bus.remove_all_listeners(name)
+        self.bus.remove_all_listeners(name)
+        return True
+
+    def remove_many(self, names: Iterable[str]) -> List[str]:
+        """
+        Removes several events from bus emitter and events list, see `remove`.
+        @param names: events (Message.msg_type) to remove
+        @return: names of the events that were found and removed
+        """
+        removed = []
+        for name in names:
+            if self._untrack(name):
+                # all handlers of the name, see `remove`
+                self.bus.remove_all_listeners(name)
+                removed.append(name)
+        LOG.debug(f"Removed events {removed}")
         return removed
 
     def __iter__(self):
@@ -198,19 +331,219 @@ class EventContainer:
         Unregister all registered handlers and clear the list of registered
         events.
         """
-        for e, f in self.events:
+        # Remove references to wrappers before unregistering, handlers
+        # removing themselves meanwhile won't affect the loop below
+        events = self._events
+        self._events = {}
+        self._names = {}
+        for e, f in events.values():
             self.bus.remove(e, f)
-        self.events = []  # Remove reference to wrappers
+
+
+class _LocalEvent:
+    """
+    An event pending in a `LocalEventScheduler`
+    """
+    __slots__ = ("name", "deadline", "when", "repeat", "data", "context",
+                 "handler", "active")
+
+    def __init__(self, name: str, deadline: float, when: float,
+                 repeat: Optional[float], data: dict, context: dict,
+                 handler: Callable[..., None]):
+        self.name = name
+        self.deadline = deadline  # time.monotonic() based
+        self.when = when  # epoch timestamp, as reported to callers
+        self.repeat = repeat
+        self.data = data
+        self.context = context
+        self.handler = handler
+        self.active = True
+
+
+class LocalEventScheduler:
+    """
+    In-process replacement for the messagebus event scheduler.
+
+    Events are kept in a heap ordered by monotonic deadlines and handlers are
+    called directly from a single dispatcher thread, without a messagebus
+    round trip per schedule, cancel, status query or trigger. An instance can
+    be shared by several `EventSchedulerInterface` objects.
+
+    Handlers run one at a time on the dispatcher thread, a slow handler
+    delays the events due after it.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, _LocalEvent]] = []
+        self._events: Dict[str, List[_LocalEvent]] = {}
+        self._counter = count()
+        self._condition = Condition()
+        self._thread: Optional[Thread] = None
+
+    def schedule_event(self, event: str, sched_time: float,
+                       handler: Callable[..., None],
+                       repeat: Optional[float] = None,
+                       data: Optional[dict] = None,
+                       context: Optional[dict] = None):
+        """
+        Add an event to the schedule
+        @param event: event name, the msg_type of the Message passed to handler
+        @param sched_time: epoch time of the first call
+        @param handler: called with the Message of the event when due
+        @param repeat: time in seconds between calls, None for a single call
+        @param data: Message data to send to `handler`
+        @param context: Message context to send to `handler`
+        """
+        with self._condition:
+            if repeat and event in self._events:
+                LOG.debug(f'Repeating event {event} is already scheduled, '
+                          f'discarding')
+                return
+            deadline = monotonic() + sched_time - time.time()
+            scheduled = _LocalEvent(event, deadline, sched_time, repeat,
+                                    data or {}, context or {}, handler)
+            self._events.setdefault(event, []).append(scheduled)
+            self._push(scheduled)
+            if self._thread is None:
+                self._thread = Thread(target=self._run, daemon=True,
+                                      name="LocalEventScheduler")
+                self._thread.start()
+
+    def _push(self, scheduled: _LocalEvent):
+        heapq.heappush(self._heap, (scheduled.deadline,
+                                    next(self._counter), scheduled))
+        # wake the dispatcher if this is the new earliest deadline
+        if self._heap[0][2] is scheduled:
+            self._condition.notify()
+
+    def remove_event(self, event: str) -> bool:
+        """
+        Remove all pending calls of an event
+        @param event: event name
+        @return: True if the event was scheduled
+        """
+        with self._condition:
+            pending = self._events.pop(event, None)
+            for scheduled in pending or []:
+                # dropped from the heap when it comes up
+                scheduled.active = False
+        return bool(pending)
+
+    def update_event(self, event: str, data: dict):
+        """
+        Change the data of the first pending call of an event
+        @param event: event name
+        @param data: new Message data
+        """
+        with self._condition:
+            pending = self._events.get(event)
+            if pending:
+                pending[0].data = data
+
+    def get_event_time(self, event: str) -> Optional[float]:
+        """
+        Get the time of the first pending call of an event
+        @param event: event name
+        @return: epoch time of the call, None if the event is not scheduled
+        """
+        with self._condition:
+            pending = self._events.get(event)
+            return pending[0].when if pending else None
+
+    def get_event_names(self) -> List[str]:
+        """
+        @return: names of the scheduled events
+        """
+        with self._condition:
+            return list(self._events)
+
+    def _pop_due(self) -> List[Tuple[_LocalEvent, dict]]:
+        """
+        Wait for the next deadline and take the events that are due,
+        rescheduling repeating events. Called with the condition held.
+        @return: due events with the data of this call
+        """
+        # a replaced dispatcher thread stops, see `shutdown`
+        while self._thread is current_thread():
+            while self._heap and not self._heap[0][2].active:
+                heapq.heappop(self._heap)
+            if not self._heap:
+                self._condition.wait()
+                continue
+            now = monotonic()
+            timeout = self._heap[0][0] - now
+            if timeout > 0:
+                self._condition.wait(timeout)
+                continue
+
+            due = []
+            while self._heap and self._heap[0][0] <= now:
+                _, _, scheduled = heapq.heappop(self._heap)
+                if not scheduled.active:
+                    continue
+                due.append((scheduled, scheduled.data))
+                if scheduled.repeat:
+                    # skip calls missed while the process was busy
+                    step = max(scheduled.repeat,
+                               now - scheduled.deadline + scheduled.repeat)
+                    scheduled.deadline += step
+                    scheduled.when += step
+                    self._push(scheduled)
+                else:
+                    pending = self._events.get(scheduled.name, [])
+                    pending.remove(scheduled)
+                    if not pending:
+                        self._events.pop(scheduled.name, None)
+            return due
+        return []
+
+    def _run(self):
+        while True:
+            with self._condition:
+                due = self._pop_due()
+                if self._thread is not current_thread():
+                    return
+            for scheduled, data in due:
+                LOG.debug(f"Call scheduled event: {scheduled.name}")
+                message = Message(scheduled.name, dict(data),
+                                  dict(scheduled.context))
+                try:
+                    scheduled.handler(message)
+                except Exception as e:
+                    LOG.exception(f"Scheduled event {scheduled.name} "
+                                  f"failed: {e}")
+
+    def shutdown(self):
+        """
+        Stop the dispatcher thread and drop all scheduled events
+        """
+        with self._condition:
+            self._heap = []
+            self._events = {}
+            thread, self._thread = self._thread, None
+            self._condition.notify_all()
+        if thread is not None and thread is not current_thread():
+            thread.join()
 
 
 class EventSchedulerInterface:
-    """Interface for accessing the event scheduler over the message bus."""
+    """
+    Interface for accessing the event scheduler over the message bus.
 
-    def __init__(self, bus=None, skill_id=None):
+    If a `LocalEventScheduler` is passed, events are scheduled in-process
+    instead and the messagebus is not used.
+    """
+
+    def __init__(self, bus=None, skill_id=None,
+                 scheduler: Optional[LocalEventScheduler] = None):
         self.skill_id = skill_id or self.__class__.__name__.lower()
         self.bus = bus
         self.events = EventContainer(bus)
         self.scheduled_repeats = []
+        self.scheduler = scheduler
+        self._batch_support: Optional[bool] = None
+        # unique name -> scheduler message data of the events scheduled here
+        self._scheduled: Dict[str, dict] = {}
 
     def set_bus(self, bus):
         """Attach the messagebus of the parent skill
@@ -218,8 +551,10 @@ class EventSchedulerInterface:
         Args:
             bus (MessageBusClient): websocket connection to the messagebus
         """
+        self._remove_batch_probe()
         self.bus = bus
         self.events.set_bus(bus)
+        self._batch_support = None
 
     def set_id(self, skill_id: str):
         """
@@ -244,23 +579,23 @@ class EventSchedulerInterface:
         # TODO: Is a null name valid or should it raise an exception?
         return self.skill_id + ':' + (name or '')
 
-    def _schedule_event(self, handler: Callable[..., None],
-                        when: Union[datetime, int, float],
-                        data: Optional[dict],
-                        name: Optional[str],
-                        repeat_interval: Optional[Union[float, int]] = None,
-                        context: Optional[dict] = None):
+    def _prepare_event(self, handler: Callable[..., None],
+                       when: Union[datetime, int, float],
+                       data: Optional[dict],
+                       name: Optional[str],
+                       repeat_interval: Optional[Union[float, int]] = None) \
+            -> Tuple[str, Callable[..., None], dict]:
         """
-        Underlying method for schedule_event and schedule_repeating_event.
-        Takes scheduling information and sends it off on the message bus.
+        Validate scheduling information and wrap the handler. Nothing is
+        tracked until `_track_event` is called, so invalid events leave no
+        state behind.
         @param handler: method to be called at the scheduled time(s)
         @param when: time (tzaware or default to system tz) or delta seconds to
             first call the handler
         @param data: Message data to send to `handler
         @param name: Event name, must be unique in the context of this object
         @param repeat_interval:  time in seconds between calls
-        @param context: Message context to send to `handler`
-
+        @return: unique event name, wrapped handler and scheduler message data
         """
         if isinstance(when, (int, float)):
             if when < 0:
@@ -272,27 +607,105 @@ class EventSchedulerInterface:
         if not name:
             name = self.skill_id + handler.__name__
         unique_name = self._create_unique_name(name)
-        if repeat_interval:
-            self.scheduled_repeats.append(name)  # store "friendly name"
-
         data = data or {}
 
         def on_error(e):
             LOG.exception(f'An error occurred executing the scheduled event: '
                           f'{e}')
 
-        wrapped = create_basic_wrapper(handler, on_error)
-        self.events.add(unique_name, wrapped, once=not repeat_interval)
+        run = create_basic_wrapper(handler, on_error)
+        if repeat_interval:
+            wrapped = run
+        else:
+            def wrapped(message):
+                # single shot events are done once called
+                self._scheduled.pop(unique_name, None)
+                run(message)
+
         event_data = {'time': when.timestamp(),  # Epoch timestamp
                       'event': unique_name,
+                      'name': name,
                       'repeat': repeat_interval,
                       'data': data}
+        return unique_name, wrapped, event_data
+
+    def _track_event(self, event_data: dict):
+        """
+        Remember an event prepared by `_prepare_event` as scheduled.
+        @param event_data: scheduler message data of the event
+        """
+        if event_data['repeat']:
+            # store "friendly name"
+            self.scheduled_repeats.append(event_data.pop('name'))
+        else:
+            event_data.pop('name')
+        # like the scheduler, report the first call of an event scheduled twice
+        self._scheduled.setdefault(event_data['event'], dict(event_data))
 
+    def _get_event_context(self, context: Optional[dict] = None) -> dict:
         message = self._get_source_message()
         context = context or message.context
         context["skill_id"] = self.skill_id
+        return context
+
+    def _supports_batches(self) -> bool:
+        """
+        Check if the scheduler handles batched messages. The first call sends
+        it an empty batch without waiting for the answer; events are sent one
+        message at a time until the scheduler acknowledges it.
+        @return: True if the scheduler acknowledged batches
+        """
+        if self._batch_support is None:
+            self._batch_support = False
+            message = self._get_source_message()
+            probe = message.forward('mycroft.scheduler.schedule_events',
+                                    {'events': []})
+            self.bus.once(probe.msg_type + '.response',
+                          self._handle_batch_support)
+            self.bus.emit(probe)
+        return self._batch_support
+
+    def _handle_batch_support(self, message=None):
+        LOG.debug("Scheduler supports batches")
+        self._batch_support = True
+
+    def _remove_batch_probe(self):
+        if self._batch_support is False:
+            # still waiting for the scheduler to acknowledge batches
+            self.bus.remove('mycroft.scheduler.schedule_events.response',
+                            self._handle_batch_support)
+
+    def _schedule_event(self, handler: Callable[..., None],
+                        when: Union[datetime, int, float],
+                        data: Optional[dict],
+                        name: Optional[str],
+                        repeat_interval: Optional[Union[float, int]] = None,
+                        context: Optional[dict] = None):
+        """
+        Underlying method for schedule_event and schedule_repeating_event.
+        Takes scheduling information and sends it off on the message bus.
+        @param handler: method to be called at the scheduled time(s)
+        @param when: time (tzaware or default to system tz) or delta seconds to
+            first call the handler
+        @param data: Message data to send to `handler
+        @param name: Event name, must be unique in the context of this object
+        @param repeat_interval:  time in seconds between calls
+        @param context: Message context to send to `handler`
+
+        """
+        unique_name, wrapped, event_data = self._prepare_event(
+            handler, when, data, name, repeat_interval)
+        self._track_event(event_data)
+        context = self._get_event_context(context)
+        if self.scheduler is not None:
+            self.scheduler.schedule_event(unique_name, event_data['time'],
+                                          wrapped, repeat_interval,
+                                          event_data['data'], context)
+            return
+
+        self.events.add(unique_name, wrapped, once=not repeat_interval)
         self.bus.emit(Message('mycroft.scheduler.schedule_event',
-                                                    data=event_data, context=context))
+                              data=event_data, context=context))
 
     def schedule_event(self, handler: Callable[..., None],
                        when: Union[datetime, int, float],
@@ -341,6 +754,63 @@ class EventSchedulerInterface:
             LOG.debug('The event is already scheduled, cancel previous '
                       'event if this scheduling should replace the last.')
 
+    def schedule_events(self, events: List[dict],
+                        context: Optional[dict] = None):
+        """
+        Schedule several events with a single messagebus message. Falls back
+        to a message per event if the scheduler doesn't support batches.
+        @param events: dicts of `schedule_event` arguments, `handler` and
+            `when`, optionally `data` and `name`. Events with an `interval`
+            repeat, see `schedule_repeating_event`
+        @param context: Message context to send to the handlers
+        """
+        # validate the whole batch before tracking any of it
+        prepared = []
+        repeats = set(self.scheduled_repeats)
+        for event in events:
+            handler = event['handler']
+            when = event.get('when')
+            name = event.get('name')
+            interval = event.get('interval')
+            if interval:
+                name = name or self.skill_id + handler.__name__
+                if name in repeats:
+                    LOG.debug(f'The event {name} is already scheduled')
+                    continue
+                repeats.add(name)
+                if not when:
+                    when = datetime.now() + timedelta(seconds=interval)
+            prepared.append(self._prepare_event(handler, when,
+                                                event.get('data'), name,
+                                                interval))
+        if not prepared:
+            return
+        for _, _, event_data in prepared:
+            self._track_event(event_data)
+
+        context = self._get_event_context(context)
+        if self.scheduler is not None:
+            for unique_name, wrapped, event_data in prepared:
+                self.scheduler.schedule_event(unique_name, event_data['time'],
+                                              wrapped, event_data['repeat'],
+                                              event_data['data'], context)
+            return
+
+        self.events.add_many([(unique_name, wrapped)
+                              for unique_name, wrapped, event_data in prepared
+                              if not event_data['repeat']], once=True)
+        self.events.add_many([(unique_name, wrapped)
+                              for unique_name, wrapped, event_data in prepared
+                              if event_data['repeat']])
+        batch = [event_data for _, _, event_data in prepared]
+        if self._supports_batches():
+            self.bus.emit(Message('mycroft.scheduler.schedule_events',
+                                  data={'events': batch}, context=context))
+        else:
+            for event_data in batch:
+                self.bus.emit(Message('mycroft.scheduler.schedule_event',
+                                      data=event_data, context=context))
+
     def update_scheduled_event(self, name: str, data: Optional[dict] = None):
         """
         Change data of event.
@@ -349,8 +819,14 @@ class EventSchedulerInterface:
             name (str): reference name of event (from original scheduling)
             data (dict): new data to update event with
         """
+        unique_name = self._create_unique_name(name)
+        if unique_name in self._scheduled:
+            self._scheduled[unique_name]['data'] = data or {}
+        if self.scheduler is not None:
+            self.scheduler.update_event(unique_name, data or {})
+            return
         data = {
-            'event': self._create_unique_name(name),
+            'event': unique_name,
             'data': data or {}
         }
         message = self._get_source_message()
@@ -367,15 +843,55 @@ class EventSchedulerInterface:
         data = {'event': unique_name}
         if name in self.scheduled_repeats:
             self.scheduled_repeats.remove(name)
-        if self.events.remove(unique_name):
+        self._scheduled.pop(unique_name, None)
+        if self.scheduler is not None:
+            self.scheduler.remove_event(unique_name)
+        elif self.events.remove(unique_name):
             message = self._get_source_message()
             self.bus.emit(message.forward('mycroft.scheduler.remove_event',
                                           data))
 
+    def cancel_scheduled_events(self, names: List[str]):
+        """
+        Cancel several pending events with a single messagebus message. Falls
+        back to a message per event if the scheduler doesn't support batches.
+
+        Args:
+            names (list): reference names of the events (from original
+                          scheduling)
+        """
+        for name in names:
+            if name in self.scheduled_repeats:
+                self.scheduled_repeats.remove(name)
+        unique_names = [self._create_unique_name(name) for name in names]
+        for unique_name in unique_names:
+            self._scheduled.pop(unique_name, None)
+        if self.scheduler is not None:
+            for unique_name in unique_names:
+                self.scheduler.remove_event(unique_name)
+            return
+
+        removed = self.events.remove_many(unique_names)
+        if not removed:
+            return
+        message = self._get_source_message()
+        if self._supports_batches():
+            self.bus.emit(message.forward('mycroft.scheduler.remove_events',
+                                          {'events': removed}))
+        else:
+            for unique_name in removed:
+                self.bus.emit(message.forward('mycroft.scheduler.remove_event',
+                                              {'event': unique_name}))
+
     def get_scheduled_event_status(self, name: str) -> int:
         """
         Get scheduled event data and return the amount of time left
 
+        Events scheduled by this object are answered from a local copy of
+        the schedule. For other events the scheduler is queried over the
+        messagebus, blocking until it answers; see
+        `request_scheduled_event_status` to query it without blocking.
+
         Args:
             name (str): reference name of event (from original scheduling)
 
@@ -386,6 +902,22 @@ class EventSchedulerInterface:
             Exception: Raised if event is not found
         """
         event_name = self._create_unique_name(name)
+        if self.scheduler is not None:
+            event_time = self.scheduler.get_event_time(event_name)
+            if event_time is None:
+                raise Exception(f"Event {event_name} is not scheduled")
+            return int(event_time) - int(time.time())
+
+        event = self._scheduled.get(event_name)
+        if event is not None:
+            event_time = event['time']
+            repeat = event['repeat']
+            now = time.time()
+            if repeat and event_time < now:
+                # next call of a repeating event
+                event_time += math.ceil((now - event_time) / repeat) * repeat
+            return int(event_time) - int(now)
+
         data = {'name': event_name}
 
         reply_name = f'mycroft.event_status.callback.{event_name}'
@@ -396,12 +928,64 @@ class EventSchedulerInterface:
         if status:
             event_time = int(status.data[0][0])
             current_time = int(time.time())
-            time_left_in_seconds = event_time - current_time
-            LOG.info(time_left_in_seconds)
-            return time_left_in_seconds
+            return event_time - current_time
         else:
             raise Exception("Event Status Messagebus Timeout")
 
+    def request_scheduled_event_status(self, name: str,
+                                       callback: Callable[[Optional[int]],
+                                                          None],
+                                       timeout: float = 3.0):
+        """
+        Ask the scheduler for the amount of time left of an event without
+        blocking. Unlike `get_scheduled_event_status`, this always asks the
+        scheduler, and updates the local copy of the schedule with its answer.
+
+        Args:
+            name (str): reference name of event (from original scheduling)
+            callback (callable): called with the time left in seconds, or
+                None if the event is not scheduled or the scheduler did not
+                answer within `timeout` seconds
+            timeout (float): seconds to wait for the scheduler
+        """
+        event_name = self._create_unique_name(name)
+        if self.scheduler is not None:
+            event_time = self.scheduler.get_event_time(event_name)
+            callback(None if event_time is None
+                     else int(event_time) - int(time.time()))
+            return
+
+        reply_name = f'mycroft.event_status.callback.{event_name}'
+        lock = Lock()
+        answered = False
+
+        def answer(time_left: Optional[int]):
+            nonlocal answered
+            with lock:
+                if answered:
+                    return
+                answered = True
+            timer.cancel()
+            self.bus.remove(reply_name, on_status)
+            callback(time_left)
+
+        def on_status(status):
+            try:
+                event_time = status.data[0][0]
+            except (IndexError, KeyError, TypeError):
+                return answer(None)
+            if event_name in self._scheduled:
+                self._scheduled[event_name]['time'] = event_time
+            answer(int(event_time) - int(time.time()))
+
+        timer = Timer(timeout, answer, (None,))
+        timer.daemon = True
+        self.bus.once(reply_name, on_status)
+        timer.start()
+        message = self._get_source_message()
+        self.bus.emit(message.forward('mycroft.scheduler.get_event',
+                                      {'name': event_name}))
+
     def cancel_all_repeating_events(self):
         """
         Cancel any repeating events started by the skill.
@@ -417,3 +1001,8 @@ class EventSchedulerInterface:
         """
         self.cancel_all_repeating_events()
         self.events.clear()
+        self._remove_batch_probe()
+        if self.scheduler is not None:
+            for event in self._scheduled:
+                self.scheduler.remove_event(event)
+        self._scheduled = {}
@@ -10,16 +10,354 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import atexit
+import copy
 import functools
+import gzip
+import importlib.util
 import inspect
-import json
 import logging
 import os
+import shutil
 import sys
-from logging.handlers import RotatingFileHandler
+import time
+import traceback
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from queue import Empty, Full, Queue
+from threading import Lock, Thread
+from collections import OrderedDict
 from os.path import join
 from pathlib import Path
-from typing import Optional, List, Set
+from typing import Dict, Optional, List, Set, Tuple
+
+import orjson
+
+# `sys._getframe` is a CPython implementation detail, other interpreters
+# fall back to the (much slower) `inspect.stack`
+_getframe = getattr(sys, "_getframe", None)
+
+
+class LogFormatter(logging.Formatter):
+    """
+    Formatter for records emitted through `LOG`. Those records are emitted
+    on a logger per module and carry the calling function and line number as
+    record attributes; they are rendered as part of `%(name)s`, i.e.
+    `<LOG.name> - <module>:<function>:<lineno>`.
+    Records from other loggers are formatted unchanged.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        if not hasattr(record, "ovos_module"):
+            return super().format(record)
+        name = record.name
+        record.name = f"{name}:{record.funcName}:{record.lineno}"
+        try:
+            return super().format(record)
+        finally:
+            record.name = name
+
+
+class JsonLogFormatter(logging.Formatter):
+    """
+    Formatter writing every record as a single line JSON object (JSON lines).
+    Exceptions are written as a structured list of traceback frames.
+    `OVOSLogParser` reads these lines without any regex/strptime parsing.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "timestamp": record.created,
+            "source": getattr(record, "ovos_source", record.name),
+            "module": getattr(record, "ovos_module", record.module),
+            "function": record.funcName,
+            "line": record.lineno,
+            "level": record.levelname,
+            "message": record.getMessage()
+        }
+        if record.exc_info and record.exc_info[1] is not None:
+            data["exception"] = self.format_exception_data(record.exc_info)
+        if record.stack_info:
+            data["stack"] = record.stack_info
+        return orjson.dumps(data, default=str).decode("utf-8")
+
+    @staticmethod
+    def format_exception_data(exc_info) -> dict:
+        """
+        Get a JSON serializable representation of an exception
+        @param exc_info: (type, value, traceback) tuple
+        @return: dict with exception `type`, `message` and traceback `frames`
+        """
+        etype, value, tb = exc_info
+        name = etype.__qualname__
+        if etype.__module__ not in ("__main__", "builtins"):
+            name = f"{etype.__module__}.{name}"
+        return {
+            "type": name,
+            "message": str(value),
+            "frames": [{"filename": frame.filename,
+                        "lineno": frame.lineno,
+                        "name": frame.name,
+                        "line": frame.line}
+                       for frame in traceback.extract_tb(tb)]
+        }
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """
+    StreamHandler that always writes to the current `sys.stdout`, so a handler
+    shared for the whole process lifetime follows stdout redirections.
+    """
+
+    def __init__(self, level=logging.NOTSET):
+        logging.Handler.__init__(self, level)
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+
+class _BoundedQueueHandler(QueueHandler):
+    """
+    QueueHandler for a bounded queue with a configurable overflow policy:
+      - "block": wait for free space in the queue
+      - "drop_oldest": discard the oldest queued record
+      - "drop_debug": discard new DEBUG records, wait for free space otherwise
+    """
+    policies = ("block", "drop_oldest", "drop_debug")
+
+    def __init__(self, queue: Queue, overflow: str = "block"):
+        super().__init__(queue)
+        if overflow not in self.policies:
+            raise ValueError(f"overflow must be one of {self.policies}, "
+                             f"got: {overflow}")
+        self.overflow = overflow
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # records never leave this process, so unlike the default
+        # implementation exc_info is kept for the output formatter
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        if self.overflow == "block":
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+            return
+        except Full:
+            pass
+        if self.overflow == "drop_debug":
+            if record.levelno <= logging.DEBUG:
+                self.dropped += 1
+            else:
+                self.queue.put(record)
+            return
+        while True:
+            try:
+                self.queue.get_nowait()
+                self.queue.task_done()
+                self.dropped += 1
+            except Empty:
+                pass
+            try:
+                self.queue.put_nowait(record)
+                return
+            except Full:
+                continue
+
+
+class _QueueListener(QueueListener):
+    """
+    QueueListener that can tell if it is running and does not fail to stop
+    when its queue is full.
+    """
+    running = False
+
+    def start(self):
+        super().start()
+        self.running = True
+
+    def stop(self):
+        self.running = False
+        super().stop()
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+class _BurstLimiter:
+    """
+    Token bucket rate limit per call site: every site may log `burst`
+    records at once and `rate` records per second after that. At most
+    `max_sites` call sites are tracked, least recently used ones are dropped.
+    """
+
+    def __init__(self, rate: float, burst: int, max_sites: int = 1024):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.max_sites = max_sites
+        # call site -> [tokens, monotonic time of the last refill]
+        self._buckets = OrderedDict()
+        self._lock = Lock()
+
+    def allow(self, site, now: float) -> bool:
+        """
+        Consume a token for a call site
+        @param site: hashable call site identifier
+        @param now: current monotonic time
+        @return: True if the call site is within its rate limit
+        """
+        with self._lock:
+            bucket = self._buckets.get(site)
+            if bucket is None:
+                if len(self._buckets) >= self.max_sites:
+                    self._buckets.popitem(last=False)
+                bucket = self._buckets[site] = [float(self.burst), now]
+            else:
+                self._buckets.move_to_end(site)
+                bucket[0] = min(self.burst,
+                                bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return True
+            return False
+
+    def is_ready(self, site, now: float) -> bool:
+        """
+        Check if a call site would be allowed to log, without consuming a token
+        @param site: hashable call site identifier
+        @param now: current monotonic time
+        @return: True if the call site is within its rate limit
+        """
+        bucket = self._buckets.get(site)
+        if bucket is None:
+            return True
+        return bucket[0] + (now - bucket[1]) * self.rate >= 1
+
+
+class _RingBuffer:
+    """
+    In-memory buffer of the most recent records, `size` records are kept for
+    every log level so frequent DEBUG records do not evict errors. Records are
+    stored as tuples in preallocated lists and only formatted when dumped.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        # levelno -> [preallocated entries, total number of entries added]
+        self._buffers = {}
+        self._lock = Lock()
+
+    def append(self, levelno: int, entry: tuple):
+        """
+        Add an entry, overwriting the oldest one of the same level if full
+        @param levelno: numeric log level of the entry
+        @param entry: tuple starting with the record creation time
+        """
+        with self._lock:
+            buffer = self._buffers.get(levelno)
+            if buffer is None:
+                buffer = self._buffers[levelno] = [[None] * self.size, 0]
+            buffer[0][buffer[1] % self.size] = entry
+            buffer[1] += 1
+
+    def get_entries(self) -> List[tuple]:
+        """
+        Get all buffered entries, oldest first
+        """
+        with self._lock:
+            entries = [entry for buffer, _ in self._buffers.values()
+                       for entry in buffer if entry is not None]
+        return sorted(entries, key=lambda e: e[0])
+
+
+class _Compressor:
+    """
+    Compress rotated log files in a background thread. On rollover the log is
+    only renamed to its uncompressed backup name, so the logging thread is
+    not blocked; the compressed file replaces it once written.
+    """
+    extensions = {"gzip": ".gz", "zstd": ".zst"}
+
+    def __init__(self, method: str):
+        self.method = method
+        self.extension = self.extensions[method]
+        self._queue = Queue()
+        self._thread = None
+        self._lock = Lock()
+
+    def namer(self, name: str) -> str:
+        return name + self.extension
+
+    def rotate(self, source: str, dest: str):
+        """
+        `RotatingFileHandler.rotator`, schedule compression of a rotated log
+        @param source: path of the log file
+        @param dest: path of the compressed backup, see `namer`
+        """
+        plain = dest[:-len(self.extension)]
+        os.rename(source, plain)
+        self._queue.put((plain, dest))
+        with self._lock:
+            if self._thread is None:
+                self._thread = Thread(target=self._run, daemon=True,
+                                      name="LogCompressor")
+                self._thread.start()
+
+    def wait(self):
+        """
+        Block until all scheduled files are compressed
+        """
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            source, dest = self._queue.get()
+            try:
+                self.compress(source, dest)
+            except Exception as e:
+                # keep the uncompressed backup
+                print(f"Failed to compress {source}: {e}", file=sys.stderr)
+            finally:
+                self._queue.task_done()
+
+    def compress(self, source: str, dest: str):
+        """
+        Compress `source` to `dest` and remove `source`
+        """
+        temp = dest + ".tmp"
+        with open(source, "rb") as src, open(temp, "wb") as dst:
+            if self.method == "zstd":
+                import zstandard
+                zstandard.ZstdCompressor().copy_stream(src, dst)
+            else:
+                with gzip.GzipFile(fileobj=dst, mode="wb") as gz:
+                    shutil.copyfileobj(src, gz, 1024 * 1024)
+        os.replace(temp, dest)
+        os.remove(source)
+
+
+class _RotatingFileHandler(RotatingFileHandler):
+    """
+    `RotatingFileHandler` optionally compressing the rotated files
+    """
+    compressor: Optional[_Compressor] = None
+
+    def set_compressor(self, compressor: Optional[_Compressor]):
+        self.compressor = compressor
+        self.namer = compressor.namer if compressor else None
+        self.rotator = compressor.rotate if compressor else None
+
+    def doRollover(self):
+        if self.compressor:
+            # backups are shifted by name, the previous one has to be done
+            self.compressor.wait()
+        super().doRollover()
 
 
 class LOG:
@@ -41,10 +379,23 @@ class LOG:
             "logs": {
                 "path": "/opt/ovos/logs/",
                 "max_bytes": 50000000,
-                "backup_count": 6
+                "backup_count": 6,
+                "compress": "gzip",  // compress rotated logs, or "zstd"
+                "async": false,  // write logs from a background thread
+                "queue_size": 10000,  // max records waiting to be written
+                "overflow": "block",  // or "drop_oldest" / "drop_debug"
+                "format": "text",  // or "jsonl" for JSON lines log files
+                "rate_limit": 0,  // max records/second per call site
+                "rate_limit_burst": 10,  // records per call site at once
+                "recent_records": 0,  // records per level kept in memory
+                                      // for LOG.dump_recent, incl. DEBUG
+                "dump_on_exception": false  // LOG.dump_recent on exceptions
             }.
             "bus": {  // override for different services
-	        "log_level": "DEBUG"
+	        "log_level": "DEBUG",
+                "modules": {  // override for modules (by name prefix)
+                    "ovos_bus_client.session": "WARNING"
+                },
                 "logs": { // optionally override default logs
                           // (nb this does not merge values so
                           // backup_count takes the default 3 here)
@@ -66,13 +417,47 @@ class LOG:
     fmt = '%(asctime)s.%(msecs)03d - ' \
           '%(name)s - %(levelname)s - %(message)s'
     datefmt = '%Y-%m-%d %H:%M:%S'
-    formatter = logging.Formatter(fmt, datefmt)
+    formatter = LogFormatter(fmt, datefmt)
     max_bytes = 50000000
     backup_count = 3
+    # "gzip" or "zstd" to compress rotated log files, the method in use
+    compression = None
+    # method requested by the config, see `set_compression`
+    _compression_config = None
+    _compressor = None
     name = os.getenv("OVOS_DEFAULT_LOG_NAME") or 'OVOS'
     level = os.getenv("OVOS_DEFAULT_LOG_LEVEL") or "INFO"
     diagnostic_mode = False
+    output_format = "text"
+    json_formatter = JsonLogFormatter()
+    async_mode = False
+    queue_size = 10000
+    overflow = "block"
+    # module name prefix -> log level, see `set_module_levels`
+    module_levels = {}
+    rate_limit = 0
+    rate_limit_burst = 10
+    recent_records = 0
+    dump_on_exception = False
+    _recent = None
+    _recent_level = logging.CRITICAL + 1
+    _limiter = None
+    # call site -> suppressed record count and call site info
+    _suppressed = {}
+    _suppressed_lock = Lock()
     _loggers = {}
+    # logger name -> module, for loggers created by `_get_real_logger`
+    _logger_modules = {}
+    # module name -> configured level, see `_get_module_level`
+    _module_level_cache = {}
+    _min_module_level = logging.CRITICAL + 1
+    # output target ("stdout" or file path) -> handler shared by all loggers
+    _handlers = {}
+    # output target -> listener writing queued records, in async mode
+    _listeners = {}
+    # caller code object -> module name, see `_get_caller_module`
+    _module_cache = {}
+    _module_cache_size = 4096
 
     @classmethod
     def __init__(cls, name='OVOS'):
@@ -80,22 +465,224 @@ class LOG:
 
     @classmethod
     def init(cls, config=None):
-        from ovos_utils.xdg_utils import xdg_state_home
-        try:
-            from ovos_config.meta import get_xdg_base
-            xdg_base = get_xdg_base()
-        except ImportError:
-            xdg_base = os.environ.get("OVOS_CONFIG_BASE_FOLDER") or "mycroft"
-
-        xdg_path = os.path.join(xdg_state_home(), xdg_base)
-
+        """
+        Configure LOG, only the settings that differ from the current
+        configuration are applied so this is cheap to call on config changes.
+        @param config: logging configuration, see `get_logs_config`
+        """
         config = config or {}
-        cls.base_path = config.get("path") or xdg_path
-        cls.max_bytes = config.get("max_bytes", 50000000)
-        cls.backup_count = config.get("backup_count", 3)
+        base_path = config.get("path") or _get_default_log_path()
+        if base_path != cls.base_path:
+            old_path = cls.base_path
+            cls.base_path = base_path
+            if old_path == "stdout":
+                # loggers created before a log file was configured also
+                # write to it from now on
+                path = join(base_path, cls.name.lower().strip() + ".log")
+                for logger in cls._loggers.values():
+                    handler = cls._get_handler(path)
+                    if handler not in logger.handlers:
+                        logger.addHandler(handler)
+            else:
+                # move file outputs of existing loggers to the new directory
+                old_path = os.path.normpath(old_path)
+                cls._replace_targets(
+                    {target: join(base_path, os.path.basename(target))
+                     for target in cls._handlers if target != "stdout" and
+                     os.path.normpath(os.path.dirname(target)) == old_path})
+
+        rotation = (config.get("max_bytes", 50000000),
+                    config.get("backup_count", 3))
+        if rotation != (cls.max_bytes, cls.backup_count):
+            cls.max_bytes, cls.backup_count = rotation
+            for handler in cls._get_output_handlers():
+                if isinstance(handler, RotatingFileHandler):
+                    handler.maxBytes = cls.max_bytes
+                    handler.backupCount = cls.backup_count
+        compression = config.get("compress") or None
+        if compression != cls._compression_config:
+            cls.set_compression(compression)
+        module_levels = config.get("modules") or {}
+        if module_levels != cls.module_levels:
+            cls.set_module_levels(module_levels)
         level = config.get("level") or LOG.level
         cls.set_level(level)
         cls.diagnostic_mode = config.get("diagnostic", False)
+        rate_limit = (config.get("rate_limit", 0),
+                      config.get("rate_limit_burst", 10))
+        if rate_limit != (cls.rate_limit, cls.rate_limit_burst):
+            cls.rate_limit, cls.rate_limit_burst = rate_limit
+            if cls._suppressed:
+                cls._log_suppressed()
+            cls._limiter = _BurstLimiter(*rate_limit) if rate_limit[0] \
+                else None
+        recent_records = config.get("recent_records", 0)
+        if recent_records != cls.recent_records:
+            cls.recent_records = recent_records
+            cls._recent = _RingBuffer(recent_records) if recent_records \
+                else None
+            cls._recent_level = logging.DEBUG if recent_records else \
+                logging.CRITICAL + 1
+        cls.dump_on_exception = config.get("dump_on_exception", False)
+        output_format = config.get("format", "text")
+        if output_format != cls.output_format:
+            cls.output_format = output_format
+            for target, handler in cls._handlers.items():
+                if target in cls._listeners:
+                    handler = cls._listeners[target].handlers[0]
+                handler.setFormatter(cls._get_formatter(target))
+
+        queue_config = (bool(config.get("async", False)),
+                        config.get("queue_size", 10000),
+                        config.get("overflow", "block"))
+        if queue_config != (cls.async_mode, cls.queue_size, cls.overflow):
+            cls.async_mode, cls.queue_size, cls.overflow = queue_config
+            cls._reset_handlers()
+
+    @classmethod
+    def _get_handler(cls, target: str) -> logging.Handler:
+        """
+        Get the handler writing to `target`. Handlers are shared between all
+        loggers so every output only has a single handler (and file
+        descriptor) per process. In async mode this is a `QueueHandler`
+        feeding a `QueueListener` that owns the actual output handler.
+        @param target: "stdout" or path to a log file
+        @return: handler for `target`
+        """
+        handler = cls._handlers.get(target)
+        if handler is None:
+            if target == "stdout":
+                handler = _StdoutHandler()
+            else:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                handler = _RotatingFileHandler(target,
+                                               maxBytes=cls.max_bytes,
+                                               backupCount=cls.backup_count)
+                handler.set_compressor(cls._compressor)
+            handler.setFormatter(cls._get_formatter(target))
+            if cls.async_mode:
+                queue = Queue(maxsize=cls.queue_size)
+                listener = _QueueListener(queue, handler,
+                                          respect_handler_level=True)
+                listener.start()
+                cls._listeners[target] = listener
+                handler = _BoundedQueueHandler(queue, cls.overflow)
+            cls._handlers[target] = handler
+        return handler
+
+    @classmethod
+    def set_compression(cls, compression: Optional[str]):
+        """
+        Compress rotated log files in a background thread
+        @param compression: "gzip", "zstd" (requires `zstandard`) or None
+        """
+        cls._compression_config = compression
+        if compression == "zstd" and \
+                importlib.util.find_spec("zstandard") is None:
+            cls.warning("zstandard not installed, compressing rotated "
+                        "logs with gzip")
+            compression = "gzip"
+        if compression not in _Compressor.extensions:
+            compression = None
+        cls.compression = compression
+        if cls._compressor:
+            cls._compressor.wait()
+        cls._compressor = _Compressor(compression) if compression else None
+        for handler in cls._get_output_handlers():
+            if isinstance(handler, _RotatingFileHandler):
+                handler.set_compressor(cls._compressor)
+
+    @classmethod
+    def _get_formatter(cls, target: str) -> logging.Formatter:
+        """
+        Get the formatter for an output target, log files are written as
+        JSON lines if `output_format` is "jsonl"
+        @param target: "stdout" or path to a log file
+        @return: formatter for `target`
+        """
+        if target != "stdout" and cls.output_format == "jsonl":
+            return cls.json_formatter
+        return cls.formatter
+
+    @classmethod
+    def _get_output_handlers(cls) -> List[logging.Handler]:
+        """
+        Get the handlers writing to the output targets, in async mode those
+        are owned by the queue listeners.
+        """
+        handlers = []
+        for target, handler in cls._handlers.items():
+            if target in cls._listeners:
+                handlers.extend(cls._listeners[target].handlers)
+            else:
+                handlers.append(handler)
+        return handlers
+
+    @classmethod
+    def _close_handler(cls, target: str):
+        """
+        Close and forget the handler for an output target
+        @param target: "stdout" or path to a log file
+        """
+        handler = cls._handlers.pop(target)
+        listener = cls._listeners.pop(target, None)
+        if listener:
+            listener.stop()
+            for output_handler in listener.handlers:
+                output_handler.close()
+        handler.close()
+
+    @classmethod
+    def _replace_targets(cls, targets: Dict[str, str]):
+        """
+        Replace the shared handlers for some output targets on every logger
+        @param targets: dict of old target to new target
+        """
+        replaced = {cls._handlers[old]: new
+                    for old, new in targets.items() if old != new}
+        if not replaced:
+            return
+        for old, new in targets.items():
+            if old != new:
+                cls._close_handler(old)
+        for logger in cls._loggers.values():
+            for handler in list(logger.handlers):
+                if handler in replaced:
+                    logger.removeHandler(handler)
+                    logger.addHandler(cls._get_handler(replaced[handler]))
+
+    @classmethod
+    def _reset_handlers(cls):
+        """
+        Close the shared handlers and replace them on every logger, i.e. after
+        switching between synchronous and asynchronous output.
+        """
+        targets = {handler: target
+                   for target, handler in cls._handlers.items()}
+        for target in list(cls._handlers):
+            cls._close_handler(target)
+        for logger in cls._loggers.values():
+            for handler in list(logger.handlers):
+                if handler in targets:
+                    logger.removeHandler(handler)
+                    logger.addHandler(cls._get_handler(targets[handler]))
+
+    @classmethod
+    def flush(cls):
+        """
+        Log pending "repeated N times" summaries, block until all queued
+        records are written (in async mode), flush all output handlers and
+        wait for rotated logs being compressed.
+        """
+        if cls._suppressed:
+            cls._log_suppressed()
+        for listener in list(cls._listeners.values()):
+            if listener.running:
+                listener.queue.join()
+        for handler in cls._get_output_handlers():
+            handler.flush()
+        if cls._compressor:
+            cls._compressor.wait()
 
     @classmethod
     def create_logger(cls, name, tostdout=True):
@@ -105,18 +692,12 @@ class LOG:
         logger.propagate = False
         # also log to stdout
         if tostdout or cls.base_path == "stdout":
-            stdout_handler = logging.StreamHandler(sys.stdout)
-            stdout_handler.setFormatter(cls.formatter)
-            logger.addHandler(stdout_handler)
+            logger.addHandler(cls._get_handler("stdout"))
         # log to file
         if cls.base_path != "stdout":
-            os.makedirs(cls.base_path, exist_ok=True)
             path = join(cls.base_path,
                         cls.name.lower().strip() + ".log")
-            handler = RotatingFileHandler(path, maxBytes=cls.max_bytes,
-                                          backupCount=cls.backup_count)
-            handler.setFormatter(cls.formatter)
-            logger.addHandler(handler)
+            logger.addHandler(cls._get_handler(path))
         logger.setLevel(cls.level)
         cls._loggers[name] = logger
         return logger
@@ -125,73 +706,345 @@ class LOG:
     def set_level(cls, level):
         cls.level = level
         for l in cls._loggers:
-            cls._loggers[l].setLevel(level)
+            logger_level = cls._get_logger_level(l)
+            level_no = _get_level_no(logger_level)
+            # setLevel clears the logging cache, only call it on changes
+            if cls._loggers[l].level != level_no or level_no == logging.NOTSET:
+                cls._loggers[l].setLevel(logger_level)
 
     @classmethod
-    def _get_real_logger(cls):
-        name = ""
-        if cls.name is not None:
-            name = cls.name + " - "
-
-        # Stack:
-        # [0] - _log()
-        # [1] - debug(), info(), warning(), or error()
-        # [2] - caller
-        stack = inspect.stack()
-
-        # Record:
-        # [0] - frame object
-        # [1] - filename
-        # [2] - line number
-        # [3] - function
-        # ...
-        record = stack[2]
-        mod = inspect.getmodule(record[0])
+    def _get_caller_module(cls, frame) -> str:
+        """
+        Get the name of the module a frame belongs to. Resolved names are
+        cached per code object so that `inspect.getmodule` only runs once for
+        every distinct calling function.
+        @param frame: frame object of the caller
+        @return: module name, or an empty string if it can not be determined
+        """
+        code = frame.f_code
+        try:
+            return cls._module_cache[code]
+        except KeyError:
+            pass
+        mod = inspect.getmodule(frame)
         module_name = mod.__name__ if mod else ''
-        name += module_name + ':' + record[3] + ':' + str(record[2])
+        if len(cls._module_cache) >= cls._module_cache_size:
+            cls._module_cache.clear()
+        cls._module_cache[code] = module_name
+        return module_name
 
-        logger = cls.create_logger(name, tostdout=True)
-        if cls.diagnostic_mode:
+    @classmethod
+    def _get_real_logger(cls, frame=None) -> logging.Logger:
+        """
+        Get the logger for the module of the calling frame. Function and line
+        number of the call are not part of the logger name, they are added to
+        each record by `LOG._log`.
+        @param frame: caller frame, defaults to the caller of this method
+        @return: logger named `<LOG.name> - <module>`
+        """
+        if frame is None:
+            frame = _get_caller_frame(1)
+        module_name = cls._get_caller_module(frame)
+        name = module_name if cls.name is None else \
+            f"{cls.name} - {module_name}"
+        logger = cls._loggers.get(name)
+        if logger is None:
+            logger = cls.create_logger(name, tostdout=True)
+            cls._logger_modules[name] = module_name
+            logger.setLevel(cls._get_logger_level(name))
+        return logger
+
+    @classmethod
+    def set_module_levels(cls, module_levels: Dict[str, str]):
+        """
+        Override the log level for some modules, the most specific prefix
+        applies, i.e. `{"ovos_workshop": "INFO", "ovos_workshop.skills":
+        "DEBUG"}`.
+        @param module_levels: dict of module name prefix to log level
+        """
+        cls.module_levels = dict(module_levels)
+        cls._module_level_cache = {}
+        overrides = [_get_level_no(level) for level in module_levels.values()]
+        cls._min_module_level = min(overrides) if overrides else \
+            logging.CRITICAL + 1
+        cls.set_level(cls.level)
+
+    @classmethod
+    def _get_module_level(cls, module_name: str) -> Optional[str]:
+        """
+        Get the log level configured for a module, resolved once per module.
+        @param module_name: name of the module to get the level for
+        @return: configured level, None if the module uses `LOG.level`
+        """
+        try:
+            return cls._module_level_cache[module_name]
+        except KeyError:
+            pass
+        level = None
+        match = ""
+        for prefix, module_level in cls.module_levels.items():
+            if len(prefix) > len(match) and \
+                    (module_name == prefix or
+                     module_name.startswith(prefix + ".")):
+                match, level = prefix, module_level
+        cls._module_level_cache[module_name] = level
+        return level
+
+    @classmethod
+    def _get_logger_level(cls, name: str):
+        """
+        Get the level of a logger, the module override for module loggers
+        returned by `_get_real_logger`, else `LOG.level`
+        """
+        module_name = cls._logger_modules.get(name)
+        if module_name is not None and cls.module_levels:
+            level = cls._get_module_level(module_name)
+            if level is not None:
+                return level
+        return cls.level
+
+    @classmethod
+    def _log(cls, level: int, msg, args, exc_info=None, extra=None,
+             stack_info=False, stacklevel=1, frame=None) -> bool:
+        """
+        Emit a record on the module logger of the caller, carrying the
+        calling module, function and line number as record attributes.
+        @param frame: frame to report as the caller, defaults to the caller
+            `stacklevel` levels above the LOG method
+        @return: True if the record was emitted, False if it was filtered
+            by level or dropped by the rate limit
+        """
+        if frame is None:
+            # Stack:
+            # [0] - _log()
+            # [1] - debug(), info(), warning(), error() or exception()
+            # [2] - caller
+            frame = _get_caller_frame(stacklevel + 1)
+        logger = cls._get_real_logger(frame)
+        if cls._recent is not None:
+            code = frame.f_code
+            exc_text = None
+            if exc_info:
+                exc_text = "".join(traceback.format_exception(
+                    *_normalize_exc_info(exc_info))).rstrip("\n")
+            cls._recent.append(level, (
+                time.time(), level, logger.name, code.co_filename,
+                frame.f_lineno, code.co_name, cls._get_caller_module(frame),
+                msg, args, exc_text))
+        if not logger.isEnabledFor(level):
+            return False
+        if cls._limiter is not None:
+            site = (frame.f_code, frame.f_lineno)
+            now = time.monotonic()
+            if not cls._limiter.allow(site, now):
+                cls._suppress(site, logger, level, frame)
+                return False
+            if cls._suppressed:
+                cls._log_suppressed(now, site)
+        if cls.diagnostic_mode and logger.isEnabledFor(logging.DEBUG):
             try:
                 from ovos_bus_client.message import dig_for_message
-                msg = dig_for_message()
-                if msg:
-                    logger.debug(f"DIAGNOSTIC - source bus message {msg.serialize()}")
+                message = dig_for_message()
+                if message:
+                    cls._emit(logger, logging.DEBUG, frame,
+                              f"DIAGNOSTIC - source bus message "
+                              f"{message.serialize()}", ())
             except ImportError:
                 pass
-        return logger
+        cls._emit(logger, level, frame, msg, args, exc_info, extra,
+                  stack_info)
+        return True
+
+    @classmethod
+    def _emit(cls, logger: logging.Logger, level: int, frame, msg, args,
+              exc_info=None, extra=None, stack_info=False):
+        if exc_info:
+            exc_info = _normalize_exc_info(exc_info)
+        sinfo = None
+        if stack_info:
+            sinfo = "Stack (most recent call last):\n" + \
+                "".join(traceback.format_stack(frame)).rstrip("\n")
+        code = frame.f_code
+        cls._emit_record(logger, level, code.co_filename, frame.f_lineno,
+                         code.co_name, cls._get_caller_module(frame),
+                         msg, args, exc_info, extra, sinfo)
+
+    @classmethod
+    def _emit_record(cls, logger: logging.Logger, level: int, filename: str,
+                     lineno: int, func: str, module: str, msg, args,
+                     exc_info=None, extra=None, sinfo=None):
+        record = logger.makeRecord(logger.name, level, filename, lineno,
+                                   msg, args, exc_info, func, extra, sinfo)
+        record.ovos_source = cls.name
+        record.ovos_module = module
+        logger.handle(record)
+
+    @classmethod
+    def _suppress(cls, site, logger: logging.Logger, level: int, frame):
+        """
+        Count a record dropped by the rate limit, see `_log_suppressed`
+        """
+        with cls._suppressed_lock:
+            suppressed = cls._suppressed.get(site)
+            if suppressed is None:
+                if len(cls._suppressed) >= cls._limiter.max_sites:
+                    return
+                code = frame.f_code
+                suppressed = cls._suppressed[site] = \
+                    [0, logger, level, code.co_filename, frame.f_lineno,
+                     code.co_name, cls._get_caller_module(frame)]
+            suppressed[0] += 1
+            suppressed[2] = max(suppressed[2], level)
+
+    @classmethod
+    def _log_suppressed(cls, now: Optional[float] = None, site=None):
+        """
+        Log a "repeated N times" summary for call sites whose burst ended
+        @param now: current monotonic time, None to log all summaries
+        @param site: call site that was just allowed to log again
+        """
+        with cls._suppressed_lock:
+            ended = [s for s in cls._suppressed
+                     if now is None or s == site or
+                     cls._limiter is None or cls._limiter.is_ready(s, now)]
+            summaries = [cls._suppressed.pop(s) for s in ended]
+        for count, logger, level, filename, lineno, func, module in summaries:
+            cls._emit_record(logger, level, filename, lineno, func, module,
+                             "Previous message repeated %s times", (count,))
+
+    @classmethod
+    def isEnabledFor(cls, level: int) -> bool:
+        """
+        Check if a message of the given severity would be emitted, without
+        any caller introspection.
+        @param level: numeric log level, i.e. `logging.DEBUG`
+        @return: True if messages at `level` are logged, by `LOG.level`,
+            any of the `module_levels` overrides or to the recent records
+            buffer
+        """
+        if logging.root.manager.disable >= level:
+            return False
+        return level >= _get_level_no(cls.level) or \
+            level >= cls._min_module_level or level >= cls._recent_level
+
+    @classmethod
+    def info(cls, msg, *args, **kwargs):
+        if cls.isEnabledFor(logging.INFO):
+            cls._log(logging.INFO, msg, args, **kwargs)
 
     @classmethod
-    def info(cls, *args, **kwargs):
-        cls._get_real_logger().info(*args, **kwargs)
+    def debug(cls, msg, *args, **kwargs):
+        if cls.isEnabledFor(logging.DEBUG):
+            cls._log(logging.DEBUG, msg, args, **kwargs)
 
     @classmethod
-    def debug(cls, *args, **kwargs):
-        cls._get_real_logger().debug(*args, **kwargs)
+    def warning(cls, msg, *args, **kwargs):
+        if cls.isEnabledFor(logging.WARNING):
+            cls._log(logging.WARNING, msg, args, **kwargs)
 
     @classmethod
-    def warning(cls, *args, **kwargs):
-        cls._get_real_logger().warning(*args, **kwargs)
+    def error(cls, msg, *args, **kwargs):
+        if cls.isEnabledFor(logging.ERROR):
+            cls._log(logging.ERROR, msg, args, **kwargs)
 
     @classmethod
-    def error(cls, *args, **kwargs):
-        cls._get_real_logger().error(*args, **kwargs)
+    def exception(cls, msg, *args, exc_info=True, **kwargs):
+        if cls.isEnabledFor(logging.ERROR):
+            # records dropped by the rate limit do not rewrite the dump
+            if cls._log(logging.ERROR, msg, args, exc_info=exc_info,
+                        **kwargs) and \
+                    cls.dump_on_exception and cls._recent is not None:
+                cls.dump_recent()
 
     @classmethod
-    def exception(cls, *args, **kwargs):
-        cls._get_real_logger().exception(*args, **kwargs)
+    def dump_recent(cls, path: Optional[str] = None) -> Optional[str]:
+        """
+        Write the records kept in memory (see "recent_records" config) to a
+        file, including those below the configured log level.
+        @param path: file to write, defaults to `<name>_recent.txt` in the
+            log directory
+        @return: path of the written file, None if no records are kept
+        """
+        if cls._recent is None:
+            return None
+        if not path:
+            directory = cls.base_path if cls.base_path != "stdout" else \
+                _get_default_log_path()
+            os.makedirs(directory, exist_ok=True)
+            path = join(directory,
+                        f"{(cls.name or 'OVOS').lower().strip()}_recent.txt")
+        lines = []
+        for created, levelno, name, filename, lineno, func, module, msg, \
+                args, exc_text in cls._recent.get_entries():
+            record = logging.LogRecord(name, levelno, filename, lineno, msg,
+                                       args, None, func)
+            record.created = created
+            record.msecs = (created - int(created)) * 1000
+            record.exc_text = exc_text
+            record.ovos_module = module
+            lines.append(cls.formatter.format(record) + "\n")
+        with open(path, "w") as f:
+            f.writelines(lines)
+        return path
+
+
+def _normalize_exc_info(exc_info) -> tuple:
+    """
+    Get the (type, value, traceback) tuple for an `exc_info` argument
+    """
+    if isinstance(exc_info, BaseException):
+        return type(exc_info), exc_info, exc_info.__traceback__
+    if not isinstance(exc_info, tuple):
+        return sys.exc_info()
+    return exc_info
+
+
+def _get_caller_frame(depth: int):
+    """
+    Get the frame `depth` levels above the caller of this function
+    @param depth: number of frames to go up, 0 is the calling function
+    @return: frame object, or the outermost frame if the stack is not deep
+        enough
+    """
+    if _getframe is None:
+        stack = inspect.stack(0)[depth + 1:]
+        return stack[0].frame if stack else inspect.stack(0)[-1].frame
+    try:
+        return _getframe(depth + 1)
+    except ValueError:
+        frame = _getframe(1)
+        while frame.f_back is not None:
+            frame = frame.f_back
+        return frame
+
+
+@functools.lru_cache(maxsize=None)
+def _get_level_no(level) -> int:
+    """
+    Get the numeric value of a log level as accepted by `Logger.setLevel`
+    @param level: level name (i.e. "DEBUG") or number
+    @return: numeric log level, `logging.NOTSET` if `level` is not known
+    """
+    if isinstance(level, int):
+        return level
+    level_no = logging.getLevelName(level)
+    return level_no if isinstance(level_no, int) else logging.NOTSET
+
+
+atexit.register(LOG.flush)
 
 
 def _monitor_log_level():
     _logs_conf = get_logs_config(LOG.name)
-    hax = hash(json.dumps(_logs_conf, sort_keys=True, indent=2))
-    if hax != _monitor_log_level.config_hash:
-        _monitor_log_level.config_hash = hax
+    if _logs_conf != _monitor_log_level.config:
+        _monitor_log_level.config = copy.deepcopy(_logs_conf)
+        start = time.monotonic()
         LOG.init(_logs_conf)
-        LOG.info("updated LOG level")
+        LOG.info(f"updated LOG configuration in "
+                 f"{(time.monotonic() - start) * 1000:.2f}ms")
 
 
-_monitor_log_level.config_hash = None
+_monitor_log_level.config = None
 
 
 def init_service_logger(service_name: str):
@@ -200,8 +1053,7 @@ def init_service_logger(service_name: str):
     @param service_name: Name of service to configure `LOG` for
     """
     _logs_conf = get_logs_config(service_name)
-    _monitor_log_level.config_hash = hash(json.dumps(_logs_conf, sort_keys=True,
-                                                     indent=2))
+    _monitor_log_level.config = copy.deepcopy(_logs_conf)
     LOG.name = service_name
     LOG.init(_logs_conf)  # set up the LOG instance
     try:
@@ -211,6 +1063,20 @@ def init_service_logger(service_name: str):
         LOG.warning("Can not monitor config LOG level changes")
 
 
+@functools.lru_cache(maxsize=1)
+def _get_default_log_path() -> str:
+    """
+    Get the default (XDG) log directory, resolved once per process
+    """
+    from ovos_utils.xdg_utils import xdg_state_home
+    try:
+        from ovos_config.meta import get_xdg_base
+        xdg_base = get_xdg_base()
+    except ImportError:
+        xdg_base = os.environ.get("OVOS_CONFIG_BASE_FOLDER") or "mycroft"
+    return os.path.join(xdg_state_home(), xdg_base)
+
+
 def get_logs_config(service_name: Optional[str] = None,
                     _cfg: Optional[dict] = None) -> dict:
     """
@@ -248,9 +1114,92 @@ def get_logs_config(service_name: Optional[str] = None,
     # Grab the log level from whatever section we found, defaulting to INFO
     _log_level = _cfg.get("log_level", "INFO")
     _logs_conf["level"] = _log_level
+    # Per-module level overrides from the same section
+    if _cfg.get("modules"):
+        _logs_conf["modules"] = _cfg["modules"]
     return _logs_conf
 
 
+# call site -> resolved (location, call_info, call_site), see `log_deprecation`
+_deprecation_origins = {}
+_deprecation_origins_size = 4096
+# (location, call_site, log_message) -> [number of calls, monotonic time of
+# the last warning], least recently hit entries are dropped
+_deprecation_hits = OrderedDict()
+_deprecation_hits_size = 4096
+_deprecation_lock = Lock()
+# seconds between repeated warnings for the same call site and message,
+# `None` to only warn once
+_deprecation_interval = None
+
+
+def set_deprecation_log_interval(seconds: Optional[float] = None):
+    """
+    Set how often `log_deprecation` repeats a warning for the same call site
+    and message. By default every warning is only logged once.
+    @param seconds: minimum time between repeated warnings, None to only
+        warn once
+    """
+    global _deprecation_interval
+    _deprecation_interval = seconds
+
+
+def get_deprecation_counts() -> Dict[Tuple[str, str, str], int]:
+    """
+    Get how often each deprecated code path was hit, including calls for
+    which no warning was logged. Only the most recently hit call sites are
+    tracked, see `_deprecation_hits_size`.
+    @return: dict of (deprecated location, call site, log message) to number
+        of calls
+    """
+    with _deprecation_lock:
+        return {hit: count for hit, (count, _) in _deprecation_hits.items()}
+
+
+def _get_frame_module(frame) -> str:
+    return LOG._get_caller_module(frame) or frame.f_code.co_filename
+
+
+def _is_internal_frame(name: str) -> bool:
+    # Skip calls from this module and unittests to get at real origin
+    return name.startswith("ovos_utils.log") or name.startswith("<")
+
+
+def _resolve_deprecation_origin(frame, func_name: Optional[str],
+                                func_module: Optional[str],
+                                excluded_package_refs: Optional[List[str]]) \
+        -> Tuple[Optional[str], str]:
+    """
+    Walk up the stack from `frame` to find where a deprecated method was
+    called from.
+    @return: location to log as (None to use `LOG.name` only) and a
+        description of the call origin
+    """
+    call_info = "Unknown Origin"
+    origin_module = func_module
+    location = f"{func_module}:{func_name}" if \
+        func_module and func_name else None
+    while frame is not None:
+        name = _get_frame_module(frame)
+        call = frame
+        frame = frame.f_back
+        if _is_internal_frame(name):
+            continue
+        if not origin_module:
+            # Assume first outside call is the origin if not specified
+            origin_module = name
+            location = f"{name}:{func_name or call.f_code.co_name}:" \
+                       f"{call.f_lineno}"
+            continue
+        if excluded_package_refs and any((name.startswith(x) for x in
+                                          excluded_package_refs)):
+            continue
+        if not name.startswith(origin_module):
+            call_info = f"{name}:{call.f_lineno}"
+            break
+    return location, call_info
+
+
 def log_deprecation(log_message: str = "DEPRECATED",
                     deprecation_version: str = "Unknown",
                     func_name: str = None,
@@ -258,7 +1207,9 @@ def log_deprecation(log_message: str = "DEPRECATED",
                     excluded_package_refs: List[str] = None):
     """
     Log a deprecation warning with information for the call outside the module
-    that is generating the warning
+    that is generating the warning. Every call is counted (see
+    `get_deprecation_counts`), but a warning for the same call site and
+    message is only logged once (see `set_deprecation_log_interval`).
     @param log_message: Log contents describing the deprecation
     @param deprecation_version: package version in which method will be deprecated
     @param func_name: decorated function name (else read from stack)
@@ -267,33 +1218,58 @@ def log_deprecation(log_message: str = "DEPRECATED",
         determination. i.e. an internal exception handling method should log the
         first call external to that package
     """
-    stack = inspect.stack()[1:]  # [0] is this method
-    call_info = "Unknown Origin"
-    origin_module = func_module
-    log_name = f"{LOG.name} - {func_module}:{func_name}" if \
-        func_module and func_name else LOG.name
-    for call in stack:
-        module = inspect.getmodule(call.frame)
-        name = module.__name__ if module else call.filename
-        if any((name if name.startswith(x) else None
-                for x in ("ovos_utils.log", "<"))):
-            # Skip calls from this module and unittests to get at real origin
-            continue
-        if not origin_module:
-            # Assume first outside call is the origin if not specified
-            origin_module = name
-            log_name = f"{LOG.name} - {name}:{func_name or call[3]}:{call[2]}"
-            continue
-        if excluded_package_refs and any((name.startswith(x) for x in
-                                          excluded_package_refs)):
-            continue
-        if not name.startswith(origin_module):
-            call_info = f"{name}:{call.lineno}"
-            break
-    # Explicitly format log to print origin log reference
-    LOG.create_logger(log_name).warning(
-        f"Deprecation version={deprecation_version}. Caller={call_info}. "
-        f"{log_message}")
+    frame = _get_caller_frame(1)  # [0] is this method
+    while frame is not None and _is_internal_frame(_get_frame_module(frame)):
+        frame = frame.f_back
+
+    # the origin is resolved once per call site outside of this module
+    site = None
+    origin = None
+    if frame is not None:
+        site = (frame.f_code, frame.f_lineno, func_name, func_module,
+                tuple(excluded_package_refs or ()))
+        origin = _deprecation_origins.get(site)
+    if origin is None:
+        location, call_info = _resolve_deprecation_origin(
+            frame, func_name, func_module, excluded_package_refs)
+        call_site = call_info
+        if frame is not None:
+            call_site = f"{_get_frame_module(frame)}:" \
+                        f"{frame.f_code.co_name}:{frame.f_lineno}"
+        origin = (location, call_info, call_site)
+        if site is not None:
+            if len(_deprecation_origins) >= _deprecation_origins_size:
+                _deprecation_origins.clear()
+            _deprecation_origins[site] = origin
+    location, call_info, call_site = origin
+
+    hit = (location or "", call_site, log_message)
+    now = time.monotonic()
+    with _deprecation_lock:
+        entry = _deprecation_hits.get(hit)
+        if entry is None:
+            if len(_deprecation_hits) >= _deprecation_hits_size:
+                _deprecation_hits.popitem(last=False)
+            entry = _deprecation_hits[hit] = [0, None]
+        else:
+            _deprecation_hits.move_to_end(hit)
+        entry[0] += 1
+        last_logged = entry[1]
+        if last_logged is not None and \
+                (_deprecation_interval is None or
+                 now - last_logged < _deprecation_interval):
+            return
+        entry[1] = now
+
+    if not LOG.isEnabledFor(logging.WARNING):
+        return
+    # Explicitly format log to print origin log reference, reported at the
+    # call site on the logger of the calling module
+    location = f"Location={location}. " if location else ""
+    LOG._log(logging.WARNING,
+             f"Deprecation version={deprecation_version}. {location}"
+             f"Caller={call_info}. {log_message}", (),
+             frame=frame or _get_caller_frame(1))
 
 
 def deprecated(log_message: str, deprecation_version: str):
@@ -394,5 +1370,5 @@ def get_available_logs(directories: Optional[List[str]] = None) -> List[str]:
         list of log file basenames (i.e. "audio", "skills")
     """
     directories = directories or get_log_paths()
-    return [Path(f).stem for path in directories
+    return [Path(f).stem for path in directories if os.path.isdir(path)
             for f in os.listdir(path) if Path(f).suffix == ".log"]
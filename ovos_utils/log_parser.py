@@ -1,204 +1,106 @@
-import re
 import os
+import pydoc
 from datetime import datetime
-from traceback import FrameSummary
-from dataclasses import dataclass
-from typing import Any, Tuple, List, Generator, Dict, Union, Optional
+from functools import lru_cache
+from typing import Any, Callable, Tuple, List, Dict, Union, Optional
 
-from dateutil.parser import parse
+import orjson
 import rich_click as click
-from rich.console import Console
-from rich.style import Style
-from rich.table import Table
-import pydoc
-from combo_lock import ComboLock
-
-try:
-    from ovos_config import Configuration
-    use24h = Configuration().get("time_format", "full") == "full"
-    date_format = Configuration().get("date_format", "DMY")
-except ImportError:
-    use24h = True
-    date_format = "DMY"
-    
+
 from ovos_utils.log import get_log_path, get_log_paths, get_available_logs
+# the parser lives in its own module so services can import it without the
+# dependencies of this command line tool, re-exported for backwards compatibility
+from ovos_utils.log_parsing import TIME_FORMAT, TIMESTAMP_PATTERN, LogLine, Frame, Traceback, \
+    OVOSLogParser, LogStreamParser, LogFollower, LogStats, LogIndex, COMPRESSED_EXTENSIONS, \
+    is_compressed, open_log, get_rotated_logs, read_lines_reversed, get_last_load_time
 
+# console, LOGLOCK and the time formats below are created on first use by
+# `__getattr__`, importing this module should not read the configuration
+_TIME_FORMAT_NAMES = ("use24h", "date_format", "EXPECTED_DATE_FORMAT", "EXPECTED_DATE",
+                      "EXPECTED_DATETIME_FORMAT", "EXPECTED_TIME", "STARTTIMEHELP")
 
-TIME_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
-LOGLOCK = ComboLock("ovos_logs_console_script")
+LOGSOPTHELP = """logs to be sliced 
+\n\nmultiple: -l bus -l audio"""
 
 
-@dataclass
-class LogLine:
-    timestamp: datetime = None
-    source: str = ""
-    location: str = ""
-    level: str = ""
-    message: str = ""
+@lru_cache()
+def get_time_formats() -> Dict[str, Any]:
+    """
+    Read the time and date format from the configuration, on first use
+    :return: dict of `use24h`, `date_format` and the expected input formats
+    """
+    try:
+        from ovos_config import Configuration
+        config = Configuration()
+        use24h = config.get("time_format", "full") == "full"
+        date_format = config.get("date_format", "DMY")
+    except ImportError:
+        use24h = True
+        date_format = "DMY"
+
+    expected_date_format = "YYYY-MM-DD" if date_format == "YMD" else "DD-MM-YYYY"
+    expected_date = "2023-12-01" if date_format == "YMD" else "01-12-2023"
+    expected_datetime_format = f'"[{expected_date_format}] HH:MM[:SS]{" AM/PM" if not use24h else ""}"'
+    return {
+        "use24h": use24h,
+        "date_format": date_format,
+        "EXPECTED_DATE_FORMAT": expected_date_format,
+        "EXPECTED_DATE": expected_date,
+        "EXPECTED_DATETIME_FORMAT": expected_datetime_format,
+        "EXPECTED_TIME": f'"09:00:05{" PM" if not use24h else ""}"',
+        "STARTTIMEHELP": f"""start time of the log slice (default: since service restart,
+input format: {expected_datetime_format})
+\n\nExample: -s \"{expected_date} 12:00{' AM/PM' if not use24h else ''}\" / -s
+ {'"' if not use24h else ''}12:00:05{' AM/PM"' if not use24h else ''}"""
+    }
 
-    def __str__(self):
-        # sytsem messages etc.
-        if not all([self.source, self.location, self.level]):
-            return self.message
-        return f"{self.format_timestamp()} - {self.source} - {self.location} - {self.level} - {self.message}"
-    
-    def format_timestamp(self):
-        if self.timestamp:
-            return self.timestamp.strftime(TIME_FORMAT)[:-3]
-        return ""
-
-
-# Traceback frame
-class Frame(FrameSummary):
-    def __init__(self, filename, lineno, name, line):
-        super().__init__(filename, lineno, name, line=line)
-      
-    def as_dict(self):
-        return {
-            "location": self.format_location(),
-            "level": "TRACEBACK",
-            "message": self.line
-        }
-    
-    def as_logline(self):
-        return LogLine(**self.as_dict())
-    
-    def format_location(self):
-        if "/bin/" in self.filename:
-            package = self.filename.split("/bin/")[-1].replace(".py", "")\
-                    .replace("-", "_").replace("/", ".")
-        elif "site-packages" not in self.filename and \
-                (pyver := re.search(r"python\d\.\d+[\\/]", self.filename)):
-            package = self.filename.split(pyver.group())[-1].replace(".py", "")\
-                    .replace("-", "_").replace("/", ".")
-        else:
-            package = self.filename.split("site-packages/")[-1].replace(".py", "")\
-                    .replace("-", "_").replace("/", ".")
-        method = self.name.replace(".py", "").replace("-", "_")
-        return f"{package}:{method}:{self.lineno}"
-    
-    def __str__(self):
-        return f'  File "{self.filename}", line {self.lineno}, in {self.name}\n    {self.line}\n'
 
+def get_console():
+    """
+    Get the console used for output, created on first use
+    """
+    if "console" not in globals():
+        from rich.console import Console
+        globals()["console"] = Console()
+    return globals()["console"]
 
-class Traceback:
-    PATTERN = r'File "(?P<filename>[^"]+)", line (?P<lineno>\d+), in (?P<name>\S+)\n\s*(?P<line>.+)'
 
-    def __init__(self, frames: List[Frame], exception: str, timestamp: datetime = None):
-        self.frames = frames
-        self.exception = exception
-        self._timestamp = timestamp
-    
-    @property
-    def exception_location(self):
-        return self.frames[-1].format_location()
-    
-    @property
-    def timestamp(self):
-        return self._timestamp
-    
-    @timestamp.setter
-    def timestamp(self, value):
-        self._timestamp = value
+@lru_cache()
+def get_log_lock():
+    """
+    Get the lock held while the log files are modified, created on first use
+    """
+    from combo_lock import ComboLock
+    return ComboLock("ovos_logs_console_script")
 
-    def to_loglines(self) -> List[LogLine]:
-        
-        lines = [LogLine(timestamp=self.timestamp,
-                         location=self.exception_location,
-                         level="EXCEPTION",
-                         message=self.exception)]
 
-        for frame in self.frames:
-            lines.append(frame.as_logline())
-        
-        return lines
+def __getattr__(name):
+    if name == "console":
+        return get_console()
+    if name == "LOGLOCK":
+        return get_log_lock()
+    if name in _TIME_FORMAT_NAMES:
+        return get_time_formats()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-    @classmethod
-    def from_list(cls, lines):
-        lines = [line if line.endswith("\n") else line + "\n" for line in lines]
-        multiline = "".join(lines)
-        return cls.from_string(multiline)
-    
-    @classmethod
-    def from_string(cls, s):
-        matches = re.findall(cls.PATTERN, s, re.MULTILINE)
-        frames = []
-        for match in matches:
-            data = dict(zip(["filename", "lineno", "name", "line"], match))
-            frames.append(Frame(**data))
-        exception = next(line for line in s.split("\n")[::-1] if line)
-        return cls(frames, exception)
-    
-    def __str__(self):
-        multiline = "Traceback (most recent call last):\n"
-        for frame in self.frames:
-            multiline += str(frame)
-        multiline += f"{self.exception}\n"
-        return multiline
-
-
-class OVOSLogParser:
-    LOG_PATTERN = r'(?P<timestamp>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d{1,6}) - (?P<source>.+?) - (?P<location>.+?) - (?P<level>\w+) - (?P<message>.*)'
-
-    @classmethod
-    def parse(self, log_line, last_timestamp=None) -> LogLine:
-        log_line.rstrip("\n")
-        match = re.match(self.LOG_PATTERN, log_line)
-        data = {}
-        if match:
-            data = match.groupdict()
-            data['timestamp'] = datetime.strptime(data['timestamp'], TIME_FORMAT)
-            return LogLine(**data)
-        
-        data["timestamp"] = last_timestamp or ""
-        data["message"] = log_line
-        return LogLine(**data)
-    
-    @classmethod
-    def parse_file(self, source) -> Generator[Union[LogLine, Traceback], None, None]:
-        if not os.path.exists(source):
-            raise FileNotFoundError(f"File {source} does not exist")
-
-        with open(source, 'r') as file:
-            trace = None
-            last_timestamp = None
-            for line in file:
-                # gather all lines of the traceback
-                if line == "Traceback (most recent call last):\n":
-                    trace = [line]
-                    continue
-                # TODO do tracebacks always end on a empty line?
-                elif trace and line == "\n":
-                    trace.append(line)
-                    traceback = Traceback.from_list(trace)
-                    traceback.timestamp = last_timestamp
-                    yield traceback
-                    trace = None
-                elif trace:
-                    trace.append(line)
-                else:
-                    log = self.parse(line, last_timestamp)
-                    if log.message == "\n":
-                        continue
-                    timestamp = log.timestamp
-                    if timestamp:
-                        last_timestamp = timestamp
-                    yield log
-
-
-console = Console()
-
-EXPECTED_DATE_FORMAT = "YYYY-MM-DD" if date_format == "YMD" else "DD-MM-YYYY"
-EXPECTED_DATE = "2023-12-01" if date_format == "YMD" else "01-12-2023"
-EXPECTED_DATETIME_FORMAT = f'"[{EXPECTED_DATE_FORMAT}] HH:MM[:SS]{" AM/PM" if not use24h else ""}"'
-EXPECTED_TIME = f'"09:00:05{" PM" if not use24h else ""}"'
 
-LOGSOPTHELP = """logs to be sliced 
-\n\nmultiple: -l bus -l audio"""
-STARTTIMEHELP = f"""start time of the log slice (default: since service restart,
-input format: {EXPECTED_DATETIME_FORMAT})
-\n\nExample: -s \"{EXPECTED_DATE} 12:00{' AM/PM' if not use24h else ''}\" / -s
- {'"' if not use24h else ''}12:00:05{' AM/PM"' if not use24h else ''}"""
+class DeferredOption(click.Option):
+    """
+    Option whose help text may be a callable, so help depending on the
+    configuration is only built when it is displayed
+    """
+    def __init__(self, *args, help: Union[str, Callable[[], str], None] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.help = help
+
+    @property
+    def help(self) -> Optional[str]:
+        return self._help() if callable(self._help) else self._help
+
+    @help.setter
+    def help(self, value):
+        self._help = value
+
 
 click.rich_click.STYLE_ARGUMENT = "dark_red"
 click.rich_click.STYLE_OPTION = "dark_red"
@@ -223,6 +125,14 @@ click.rich_click.COMMAND_GROUPS = {
                 "padding": (0, 2),
             },
         },
+        {
+            "name": "Log statistics",
+            "commands": ["stats"],
+            "table_styles": {
+                "row_styles": ["white"],
+                "padding": (0, 2),
+            },
+        },
         {
             "name": "Downsize logs",
             "commands": ["reduce"],
@@ -231,6 +141,14 @@ click.rich_click.COMMAND_GROUPS = {
                 "padding": (0, 1),
             },
         },
+        {
+            "name": "Follow logs",
+            "commands": ["tail"],
+            "table_styles": {
+                "row_styles": ["white"],
+                "padding": (0, 2),
+            },
+        },
         {
             "name": "Show logs (using less)",
             "commands": ["show"],
@@ -243,25 +161,6 @@ click.rich_click.COMMAND_GROUPS = {
 }
 
 
-def get_last_load_time(directories: Optional[List[str]] = None) -> Optional[datetime]:
-    # if nothing's found return the beginning of unix time
-    last_timestamp = datetime.fromtimestamp(0)
-    if directories is None:
-        directory = get_log_path("skills")
-    else:
-        directory = get_log_path("skills", directories)
-    
-    if directory:
-        with open(os.path.join(directory,"skills.log"), "r") as f:
-            for line in f.readlines()[::-1]:
-                logline = OVOSLogParser.parse(line)
-                if logline.timestamp:
-                    last_timestamp = logline.timestamp 
-                if logline.message == "Loading message bus configs":
-                    break
-    return last_timestamp
-
-
 def valid_log(logs, paths):
     for log in logs:
         if log.lower() not in get_available_logs(paths):
@@ -269,7 +168,175 @@ def valid_log(logs, paths):
     return True
 
 
+# level: (style, abbreviation, message style)
+LEVEL_STYLES = {
+    "ERROR": ("bold red", "E", ""),
+    "EXCEPTION": ("bold red", "EXC", ""),
+    "WARNING": ("bold yellow", "W", ""),
+    "DEBUG": ("bold blue", "D", ""),
+    "TRACEBACK": ("white", "TRACE", "grey42"),
+    "INFO": ("white", "I", "navajo_white1"),
+}
+
+
+def format_logline(logline: LogLine, service: Optional[str] = None) -> str:
+    """
+    Format a log line for the console, colored by log level
+    :param logline: the log line
+    :param service: name of the service log, shown in front of the line
+    :return: console markup
+    """
+    from rich.markup import escape
+
+    use24h = get_time_formats()["use24h"]
+    timestamp = logline.timestamp or ""
+    if isinstance(timestamp, datetime):
+        timestamp = timestamp.strftime("%H:%M:%S.%f" if use24h else "%I:%M:%S.%f")[:-3]
+        if not use24h:
+            timestamp += logline.timestamp.strftime(" %p")
+    style, level, message_style = LEVEL_STYLES.get(logline.level, ("", logline.level or "", ""))
+    level = f"[{style}]{level}[/{style}]" if style else escape(level)
+    message = escape((logline.message or "").rstrip("\n"))
+    if message_style:
+        message = f"[{message_style}]{message}[/{message_style}]"
+    line = f"[cyan]{timestamp}[/cyan] {level} {message} [green]{escape(logline.location or '')}[/green]"
+    if service:
+        line = f"[bold]{escape(service)}[/bold] {line}"
+    return line
+
+
+def serialize_entry(log: Union[LogLine, Traceback], service: str, output_format: str = "text") -> str:
+    """
+    Serialize a parsed log entry for an output file
+    :param log: LogLine or Traceback
+    :param service: name of the service log the entry was read from
+    :param output_format: "text" for log lines as written by `LOG`, "json" for JSON lines
+    :return: serialized entry, including the trailing newline
+    """
+    if output_format == "json":
+        if isinstance(log, Traceback):
+            data = {"timestamp": log.timestamp, "service": service, "level": "TRACEBACK",
+                    "exception": log.exception,
+                    "frames": [{"filename": frame.filename, "lineno": frame.lineno,
+                                "name": frame.name, "line": frame.line} for frame in log.frames]}
+        else:
+            data = {"timestamp": log.timestamp, "service": service, "source": log.source,
+                    "location": log.location, "level": log.level, "message": log.message}
+        return orjson.dumps(data).decode() + "\n"
+    if isinstance(log, Traceback):
+        return str(log)
+    return str(log) + "\n"
+
+
+def print_entries(entries, sources: Dict[str, str], file: Optional[str] = None,
+                  output_format: str = "text") -> int:
+    """
+    Print parsed log entries as they come in, optionally writing them to a file
+    :param entries: iterable of (source, entry) tuples, see `OVOSLogParser.parse_files`
+    :param sources: dict of log file path to service name
+    :param file: path of the output file
+    :param output_format: format of the output file, "text" or "json"
+    :return: number of entries printed
+    :raises click.exceptions.Exit: if `file` is not writable
+    """
+    console = get_console()
+    count = 0
+    show_service = len(set(sources.values())) > 1
+    output = None
+    try:
+        for source, log in entries:
+            service = sources[source]
+            if file is not None and output is None:
+                try:
+                    output = open(file, "w")
+                except OSError:
+                    # absolute paths in brackets would be read as markup
+                    console.print(f"File [{file}] is not writable. Aborted", markup=False)
+                    # end the command, no further messages about the output
+                    raise click.exceptions.Exit(1)
+            loglines = log.to_loglines() if isinstance(log, Traceback) else [log]
+            for logline in loglines:
+                console.print(format_logline(logline, service if show_service else None), emoji=False)
+            if output is not None:
+                output.write(serialize_entry(log, service, output_format))
+            count += 1
+    finally:
+        if output is not None:
+            output.close()
+    return count
+
+
+def _move_to_start(file, offset: int, chunk_size: int) -> int:
+    """
+    Move everything from `offset` to the end of `file` to its start, in
+    kernel space where supported
+    :return: number of bytes moved
+    """
+    # the ranges read and written by one copy must not overlap
+    chunk_size = min(chunk_size, offset)
+    moved = 0
+    if hasattr(os, "copy_file_range"):
+        try:
+            while n := os.copy_file_range(file.fileno(), file.fileno(), chunk_size,
+                                          offset + moved, moved):
+                moved += n
+            return moved
+        except OSError:
+            pass  # not supported by this file system, continue below
+    while True:
+        file.seek(offset + moved)
+        chunk = file.read(chunk_size)
+        if not chunk:
+            return moved
+        file.seek(moved)
+        file.write(chunk)
+        moved += len(chunk)
+
+
+def remove_log_head(source: str, offset: int, chunk_size: int = 1024 * 1024) -> bool:
+    """
+    Remove everything before `offset` from a log file. The remaining data is
+    moved to the start of the file in chunks and the file is truncated, it
+    is never loaded into memory. The file is rewritten in place, so services
+    appending to it keep logging into it; only records written between the
+    last chunk and the truncation are lost.
+    Callers are expected to hold `get_log_lock()`.
+    :param source: path to the log file
+    :param offset: byte offset of the first byte to keep
+    :param chunk_size: number of bytes copied at a time
+    :return: True if the log file was reduced
+    """
+    if offset <= 0:
+        return False
+    try:
+        with open(source, "r+b") as file:
+            file.truncate(_move_to_start(file, offset, chunk_size))
+    except OSError:
+        return False
+    return True
+
+
+def get_log_files(logs, paths) -> Dict[str, str]:
+    """
+    Get the log files of the given services
+    :param logs: service names
+    :param paths: the directories logs reside in
+    :return: dict of log file path to service name, for existing logs only
+    """
+    files = {}
+    for service in logs:
+        path = get_log_path(service, paths)
+        if path is None:
+            continue
+        logfile = os.path.join(path, f"{service}.log")
+        if os.path.exists(logfile):
+            files[logfile] = service
+    return files
+
+
 def parse_time(time_str):
+    from dateutil.parser import parse
+
     try:
         time = parse(time_str)
     except ValueError:
@@ -321,13 +388,16 @@ def ovos_logs():
 
 
 @ovos_logs.command()
-@click.option("--start", "-s", help=STARTTIMEHELP)
+@click.option("--start", "-s", cls=DeferredOption, help=lambda: get_time_formats()["STARTTIMEHELP"])
 @click.option("--until", "-u", help=f"end time of the log slice [default: now]")
-@click.option("--logs", "-l", multiple=True, default=get_available_logs(), help=LOGSOPTHELP, show_default=True)
-@click.option("--paths", "-p", multiple=True, default=get_log_paths(), help=f"the directory logs reside in", show_default=True)
+@click.option("--logs", "-l", multiple=True, cls=DeferredOption, default=get_available_logs, help=LOGSOPTHELP, show_default=True)
+@click.option("--paths", "-p", multiple=True, cls=DeferredOption, default=get_log_paths, help=f"the directory logs reside in", show_default=True)
 @click.option("--file", "-f", is_flag=False, flag_value=get_timestamped_filename("slice", "log"),
               default=None, help=f"output as file (if flagged, but not specified: {get_timestamped_filename('slice', 'log')})")
-def slice(start, until, logs, paths, file):
+@click.option("--format", "output_format", type=click.Choice(["text", "json"]), default="text",
+              help="output file format, plain log lines or JSON lines", show_default=True)
+@click.option("--index", "-i", is_flag=True, help="keep a sparse timestamp index next to the logs to speed up repeated slices")
+def slice(start, until, logs, paths, file, output_format, index):
     """\b
     Optionally define start (`-s`) and the time until (`-u`) the slice should be limited to.  
     \b
@@ -339,104 +409,35 @@ def slice(start, until, logs, paths, file):
     > ovos-logs slice                                            # Slice all logs from service start up until now  
     > ovos-logs slice -s 01-12-2023 -u '01-12-2023 17:00:20'     # Slice all logs from the start of december the first until 17:00:20  
     > ovos-logs slice -l bus -l skills -f ~/myslice.log          # Slice skills.log and bus.log from service start up until now and dump it to the file ~/myslice.log  
+    > ovos-logs slice -i -s '01-12-2023 17:00'                   # Slice all logs since 17:00, indexing the logs for the next slice  
+    > ovos-logs slice -l skills -f ~/myslice.jsonl --format json # Slice skills.log and dump it as JSON lines to ~/myslice.jsonl  
     """
     logs_present = []
 
     if not all(os.path.exists(path) for path in paths):
-        return console.print(f"Directory [{[p for p in paths if not os.path.exists(p)]}] does not exist")
+        return get_console().print(f"Directory [{[p for p in paths if not os.path.exists(p)]}] does not exist")
     else:
         logs_present = get_available_logs(paths)
 
     start, end = parse_timeframe(start, until, paths)
     if start is None:
-        return console.print(f"Need a valid start time in the format {EXPECTED_DATETIME_FORMAT}")
+        return get_console().print(f"Need a valid start time in the format {get_time_formats()['EXPECTED_DATETIME_FORMAT']}")
     elif end is None:
-        return console.print(f"Need a valid end time in the format {EXPECTED_DATETIME_FORMAT}")
+        return get_console().print(f"Need a valid end time in the format {get_time_formats()['EXPECTED_DATETIME_FORMAT']}")
     elif start > end:
-        return console.print(f"Start time [{start}] is after end time [{end}]")
+        return get_console().print(f"Start time [{start}] is after end time [{end}]")
 
     if not logs:
         logs = logs_present
     elif not valid_log(logs, paths):
-        return console.print(f"Invalid log name, valid logs are {logs_present}")
+        return get_console().print(f"Invalid log name, valid logs are {logs_present}")
 
-    _templog: Dict[str, List[LogLine]] = dict()
-
-    for service in logs:
-        path = get_log_path(service, paths)
-        logfile = os.path.join(path, f"{service}.log")
-        if not os.path.exists(logfile):
-            continue
-        _templog[service] = []
-        for log in OVOSLogParser.parse_file(logfile):
-            if start <= log.timestamp < end:
-                if isinstance(log, Traceback):
-                    _templog[service].extend(log.to_loglines())
-                else:
-                    _templog[service].append(log)
-        if not _templog[service]:
-            del _templog[service]
-
-    if not _templog:
-        return console.print("No logs found in the specified time frame")
-    
+    sources = get_log_files(logs, paths)
+    entries = OVOSLogParser.parse_files(sources, start, end, use_index=index)
+    if not print_entries(entries, sources, file, output_format):
+        return get_console().print("No logs found in the specified time frame")
     if file is not None:
-        # test if file is writable
-        try:
-            with open(file, 'w') as f:
-                pass
-        except:
-            return console.print(f"File [{file}] is not writable. Aborted")
-        else:
-            console.print(f"Log slice saved to [bold]{file}[/bold]")
-
-    for service in _templog:
-        table = Table(title=service)
-        table.add_column("Time", style="cyan", no_wrap=True)
-        table.add_column()
-        table.add_column("Message", style="magenta")
-        table.add_column("Origin", style="green")
-        lineno = 0
-        for logline in _templog[service]:
-            lineno += 1
-            style = None
-            timestamp = logline.timestamp or ""
-            if isinstance(timestamp, datetime):
-                timestamp = timestamp.strftime("%H:%M:%S.%f" if use24h else "%I:%M:%S.%f")[:-3]
-                if not use24h:
-                    timestamp += logline.timestamp.strftime(" %p")
-
-            level = logline.level or ""
-            message = logline.message or ""
-            if level == "ERROR":
-                level = "[bold red]" + level[:1]
-            elif level == "EXCEPTION":
-                level = "[bold red]" + level[:3]
-            elif level == "WARNING":
-                level = "[bold yellow]" + level[:1]
-            elif level == "DEBUG":
-                level = "[bold blue]" + level[:1]
-            elif level == "TRACEBACK":
-                level = "[white]" + level[:5]
-                message = "[grey42]" + message
-            elif level == "INFO":
-                level = ""
-                message = "[navajo_white1]" + message
-            if lineno % 2 == 0:
-                style = Style(bgcolor="grey7")
-            table.add_row(
-                timestamp,
-                level,
-                message,
-                logline.location or "",
-                style=style
-            )
-            if len(logline.message) > 200:
-                table.add_row()
-
-        console.print(table)
-        if file:
-            Console(file=open(file, 'a')).print(table)
+        get_console().print(f"Log slice saved to [bold]{file}[/bold]")
 
 
 @ovos_logs.command()
@@ -444,13 +445,15 @@ def slice(start, until, logs, paths, file):
 @click.option("--warning", "-w", is_flag=True, help="display warning messages")
 @click.option("--exception", "-x", is_flag=True, help="display exceptions")
 @click.option("--debug", "-d", is_flag=True, help="display debug messages")
-@click.option("--start", "-s", help=STARTTIMEHELP)
+@click.option("--start", "-s", cls=DeferredOption, help=lambda: get_time_formats()["STARTTIMEHELP"])
 @click.option("--until", "-u", help=f"end time of the log slice [default: now]")
-@click.option("--logs", "-l", multiple=True, default=get_available_logs(), help=LOGSOPTHELP, show_default=True)
-@click.option("--paths", "-p", multiple=True, type=click.Path(), default=get_log_paths(), help=f"the directory logs reside in", show_default=True)
+@click.option("--logs", "-l", multiple=True, cls=DeferredOption, default=get_available_logs, help=LOGSOPTHELP, show_default=True)
+@click.option("--paths", "-p", multiple=True, type=click.Path(), cls=DeferredOption, default=get_log_paths, help=f"the directory logs reside in", show_default=True)
 @click.option("--file", "-f", is_flag=False, type=click.Path(), flag_value=get_timestamped_filename("list", "log"), default=None,
               help=f"output as file (if flagged, but not specified: {get_timestamped_filename('list', 'log')})")
-def list(error, warning, exception, debug, start, until, logs, paths, file):
+@click.option("--format", "output_format", type=click.Choice(["text", "json"]), default="text",
+              help="output file format, plain log lines or JSON lines", show_default=True)
+def list(error, warning, exception, debug, start, until, logs, paths, file, output_format):
     """\b
     Log level has to be specified.  
     \b
@@ -467,118 +470,180 @@ def list(error, warning, exception, debug, start, until, logs, paths, file):
     > ovos-logs list -x -l bus -l skills -f                       # List all exceptions from skills.log and bus.log and dump it to the file ~/list_xxx_xxx.log  
     """
     if not any([error, warning, debug, exception]):
-        return console.print("Need at least one of --error, --warning, --exception or --debug")
+        return get_console().print("Need at least one of --error, --warning, --exception or --debug")
     else:
         log_levels = [lv_str for lv, lv_str in [(error, "ERROR"), (warning, "WARNING"),
                                                 (debug, "DEBUG"), (exception, "EXCEPTION")] if lv]
 
     if not all(os.path.exists(path) for path in paths):
-        return console.print(f"Directory [{[p for p in paths if not os.path.exists(p)]}] does not exist")
+        return get_console().print(f"Directory [{[p for p in paths if not os.path.exists(p)]}] does not exist")
     else:
         logs_present = get_available_logs(paths)
 
     start, end = parse_timeframe(start, until, paths)
     if start is None:
-        return console.print(f"Need a valid start time in the format {EXPECTED_DATETIME_FORMAT}")
+        return get_console().print(f"Need a valid start time in the format {get_time_formats()['EXPECTED_DATETIME_FORMAT']}")
     elif end is None:
-        return console.print(f"Need a valid end time in the format {EXPECTED_DATETIME_FORMAT}")
+        return get_console().print(f"Need a valid end time in the format {get_time_formats()['EXPECTED_DATETIME_FORMAT']}")
     elif start > end:
-        return console.print(f"Start time [{start}] is after end time [{end}]")
+        return get_console().print(f"Start time [{start}] is after end time [{end}]")
     
     if not logs:
         logs = logs_present
     elif not valid_log(logs, paths):
-        return console.print(f"Invalid log name, valid logs are {logs_present}")
-    
-    _templog: Dict[str, List[LogLine]] = dict()
-
-    for service in logs:
-        path = get_log_path(service, paths)
-        if path is None:
-            continue
-        logfile = os.path.join(path, f"{service}.log")
-        _templog[service] = []
-        for log in OVOSLogParser.parse_file(logfile):
-            if isinstance(log, Traceback):
-                if exception:
-                    _templog[service].extend(log.to_loglines())
-                continue
-            # LOG.exception
-            if exception and log.level == "EXCEPTION":
-                _templog[service].append(log)
-            if error and log.level == "ERROR":
-                _templog[service].append(log)
-            if warning and log.level == "WARNING":
-                _templog[service].append(log)
-            if debug and log.level == "DEBUG":
-                _templog[service].append(log)
-        if not _templog[service]:
-            del _templog[service]
-    
-    if not _templog:
-        return console.print("No logs found for the specified log level")
+        return get_console().print(f"Invalid log name, valid logs are {logs_present}")
     
+    sources = get_log_files(logs, paths)
+    # tracebacks and LOG.exception records are both kept by "EXCEPTION"
+    entries = OVOSLogParser.parse_files(sources, start, end, levels=set(log_levels))
+    if not print_entries(entries, sources, file, output_format):
+        return get_console().print("No logs found for the specified log level")
     if file is not None:
-        # test if file is writable
-        try:
-            with open(file, 'w') as f:
-                pass
-        except:
-            return console.print(f"File [{file}] is not writable. Aborted")
-        else:
-            console.print(f"Log list saved to [bold]{file}[/bold]")
-
-    for service in _templog:
-        table = Table(title=f"{service} ({','.join(log_levels)})")
-        # for traceback indication
-        table.add_column("Time", style="cyan", no_wrap=True)
-        if exception or len(log_levels) > 1:
-            table.add_column()
-        table.add_column("Message", style="magenta")
-        table.add_column("Origin", style="green")
-        lineno = 0
-        for log in _templog[service]:
-            style = None
-            lineno += 1
-            timestamp = log.timestamp or ""
-            if timestamp:
-                timestamp = timestamp.strftime("%H:%M:%S.%f" if use24h else "%I:%M:%S.%f")[:-3]
-            if not use24h and timestamp:
-                timestamp += log.timestamp.strftime(" %p")
-            level = log.level.upper()
-            message = log.message.rstrip("\n")
-            if level == "ERROR":
-                level = "[bold red]" + level[:1]
-            elif level == "EXCEPTION":
-                level = "[bold red]" + level[:3]
-            elif level == "WARNING":
-                level = "[bold yellow]" + level[:1]
-            elif level == "DEBUG":
-                level = "[bold blue]" + level[:1]
-            elif level == "TRACEBACK":
-                level = "[white]" + level[:5]
-                message = "[grey42]" + message
-            elif level == "INFO":
-                level = ""
-                message = "[navajo_white1]" + message
-
-            if lineno % 2 == 0:
-                style = Style(bgcolor="grey7")
-            row = [timestamp, level, message, log.location]
-            if not exception and len(log_levels) < 2:
-                row.pop(1)                
-            table.add_row(*row, style=style)
-            if len(log.message) > 200:
-                table.add_row()
-
-        console.print(table)
-        if file:
-            Console(file=open(file, 'a')).print(table)
+        get_console().print(f"Log list saved to [bold]{file}[/bold]")
 
     
 @ovos_logs.command()
-@click.option("--log", "-l", required=True, type=click.Choice(get_available_logs(), case_sensitive=False), help=f"log to show; available: {get_available_logs()}")
-@click.option("--paths", "-p", multiple=True, type=click.Path(), default=get_log_paths(), help=f"the directory logs reside in", show_default=True)
+@click.option("--error", "-e", is_flag=True, help="display error messages")
+@click.option("--warning", "-w", is_flag=True, help="display warning messages")
+@click.option("--info", "-i", is_flag=True, help="display info messages")
+@click.option("--exception", "-x", is_flag=True, help="display exceptions")
+@click.option("--debug", "-d", is_flag=True, help="display debug messages")
+@click.option("--module", "-m", multiple=True, help="only display messages logged by these modules (and their submodules)")
+@click.option("--logs", "-l", multiple=True, cls=DeferredOption, default=get_available_logs, help=LOGSOPTHELP, show_default=True)
+@click.option("--paths", "-p", multiple=True, type=click.Path(), cls=DeferredOption, default=get_log_paths, help=f"the directory logs reside in", show_default=True)
+@click.option("--interval", "-n", type=float, default=0.5, help="seconds between checks for new messages", show_default=True)
+def tail(error, warning, info, exception, debug, module, logs, paths, interval):
+    """\b
+    Follow the logs as they are written, merged by time. All log levels are displayed unless specified.  
+    \b
+    Different logs can be included using the `-l` option. If not specified, all logs will be included.  
+    Optionally the directory where the logs are stored (`-p`) can be specified.  
+    \b
+    > Examples:  
+    > ovos-logs tail                                              # Follow all logs  
+    > ovos-logs tail -e -x -l skills                              # Follow errors and exceptions in skills.log  
+    > ovos-logs tail -m ovos_core.intent_services                 # Follow messages logged by the intent service  
+    """
+    log_levels = {lv_str for lv, lv_str in [(error, "ERROR"), (warning, "WARNING"), (info, "INFO"),
+                                            (debug, "DEBUG"), (exception, "EXCEPTION")] if lv} or None
+
+    if not all(os.path.exists(path) for path in paths):
+        return get_console().print(f"Directory [{[p for p in paths if not os.path.exists(p)]}] does not exist")
+    else:
+        logs_present = get_available_logs(paths)
+
+    if not logs:
+        logs = logs_present
+    elif not valid_log(logs, paths):
+        return get_console().print(f"Invalid log name, valid logs are {logs_present}")
+
+    sources = get_log_files(logs, paths)
+    follower = LogFollower(sources)
+    entries = OVOSLogParser.filter_source_entries(follower.follow(interval), levels=log_levels,
+                                                  modules=module or None)
+    try:
+        print_entries(entries, sources)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        follower.close()
+
+
+@ovos_logs.command()
+@click.option("--start", "-s", cls=DeferredOption, help=lambda: get_time_formats()["STARTTIMEHELP"])
+@click.option("--until", "-u", help=f"end time of the log slice [default: now]")
+@click.option("--logs", "-l", multiple=True, cls=DeferredOption, default=get_available_logs, help=LOGSOPTHELP, show_default=True)
+@click.option("--paths", "-p", multiple=True, type=click.Path(), cls=DeferredOption, default=get_log_paths, help=f"the directory logs reside in", show_default=True)
+@click.option("--bucket", "-b", type=int, default=3600, help="size of the time buckets in seconds", show_default=True)
+@click.option("--top", "-n", type=int, default=10, help="number of modules and exceptions to list", show_default=True)
+@click.option("--json", "-j", "as_json", is_flag=True, help="output as JSON")
+def stats(start, until, logs, paths, bucket, top, as_json):
+    """\b
+    Count messages per service, level and module over time and list the most frequent exceptions.  
+    \b
+    Optionally define start (`-s`) and the time until (`-u`) the statistics should be limited to.  
+    \b
+    Different logs can be included using the `-l` option. If not specified, all logs will be included.  
+    Optionally the directory where the logs are stored (`-p`) can be specified.  
+    \b
+    > Examples:  
+    > ovos-logs stats                                             # Statistics of all logs since service start up  
+    > ovos-logs stats -l skills -b 60 -n 5                        # Messages per minute and top 5 exceptions in skills.log  
+    > ovos-logs stats -s 01-12-2023 -j > stats.json               # Statistics since december the first as JSON  
+    """
+    if not all(os.path.exists(path) for path in paths):
+        return get_console().print(f"Directory [{[p for p in paths if not os.path.exists(p)]}] does not exist")
+    else:
+        logs_present = get_available_logs(paths)
+
+    start, end = parse_timeframe(start, until, paths)
+    if start is None:
+        return get_console().print(f"Need a valid start time in the format {get_time_formats()['EXPECTED_DATETIME_FORMAT']}")
+    elif end is None:
+        return get_console().print(f"Need a valid end time in the format {get_time_formats()['EXPECTED_DATETIME_FORMAT']}")
+    elif start > end:
+        return get_console().print(f"Start time [{start}] is after end time [{end}]")
+    if bucket <= 0:
+        return get_console().print("The bucket size has to be a positive number of seconds")
+
+    if not logs:
+        logs = logs_present
+    elif not valid_log(logs, paths):
+        return get_console().print(f"Invalid log name, valid logs are {logs_present}")
+
+    sources = get_log_files(logs, paths)
+    log_stats = LogStats(bucket)
+    for logfile, log in OVOSLogParser.parse_files(sources, start, end):
+        log_stats.add(sources[logfile], log)
+
+    if as_json:
+        return click.echo(orjson.dumps(log_stats.as_dict(top)).decode())
+    if not log_stats.counts and not log_stats.exceptions:
+        return get_console().print("No logs found in the specified time frame")
+
+    from rich.table import Table
+
+    levels = ["EXCEPTION", "ERROR", "WARNING", "INFO", "DEBUG"]
+    time_format = "%Y-%m-%d %H:%M:%S" if get_time_formats()["use24h"] else "%Y-%m-%d %I:%M:%S %p"
+
+    table = Table(title="Messages over time")
+    table.add_column("Time", style="cyan", no_wrap=True)
+    table.add_column("Service", style="green")
+    for level in levels:
+        table.add_column(level, justify="right")
+    for (bucket_start, service), counts in sorted(log_stats.totals(0, 1).items()):
+        table.add_row(bucket_start.strftime(time_format), service,
+                      *(str(counts.get(level, "")) for level in levels))
+    get_console().print(table)
+
+    table = Table(title=f"Top {top} modules by errors and warnings")
+    table.add_column("Module", style="green")
+    table.add_column("Service")
+    for level in levels:
+        table.add_column(level, justify="right")
+    modules = sorted(log_stats.totals(3, 1).items(), reverse=True,
+                     key=lambda i: (i[1].get("EXCEPTION", 0) + i[1].get("ERROR", 0),
+                                    i[1].get("WARNING", 0), sum(i[1].values())))
+    for (module, service), counts in modules[:top]:
+        table.add_row(module, service, *(str(counts.get(level, "")) for level in levels))
+    get_console().print(table)
+
+    table = Table(title=f"Top {top} exceptions")
+    table.add_column("Count", justify="right")
+    table.add_column("Service")
+    table.add_column("Exception", style="bold red")
+    table.add_column("Location", style="green")
+    for (service, location, exception), count in log_stats.top_exceptions(top):
+        table.add_row(str(count), service, exception, location)
+    get_console().print(table)
+    if log_stats.dropped:
+        get_console().print(f"{log_stats.dropped} messages did not fit into the counters and are not included, "
+                            f"use a larger bucket size (`-b`) or a shorter time frame")
+
+
+@ovos_logs.command()
+@click.option("--log", "-l", required=True, cls=DeferredOption, help=lambda: f"log to show; available: {get_available_logs()}")
+@click.option("--paths", "-p", multiple=True, type=click.Path(), cls=DeferredOption, default=get_log_paths, help=f"the directory logs reside in", show_default=True)
 def show(log, paths):
     """\b
     A service log has to be specified (`-l`).  
@@ -589,8 +654,9 @@ def show(log, paths):
     > ovos-logs show -l skills                                    # Display skills.log   
     > ovos-logs show -l debug -p ~/custom_path/                   # Display debug.log from a custom path     
     """
+    log = log.lower()
     if not any(os.path.exists(os.path.join(path, f"{log}.log")) for path in paths):
-        return console.print(f"File does not exist")
+        return get_console().print(f"File does not exist")
     else:
         log = os.path.join(get_log_path(log, paths), f"{log}.log")
     
@@ -600,11 +666,12 @@ def show(log, paths):
 @ovos_logs.command()
 @click.option("--size", "-s", is_flag=False, flag_value=None, default=0, help="truncate logs to a given size (in bytes)")
 @click.option("--date", "-d", help="truncate logs to a given date")
-@click.option("--logs", "-l", multiple=True, default=get_available_logs(), help=LOGSOPTHELP, show_default=True)
-@click.option("--paths", "-p", multiple=True, type=click.Path(), default=get_log_paths(), help=f"the directory logs reside in", show_default=True)
+@click.option("--logs", "-l", multiple=True, cls=DeferredOption, default=get_available_logs, help=LOGSOPTHELP, show_default=True)
+@click.option("--paths", "-p", multiple=True, type=click.Path(), cls=DeferredOption, default=get_log_paths, help=f"the directory logs reside in", show_default=True)
 def reduce(size, date, logs, paths):
     """\b
     Reduce logs to a given size (in bytes) or remove entries before a given date.  
+    Logs are rewritten in place, running services keep logging to them.  
     \b
     Different logs can be included using the `-l` option. If not specified, all logs will be included.  
     Optionally the directory where the logs are stored (`-p`) can be specified.  
@@ -620,50 +687,39 @@ def reduce(size, date, logs, paths):
         size = None
         date = parse_time(date)
         if date is None:
-            return console.print(f"The date/time provided couldn't be parsed. Expected format: {EXPECTED_DATETIME_FORMAT}")
+            return get_console().print(f"The date/time provided couldn't be parsed. Expected format: {get_time_formats()['EXPECTED_DATETIME_FORMAT']}")
         
     if not all(os.path.exists(path) for path in paths):
-        return console.print(f"Directory [{[p for p in paths if not os.path.exists(p)]}] does not exist")
+        return get_console().print(f"Directory [{[p for p in paths if not os.path.exists(p)]}] does not exist")
     else:
         logs_present = get_available_logs(paths)
     
     if not logs:
         logs = logs_present
     elif not valid_log(logs, paths):
-        return console.print(f"Invalid log name, valid logs are {logs_present}")
+        return get_console().print(f"Invalid log name, valid logs are {logs_present}")
     
     for service in logs:
         path = get_log_path(service, paths)
         logfile = os.path.join(path, f"{service}.log")
         reduced = False
-        with LOGLOCK:
+        with get_log_lock():
             if size:
-                with open(logfile, 'r') as f:
-                    f.seek(0, os.SEEK_END)
-                    fullsize = f.tell()
-                    f.seek(max(fullsize - size, 0))
-                    # skip cutoff line
-                    f.readline()
-                    remaining_lines = f.readlines()
-                if fullsize > size and remaining_lines:
-                    reduced = True
-                    with open(logfile, 'w') as f:
-                        f.writelines(remaining_lines)
+                with open(logfile, 'rb') as f:
+                    fullsize = os.fstat(f.fileno()).st_size
+                    # cut at the first log record after the cutoff
+                    _, offset = OVOSLogParser.timestamp_at(f, max(fullsize - size, 0))
+                if fullsize > size and offset > 0:
+                    reduced = remove_log_head(logfile, offset)
             elif date:
-                loglines = []
-                for log in OVOSLogParser.parse_file(logfile):
-                    if log.timestamp and log.timestamp < date:
-                        reduced = True
-                        continue
-                    loglines.append(log)
-                if reduced:
-                    with open(logfile, 'w') as f:
-                        for log in loglines:
-                            f.write(str(log) + "\n")
+                offset = OVOSLogParser.find_offset(logfile, date)
+                if offset > 0:
+                    reduced = remove_log_head(logfile, offset)
             else:
                 reduced = True
                 with open(logfile, 'w') as f:
                     f.write("")
 
         if reduced:
-            console.print(f"{service} log reduced")
+            get_console().print(f"{service} log reduced")
+
@@ -0,0 +1,1156 @@
+"""
+Parsing of the log files written by `LOG`, without any of the dependencies of
+the `ovos-logs` command line tool so it can be imported cheaply
+"""
+import gzip
+import heapq
+import io
+import re
+import os
+import time
+from bisect import bisect_left
+from collections import deque
+from datetime import datetime, timedelta
+from itertools import islice
+from traceback import FrameSummary
+from dataclasses import dataclass
+from typing import Any, Tuple, List, Generator, Dict, Union, Optional, Set, Iterable, BinaryIO
+
+import orjson
+
+from ovos_utils.log import get_log_path
+
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+_EPOCH = datetime(1970, 1, 1)
+TIMESTAMP_PATTERN = re.compile(rb'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d{1,6}) - ')
+
+
+@dataclass(init=False)
+class LogLine:
+    # dataclass(slots=True) requires python 3.10
+    __slots__ = ("timestamp", "source", "location", "level", "message")
+    timestamp: datetime
+    source: str
+    location: str
+    level: str
+    message: str
+
+    def __init__(self, timestamp: datetime = None, source: str = "",
+                 location: str = "", level: str = "", message: str = ""):
+        self.timestamp = timestamp
+        self.source = source
+        self.location = location
+        self.level = level
+        self.message = message
+
+    def __str__(self):
+        # sytsem messages etc.
+        if not all([self.source, self.location, self.level]):
+            return self.message
+        return f"{self.format_timestamp()} - {self.source} - {self.location} - {self.level} - {self.message}"
+    
+    def format_timestamp(self):
+        if self.timestamp:
+            return self.timestamp.strftime(TIME_FORMAT)[:-3]
+        return ""
+
+
+# Traceback frame
+class Frame(FrameSummary):
+    def __init__(self, filename, lineno, name, line):
+        super().__init__(filename, lineno, name, line=line)
+      
+    def as_dict(self):
+        return {
+            "location": self.format_location(),
+            "level": "TRACEBACK",
+            "message": self.line
+        }
+    
+    def as_logline(self):
+        return LogLine(**self.as_dict())
+    
+    def format_location(self):
+        if "/bin/" in self.filename:
+            package = self.filename.split("/bin/")[-1].replace(".py", "")\
+                    .replace("-", "_").replace("/", ".")
+        elif "site-packages" not in self.filename and \
+                (pyver := re.search(r"python\d\.\d+[\\/]", self.filename)):
+            package = self.filename.split(pyver.group())[-1].replace(".py", "")\
+                    .replace("-", "_").replace("/", ".")
+        else:
+            package = self.filename.split("site-packages/")[-1].replace(".py", "")\
+                    .replace("-", "_").replace("/", ".")
+        method = self.name.replace(".py", "").replace("-", "_")
+        return f"{package}:{method}:{self.lineno}"
+    
+    def __str__(self):
+        return f'  File "{self.filename}", line {self.lineno}, in {self.name}\n    {self.line}\n'
+
+
+class Traceback:
+    PATTERN = r'File "(?P<filename>[^"]+)", line (?P<lineno>\d+), in (?P<name>\S+)\n\s*(?P<line>.+)'
+
+    def __init__(self, frames: List[Frame], exception: str, timestamp: datetime = None):
+        self.frames = frames
+        self.exception = exception
+        self._timestamp = timestamp
+    
+    @property
+    def exception_location(self):
+        return self.frames[-1].format_location()
+    
+    @property
+    def timestamp(self):
+        return self._timestamp
+    
+    @timestamp.setter
+    def timestamp(self, value):
+        self._timestamp = value
+
+    def to_loglines(self) -> List[LogLine]:
+        
+        lines = [LogLine(timestamp=self.timestamp,
+                         location=self.exception_location,
+                         level="EXCEPTION",
+                         message=self.exception)]
+
+        for frame in self.frames:
+            lines.append(frame.as_logline())
+        
+        return lines
+
+    @classmethod
+    def from_list(cls, lines):
+        lines = [line if line.endswith("\n") else line + "\n" for line in lines]
+        multiline = "".join(lines)
+        return cls.from_string(multiline)
+    
+    @classmethod
+    def from_string(cls, s):
+        matches = re.findall(cls.PATTERN, s, re.MULTILINE)
+        frames = []
+        for match in matches:
+            data = dict(zip(["filename", "lineno", "name", "line"], match))
+            frames.append(Frame(**data))
+        exception = next(line for line in s.split("\n")[::-1] if line)
+        return cls(frames, exception)
+    
+    def __str__(self):
+        multiline = "Traceback (most recent call last):\n"
+        for frame in self.frames:
+            multiline += str(frame)
+        multiline += f"{self.exception}\n"
+        return multiline
+
+
+class OVOSLogParser:
+    LOG_PATTERN = r'(?P<timestamp>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d{1,6}) - (?P<source>.+?) - (?P<location>.+?) - (?P<level>\w+) - (?P<message>.*)'
+
+    LOG_REGEX = re.compile(LOG_PATTERN)
+    # (second, datetime) of the last decoded timestamp
+    _timestamp_cache: Tuple[str, Optional[datetime]] = ("", None)
+
+    @classmethod
+    def parse_timestamp(cls, timestamp: str) -> datetime:
+        """
+        Decode a fixed width `TIME_FORMAT` timestamp. Consecutive log records
+        mostly share the same second, which is decoded only once.
+        :param timestamp: "YYYY-MM-DD HH:MM:SS.f" with 1 to 6 digit fraction
+        :return: the decoded timestamp
+        """
+        second = timestamp[:19]
+        cached_second, cached = cls._timestamp_cache
+        if second != cached_second:
+            cached = datetime(int(second[:4]), int(second[5:7]),
+                              int(second[8:10]), int(second[11:13]),
+                              int(second[14:16]), int(second[17:19]))
+            cls._timestamp_cache = (second, cached)
+        return cached.replace(microsecond=int(timestamp[20:26].ljust(6, "0")))
+
+    @classmethod
+    def parse(self, log_line, last_timestamp=None) -> LogLine:
+        log_line = log_line.rstrip("\n")
+        match = self.LOG_REGEX.match(log_line)
+        if match:
+            timestamp, source, location, level, message = match.groups()
+            return LogLine(self.parse_timestamp(timestamp), source, location,
+                           level, message)
+        return LogLine(last_timestamp or "", message=log_line)
+
+    @classmethod
+    def parse_json(cls, log_line) -> List[Union[LogLine, Traceback]]:
+        """
+        Parse a line written by `LOG` in "jsonl" format
+        :param log_line: single line of a log file, str or bytes
+        :return: the LogLine, followed by a Traceback if an exception was
+            logged. Empty if `log_line` is not a JSON log record
+        """
+        try:
+            data = orjson.loads(log_line)
+        except orjson.JSONDecodeError:
+            return []
+        try:
+            # every field is written by `JsonLogFormatter`
+            timestamp = datetime.fromtimestamp(data["timestamp"])
+            entries = [LogLine(timestamp, data["source"],
+                               f"{data['module']}:{data['function']}:"
+                               f"{data['line']}",
+                               data["level"], data["message"])]
+        except (KeyError, TypeError):
+            if not isinstance(data, dict) or "level" not in data:
+                return []
+            timestamp = datetime.fromtimestamp(data["timestamp"])
+            location = f"{data.get('module', '')}:" \
+                       f"{data.get('function', '')}:{data.get('line', '')}"
+            entries = [LogLine(timestamp=timestamp,
+                               source=data.get("source", ""),
+                               location=location,
+                               level=data["level"],
+                               message=data.get("message", ""))]
+        exception = data.get("exception")
+        if exception:
+            frames = [Frame(frame["filename"], frame["lineno"],
+                            frame["name"], frame["line"])
+                      for frame in exception.get("frames", [])]
+            message = exception["type"]
+            if exception.get("message"):
+                message += f": {exception['message']}"
+            entries.append(Traceback(frames, message, timestamp))
+        return entries
+
+    @classmethod
+    def get_timestamp(cls, log_line: bytes) -> Optional[datetime]:
+        """
+        Get the timestamp of a raw log line without fully parsing it
+        :param log_line: single line of a log file, as read in binary mode
+        :return: timestamp of the log record, None for continuation lines
+            (tracebacks, multiline messages)
+        """
+        if log_line.startswith(b"{"):
+            entries = cls.parse_json(log_line)
+            return entries[0].timestamp if entries else None
+        match = TIMESTAMP_PATTERN.match(log_line)
+        if match:
+            return cls.parse_timestamp(match.group(1).decode())
+        return None
+
+    @classmethod
+    def timestamp_at(cls, file, offset: int) -> Tuple[Optional[datetime], int]:
+        """
+        Find the first log record starting at or after a byte offset
+        :param file: log file opened in binary mode
+        :param offset: byte offset to start looking from
+        :return: timestamp and byte offset of the record,
+            (None, -1) if no complete record follows `offset`
+        """
+        if offset:
+            # skip the rest of the line `offset` falls into
+            file.seek(offset - 1)
+            file.readline()
+        else:
+            file.seek(0)
+        while True:
+            position = file.tell()
+            line = file.readline()
+            # a line without newline is still being written
+            if not line.endswith(b"\n"):
+                return None, -1
+            timestamp = cls.get_timestamp(line)
+            if timestamp:
+                return timestamp, position
+
+    @classmethod
+    def find_offset(cls, source: str, start: datetime,
+                    use_index: bool = False) -> int:
+        """
+        Bisect a log file for the first record logged at or after `start`.
+        Log records are appended in order, so their timestamps are monotonic
+        over the byte offsets of the file.
+        :param source: path to the log file
+        :param start: timestamp to look for
+        :param use_index: use (and update) a sparse `LogIndex` stored
+            next to the log file to narrow down the search
+        :return: byte offset of the first line to parse, the file size if
+            all records are older than `start`
+        """
+        if use_index:
+            return LogIndex(source).find_offset(start)
+        with open(source, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            lo, hi = 0, size
+            while lo < hi:
+                mid = (lo + hi) // 2
+                timestamp, _ = cls.timestamp_at(file, mid)
+                if timestamp is None or timestamp >= start:
+                    hi = mid
+                else:
+                    lo = mid + 1
+            if lo == 0:
+                # keep any untimestamped lines at the top of the file
+                return 0
+            _, position = cls.timestamp_at(file, lo)
+            return size if position < 0 else position
+
+    @classmethod
+    def parse_file(self, source, start: Optional[datetime] = None,
+                   end: Optional[datetime] = None, use_index: bool = False,
+                   rotated: bool = False
+                   ) -> Generator[Union[LogLine, Traceback], None, None]:
+        """
+        Parse a log file written by `LOG`, text or "jsonl" format
+        :param source: path to the log file
+        :param start: seek straight to the first record logged at or after
+            this time instead of parsing the file from the start
+        :param end: stop parsing at the first record logged at or after
+            this time
+        :param use_index: use a sparse `LogIndex` to find `start`
+        :param rotated: include the rotated (and possibly compressed)
+            segments of the log, oldest first, see `get_segments`
+        :return: generator of LogLine and Traceback entries
+        """
+        if not os.path.exists(source):
+            raise FileNotFoundError(f"File {source} does not exist")
+
+        for path, offset, stop in self.get_jobs(source, start, end,
+                                                use_index, rotated):
+            if is_compressed(path):
+                # compressed segments can not be bisected
+                yield from self.filter_entries(
+                    self.parse_range(path, end=end), start, end)
+            else:
+                yield from self.parse_range(path, offset, stop, end)
+
+    @classmethod
+    def first_timestamp(cls, source: str, max_lines: int = 100
+                        ) -> Optional[datetime]:
+        """
+        Get the timestamp of the first record of a (possibly compressed) log
+        :param source: path to the log file
+        :param max_lines: number of lines to look at
+        :return: timestamp of the first record, None if there is none
+        """
+        with open_log(source) as file:
+            for line in islice(file, max_lines):
+                timestamp = cls.get_timestamp(line)
+                if timestamp:
+                    return timestamp
+        return None
+
+    @classmethod
+    def get_segments(cls, source: str, start: Optional[datetime] = None,
+                     end: Optional[datetime] = None) -> List[str]:
+        """
+        Get the segments of a log overlapping a time range: the log file and
+        its rotated backups (`skills.log.1`, `skills.log.2.gz`, ...).
+        Segments are checked newest to oldest, a segment spans from its first
+        timestamp to the first timestamp of the next newer segment, so only
+        the start of each segment has to be read.
+        :param source: path to the log file
+        :param start: skip segments that end before this time
+        :param end: skip segments that start at or after this time
+        :return: paths of the segments, oldest first
+        """
+        segments = []
+        newer_start = None
+        for path in [source] + get_rotated_logs(source):
+            first = cls.first_timestamp(path) if os.path.exists(path) \
+                else None
+            if start is not None and newer_start is not None and \
+                    newer_start <= start:
+                # this and all older segments end before `start`
+                break
+            if end is None or first is None or first < end:
+                segments.append(path)
+            newer_start = first or newer_start
+        return segments[::-1]
+
+    @classmethod
+    def get_jobs(cls, source: str, start: Optional[datetime] = None,
+                 end: Optional[datetime] = None, use_index: bool = False,
+                 rotated: bool = False, chunk_size: Optional[int] = None
+                 ) -> List[Tuple[str, int, Optional[int]]]:
+        """
+        Get the byte ranges to parse for a time range of a log
+        :param source: path to the log file
+        :param start: start of the time range
+        :param end: end of the time range
+        :param use_index: use a sparse `LogIndex` of `source`
+        :param rotated: include the rotated segments of the log
+        :param chunk_size: split the byte ranges into chunks of about this
+            size, see `split_range`
+        :return: list of (path, offset, stop), oldest first. Compressed
+            segments are parsed completely (offset 0, stop None)
+        """
+        jobs = []
+        segments = cls.get_segments(source, start, end) if rotated \
+            else [source]
+        for path in segments:
+            if is_compressed(path):
+                jobs.append((path, 0, None))
+                continue
+            indexed = use_index and path == source
+            offset = 0
+            stop = os.path.getsize(path)
+            if start is not None:
+                offset = cls.find_offset(path, start, indexed)
+            if end is not None:
+                stop = cls.find_offset(path, end, indexed)
+            if chunk_size:
+                jobs.extend((path, begin, stop) for begin, stop in
+                            cls.split_range(path, offset, stop, chunk_size))
+            elif offset < stop:
+                jobs.append((path, offset, stop))
+        return jobs
+
+    @classmethod
+    def parse_range(self, source, offset: int = 0, stop: Optional[int] = None,
+                    end: Optional[datetime] = None
+                    ) -> Generator[Union[LogLine, Traceback], None, None]:
+        """
+        Parse the log records starting within a byte range of a log file
+        :param source: path to the log file, compressed files are read from
+            the start
+        :param offset: byte offset to start parsing at, has to be the start
+            of a line
+        :param stop: stop at the first line starting at or after this byte
+            offset, has to be the start of a log record
+        :param end: stop parsing at the first record logged at or after
+            this time
+        :return: generator of LogLine and Traceback entries
+        """
+        with open_log(source) as file:
+            if offset:
+                file.seek(offset)
+            position = offset
+            stream = LogStreamParser()
+            for raw in file:
+                if stop is not None and position >= stop:
+                    break
+                position += len(raw)
+                if raw[:1] == b"{" and not stream.trace and \
+                        (entries := self.parse_json(raw)):
+                    # JSON lines are complete records, skip the text parser
+                    stream.last_timestamp = entries[0].timestamp
+                else:
+                    entries = stream.feed(raw.decode(errors="replace"))
+                for entry in entries:
+                    # only a new record can be logged after `end`
+                    if end is not None and entry.timestamp and \
+                            entry.timestamp >= end:
+                        return
+                    yield entry
+            yield from stream.flush()
+
+    @classmethod
+    def split_range(cls, source: str, offset: int, stop: int,
+                    chunk_size: int) -> List[Tuple[int, int]]:
+        """
+        Split a byte range of a log file into chunks of about `chunk_size`
+        bytes, aligned to the start of log records so that no record (or its
+        traceback) is split across chunks
+        :param source: path to the log file
+        :param offset: start of the byte range
+        :param stop: end of the byte range
+        :param chunk_size: approximate size of a chunk in bytes
+        :return: list of (offset, stop) byte ranges
+        """
+        boundaries = [offset]
+        with open(source, "rb") as file:
+            position = offset + chunk_size
+            while position < stop:
+                timestamp, record = cls.timestamp_at(file, position)
+                if timestamp is None or record >= stop:
+                    break
+                boundaries.append(record)
+                position = record + chunk_size
+        return [(begin, end) for begin, end in
+                zip(boundaries, boundaries[1:] + [stop]) if begin < end]
+
+    @classmethod
+    def filter_entries(cls, entries, start: Optional[datetime] = None,
+                       end: Optional[datetime] = None,
+                       levels: Optional[Set[str]] = None,
+                       modules: Optional[List[str]] = None
+                       ) -> Generator[Union[LogLine, Traceback], None, None]:
+        """
+        Filter parsed log entries by time, level and module
+        :param entries: iterable of LogLine and Traceback entries
+        :param start: drop entries logged before this time
+        :param end: drop entries logged at or after this time
+        :param levels: log levels to keep, tracebacks are kept with
+            "EXCEPTION"
+        :param modules: modules to keep, including their submodules.
+            Tracebacks and continuation lines follow the record before them
+        :return: generator of the matching entries
+        """
+        for _, entry in cls.filter_source_entries(
+                ((None, entry) for entry in entries), start, end, levels,
+                modules):
+            yield entry
+
+    @classmethod
+    def filter_source_entries(cls, entries, start: Optional[datetime] = None,
+                              end: Optional[datetime] = None,
+                              levels: Optional[Set[str]] = None,
+                              modules: Optional[List[str]] = None
+                              ) -> Generator[Tuple[str, Union[LogLine, Traceback]],
+                                             None, None]:
+        """
+        Filter the (source, entry) tuples of several merged logs, see
+        `parse_files` and `LogFollower`, like `filter_entries`. Tracebacks
+        and continuation lines follow the record before them in their log.
+        :return: generator of the matching (source, entry) tuples
+        """
+        # source -> whether the last record matched `modules`
+        module_match = {}
+        for source, entry in entries:
+            if modules is not None:
+                location = "" if isinstance(entry, Traceback) \
+                    else entry.location
+                if location:
+                    module = location.split(":", 1)[0]
+                    module_match[source] = any(
+                        module == prefix or module.startswith(prefix + ".")
+                        for prefix in modules)
+                if not module_match.get(source, True):
+                    continue
+            if start is not None or end is not None:
+                if not entry.timestamp:
+                    continue
+                if start is not None and entry.timestamp < start:
+                    continue
+                if end is not None and entry.timestamp >= end:
+                    continue
+            if levels is not None:
+                level = "EXCEPTION" if isinstance(entry, Traceback) \
+                    else entry.level
+                if level not in levels:
+                    continue
+            yield source, entry
+
+    @classmethod
+    def _parse_chunk(cls, path: str, offset: int, stop: Optional[int],
+                     start: Optional[datetime], end: Optional[datetime],
+                     levels: Optional[Set[str]]
+                     ) -> List[Union[LogLine, Traceback]]:
+        # runs in a worker process, only the matching entries are sent back
+        return [entry for entry in cls.filter_entries(
+            cls.parse_range(path, offset, stop, end), start, end, levels)]
+
+    @classmethod
+    def parse_files(cls, sources: Iterable[str],
+                    start: Optional[datetime] = None,
+                    end: Optional[datetime] = None,
+                    levels: Optional[Set[str]] = None,
+                    use_index: bool = False, processes: Optional[int] = None,
+                    chunk_size: int = 8 * 1024 * 1024, rotated: bool = True
+                    ) -> Generator[Tuple[str, Union[LogLine, Traceback]],
+                                   None, None]:
+        """
+        Parse and filter several log files in parallel, merged by timestamp.
+        Files are split into chunks of `chunk_size` bytes that are parsed in
+        a process pool; each file is streamed chunk by chunk, keeping only a
+        few chunks per file in flight.
+        :param sources: paths to the log files
+        :param start: only parse records logged at or after this time
+        :param end: only parse records logged before this time
+        :param levels: log levels to keep, tracebacks are kept with
+            "EXCEPTION", all entries are kept if None
+        :param use_index: use a sparse `LogIndex` to find `start` and `end`
+        :param processes: number of worker processes, defaults to the number
+            of CPUs; files are parsed in this process with `processes=1` or
+            if there is less than `chunk_size` bytes to parse
+        :param chunk_size: approximate number of bytes parsed per job
+        :param rotated: include the rotated segments of the logs that
+            overlap the time range, see `get_segments`
+        :return: generator of (source, entry) tuples in timestamp order
+        """
+        jobs: Dict[str, List[Tuple[str, int, Optional[int]]]] = {}
+        for source in sources:
+            if not os.path.exists(source):
+                raise FileNotFoundError(f"File {source} does not exist")
+            jobs[source] = cls.get_jobs(source, start, end, use_index,
+                                        rotated, chunk_size)
+
+        processes = processes or os.cpu_count() or 1
+        total = sum(os.path.getsize(path) if stop is None else stop - offset
+                    for source_jobs in jobs.values()
+                    for path, offset, stop in source_jobs)
+        if processes == 1 or total < chunk_size:
+            streams = [cls._stream_local(source, source_jobs, start, end,
+                                         levels)
+                       for source, source_jobs in jobs.items()]
+            yield from heapq.merge(*streams, key=cls._merge_key)
+            return
+
+        # only pay for multiprocessing when the workload needs it
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(processes) as executor:
+            streams = [cls._stream_chunks(executor, processes, source,
+                                          source_jobs, start, end, levels)
+                       for source, source_jobs in jobs.items()]
+            yield from heapq.merge(*streams, key=cls._merge_key)
+
+    @staticmethod
+    def _merge_key(item: Tuple[str, Union[LogLine, Traceback]]) -> datetime:
+        return item[1].timestamp or datetime.min
+
+    @classmethod
+    def _stream_local(cls, source, jobs, start, end, levels):
+        for job in jobs:
+            for entry in cls._parse_chunk(*job, start, end, levels):
+                yield source, entry
+
+    @classmethod
+    def _stream_chunks(cls, executor, window, source, jobs, start, end,
+                       levels):
+        def submit(job):
+            return executor.submit(cls._parse_chunk, *job, start, end, levels)
+
+        jobs = iter(jobs)
+        pending = deque(submit(job) for job in islice(jobs, window))
+        while pending:
+            entries = pending.popleft().result()
+            # keep the pool busy while this chunk is consumed
+            job = next(jobs, None)
+            if job:
+                pending.append(submit(job))
+            for entry in entries:
+                yield source, entry
+
+
+class LogStreamParser:
+    """
+    Incremental parser for the lines of a log file, keeping track of the
+    tracebacks spanning several lines and of the timestamp of the last
+    record, which continuation lines inherit
+    """
+    def __init__(self):
+        self.trace: Optional[List[str]] = None
+        self.last_timestamp: Optional[datetime] = None
+
+    def feed(self, line: str) -> List[Union[LogLine, Traceback]]:
+        """
+        Parse the next line of the log
+        :param line: a complete line, including its line ending
+        :return: entries completed by this line
+        """
+        if line.endswith("\r\n"):
+            line = line[:-2] + "\n"
+        # gather all lines of the traceback
+        if line == "Traceback (most recent call last):\n":
+            entries = self.flush()
+            self.trace = [line]
+            return entries
+        entries = []
+        if self.trace:
+            # tracebacks end on an empty line or the next log record
+            if line != "\n" and not line.startswith("{") and \
+                    not OVOSLogParser.LOG_REGEX.match(line):
+                self.trace.append(line)
+                return entries
+            entries = self.flush()
+            if line == "\n":
+                return entries
+        if line.startswith("{") and \
+                (records := OVOSLogParser.parse_json(line)):
+            # JSON lines, see `LOG.init`
+            self.last_timestamp = records[0].timestamp
+            entries.extend(records)
+            return entries
+        if line == "\n":
+            return entries
+        log = OVOSLogParser.parse(line, self.last_timestamp)
+        if log.timestamp:
+            self.last_timestamp = log.timestamp
+        entries.append(log)
+        return entries
+
+    def flush(self) -> List[Traceback]:
+        """
+        Complete a pending traceback, at the end of the log or when no more
+        lines are expected for now
+        :return: the traceback, if any
+        """
+        if not self.trace:
+            return []
+        traceback = Traceback.from_list(self.trace)
+        traceback.timestamp = self.last_timestamp
+        self.trace = None
+        return [traceback]
+
+
+class LogFollower:
+    """
+    Follow growing log files, parsing only the bytes appended since the last
+    poll. Rotation by `RotatingFileHandler` (the file is renamed and a new
+    one created) and truncation (`ovos-logs reduce`) are detected and the new
+    file is followed from its start.
+    """
+    def __init__(self, sources: Iterable[str], from_start: bool = False):
+        """
+        :param sources: paths to the log files to follow
+        :param from_start: parse the existing content of the files, by
+            default only records appended from now on are returned
+        """
+        self._files: Dict[str, Optional[BinaryIO]] = {}
+        self._parsers: Dict[str, LogStreamParser] = {}
+        self._partial: Dict[str, bytes] = {}
+        for source in sources:
+            self._files[source] = None
+            self._parsers[source] = LogStreamParser()
+            self._partial[source] = b""
+            if self._open(source) and not from_start:
+                self._files[source].seek(0, os.SEEK_END)
+
+    def _open(self, source: str) -> bool:
+        try:
+            self._files[source] = open(source, "rb")
+        except OSError:
+            # not created (yet)
+            self._files[source] = None
+        self._partial[source] = b""
+        return self._files[source] is not None
+
+    def _read(self, source: str) -> List[Union[LogLine, Traceback]]:
+        file = self._files[source]
+        if file is None and not self._open(source):
+            return []
+        file = self._files[source]
+        data = file.read()
+        try:
+            stat = os.stat(source)
+        except OSError:
+            stat = None
+        rotated = stat is None or \
+            stat.st_ino != os.fstat(file.fileno()).st_ino
+        if not rotated and stat.st_size < file.tell():
+            # truncated in place
+            file.seek(0)
+            data = file.read()
+            self._partial[source] = b""
+        parser = self._parsers[source]
+        entries = []
+        if data:
+            lines = (self._partial[source] + data).split(b"\n")
+            # keep the last line until it is complete
+            self._partial[source] = lines.pop()
+            for line in lines:
+                entries.extend(parser.feed(line.decode(errors="replace") +
+                                           "\n"))
+        if rotated:
+            # the old file was completely read, continue with the new one
+            if self._partial[source]:
+                entries.extend(parser.feed(
+                    self._partial[source].decode(errors="replace") + "\n"))
+            entries.extend(parser.flush())
+            file.close()
+            if stat is not None:
+                self._open(source)
+                entries.extend(self._read(source))
+            else:
+                self._files[source] = None
+        elif not data:
+            # no traceback lines follow, stop waiting for its end
+            entries.extend(parser.flush())
+        return entries
+
+    def poll(self) -> List[Tuple[str, Union[LogLine, Traceback]]]:
+        """
+        Parse everything appended to the log files since the last poll
+        :return: list of (source, entry) tuples, merged by timestamp
+        """
+        streams = [[(source, entry) for entry in self._read(source)]
+                   for source in self._files]
+        return list(heapq.merge(*streams, key=OVOSLogParser._merge_key))
+
+    def follow(self, interval: float = 0.5
+               ) -> Generator[Tuple[str, Union[LogLine, Traceback]],
+                              None, None]:
+        """
+        Poll the log files forever
+        :param interval: seconds to wait between polls
+        :return: generator of (source, entry) tuples
+        """
+        while True:
+            yield from self.poll()
+            time.sleep(interval)
+
+    def close(self):
+        for source, file in self._files.items():
+            if file is not None:
+                file.close()
+            self._files[source] = None
+
+
+class LogStats:
+    """
+    Aggregate parsed log entries in a single streaming pass: message counts
+    per time bucket, service, level and module, and the most frequent
+    exceptions by location and type.
+
+    Memory is bounded: at most `max_keys` counters exist. When they are used
+    up, the module counters of older buckets are merged into module "other"
+    to make room, and messages of a new module are counted in the existing
+    "other" counter of their bucket, service and level. Messages that still
+    do not fit are only counted in `dropped`. Exceptions are tracked with the Space-Saving algorithm in at
+    most `max_exceptions` slots (counts of evicted exceptions carry over, so
+    rare exceptions may be overestimated).
+    """
+    OTHER = "other"
+
+    def __init__(self, bucket: int = 3600, max_keys: int = 100000,
+                 max_exceptions: int = 1000):
+        """
+        :param bucket: size of the time buckets in seconds
+        :param max_keys: maximum number of (bucket, service, level, module)
+            counters
+        :param max_exceptions: maximum number of exceptions tracked
+        """
+        self.bucket = bucket
+        self.max_keys = max_keys
+        self.max_exceptions = max_exceptions
+        self.counts: Dict[Tuple[datetime, str, str, str], int] = {}
+        self.exceptions: Dict[Tuple[str, str, str], int] = {}
+        # messages not counted in any counter, see `_overflow_key`
+        self.dropped = 0
+        # buckets before this one only have "other" module counters
+        self._merged_before: Optional[datetime] = None
+        # number of counters with a module other than "other"
+        self._module_keys = 0
+        self.start: Optional[datetime] = None
+        self.end: Optional[datetime] = None
+
+    def _bucket(self, timestamp: datetime) -> datetime:
+        seconds = (timestamp - _EPOCH).total_seconds()
+        return _EPOCH + timedelta(seconds=seconds - seconds % self.bucket)
+
+    def add(self, service: str, entry: Union[LogLine, Traceback]):
+        """
+        Count a parsed log entry
+        :param service: name of the service log the entry was read from
+        :param entry: LogLine or Traceback
+        """
+        if isinstance(entry, Traceback):
+            self._add_exception(service, entry)
+            return
+        # continuation lines are part of the record before them
+        if not entry.level or not isinstance(entry.timestamp, datetime):
+            return
+        if self.start is None or entry.timestamp < self.start:
+            self.start = entry.timestamp
+        if self.end is None or entry.timestamp > self.end:
+            self.end = entry.timestamp
+        key = (self._bucket(entry.timestamp), service, entry.level,
+               entry.location.split(":", 1)[0])
+        count = self.counts.get(key)
+        if count is None:
+            if self._merged_before is not None and \
+                    key[0] < self._merged_before:
+                key = key[:3] + (self.OTHER,)
+                count = self.counts.get(key)
+            if count is None and len(self.counts) >= self.max_keys:
+                key = self._overflow_key(key)
+                if key is None:
+                    self.dropped += 1
+                    return
+                count = self.counts.get(key)
+            if count is None and key[3] != self.OTHER:
+                self._module_keys += 1
+        self.counts[key] = (count or 0) + 1
+
+    def _overflow_key(self, key: Tuple[datetime, str, str, str]
+                      ) -> Optional[Tuple[datetime, str, str, str]]:
+        """
+        Find the counter for a message once `max_keys` counters exist
+        :param key: (bucket, service, level, module) of the message
+        :return: the key to count the message in, None if it does not fit
+        """
+        other = key[:3] + (self.OTHER,)
+        if other in self.counts:
+            return other
+        # merging is a full pass, only repeat it once half of the counters
+        # are module counters again
+        if self._module_keys >= self.max_keys // 2 and \
+                (self._merged_before is None or key[0] > self._merged_before):
+            self._merge_modules(key[0])
+            if len(self.counts) < self.max_keys:
+                return key
+        return None
+
+    def _merge_modules(self, before: datetime):
+        """
+        Merge the module counters of the buckets before `before` into
+        module "other"
+        """
+        counts: Dict[Tuple[datetime, str, str, str], int] = {}
+        module_keys = 0
+        for key, count in self.counts.items():
+            if key[0] < before:
+                key = key[:3] + (self.OTHER,)
+            elif key[3] != self.OTHER:
+                module_keys += 1
+            counts[key] = counts.get(key, 0) + count
+        self.counts = counts
+        self._module_keys = module_keys
+        self._merged_before = before
+
+    def _add_exception(self, service: str, trace: Traceback):
+        location = trace.exception_location if trace.frames else ""
+        key = (service, location, trace.exception.split(":", 1)[0])
+        if key in self.exceptions:
+            self.exceptions[key] += 1
+        elif len(self.exceptions) < self.max_exceptions:
+            self.exceptions[key] = 1
+        else:
+            # Space-Saving: replace the least frequent exception
+            evicted = min(self.exceptions, key=self.exceptions.get)
+            self.exceptions[key] = self.exceptions.pop(evicted) + 1
+
+    def top_exceptions(self, n: int = 10) -> List[Tuple[Tuple[str, str, str], int]]:
+        """
+        :param n: number of exceptions to return
+        :return: list of ((service, location, exception type), count),
+            most frequent first
+        """
+        return sorted(self.exceptions.items(), key=lambda i: i[1],
+                      reverse=True)[:n]
+
+    def totals(self, *fields: int) -> Dict[tuple, Dict[str, int]]:
+        """
+        Sum the counts per log level over some of the key fields
+        :param fields: indexes of the (bucket, service, level, module) key
+            to group by, e.g. `totals(0, 1)` for counts per bucket and service
+        :return: dict of group key to {level: count}
+        """
+        totals: Dict[tuple, Dict[str, int]] = {}
+        for key, count in self.counts.items():
+            group = totals.setdefault(tuple(key[i] for i in fields), {})
+            group[key[2]] = group.get(key[2], 0) + count
+        return totals
+
+    def as_dict(self, top: int = 10) -> Dict[str, Any]:
+        """
+        :param top: number of exceptions to include
+        :return: JSON serializable summary
+        """
+        return {
+            "start": self.start,
+            "end": self.end,
+            "bucket": self.bucket,
+            "dropped": self.dropped,
+            "counts": [{"time": bucket, "service": service, "level": level,
+                        "module": module, "count": count}
+                       for (bucket, service, level, module), count
+                       in sorted(self.counts.items())],
+            "exceptions": [{"service": service, "location": location,
+                            "exception": exception, "count": count}
+                           for (service, location, exception), count
+                           in self.top_exceptions(top)]
+        }
+
+
+class LogIndex:
+    """
+    Sparse index of a log file, mapping the first record after every
+    `interval` bytes to its timestamp.
+
+    The index is stored next to the log file (`.<name>.log.idx`) and extended
+    on reuse while the log keeps growing; it is rebuilt once the log got
+    rotated or reduced.
+    """
+    def __init__(self, source: str, interval: int = 64 * 1024):
+        self.source = source
+        self.path = os.path.join(os.path.dirname(source),
+                                 f".{os.path.basename(source)}.idx")
+        self.interval = interval
+        self.head = b""
+        self.next_offset = 0
+        self.timestamps: List[datetime] = []
+        self.offsets: List[int] = []
+
+    def load(self, head: bytes, size: int) -> bool:
+        """
+        Load the stored index
+        :param head: first line of the log file
+        :param size: current size of the log file
+        :return: True if the stored index still matches the log file
+        """
+        try:
+            with open(self.path, "rb") as f:
+                data = orjson.loads(f.read())
+        except (OSError, orjson.JSONDecodeError):
+            return False
+        if data.get("interval") != self.interval or \
+                data.get("head") != head.decode(errors="replace") or \
+                data.get("next_offset", 0) > size:
+            return False
+        self.head = head
+        self.next_offset = data["next_offset"]
+        self.timestamps = [OVOSLogParser.parse_timestamp(ts)
+                           for ts, _ in data["entries"]]
+        self.offsets = [offset for _, offset in data["entries"]]
+        return True
+
+    def save(self):
+        """
+        Store the index next to the log file, failures are ignored as the
+        index is only an optimization
+        """
+        data = {"interval": self.interval,
+                "head": self.head.decode(errors="replace"),
+                "next_offset": self.next_offset,
+                "entries": [[ts.strftime(TIME_FORMAT), offset] for ts, offset
+                            in zip(self.timestamps, self.offsets)]}
+        try:
+            with open(self.path, "wb") as f:
+                f.write(orjson.dumps(data))
+        except OSError:
+            pass
+
+    def update(self, file) -> bool:
+        """
+        Load the stored index and index any data appended since
+        :param file: log file opened in binary mode
+        :return: True if new entries were added
+        """
+        size = os.fstat(file.fileno()).st_size
+        file.seek(0)
+        head = file.readline()
+        if not self.load(head, size):
+            self.head = head
+            self.next_offset = 0
+            self.timestamps, self.offsets = [], []
+        updated = False
+        while self.next_offset < size:
+            timestamp, position = OVOSLogParser.timestamp_at(
+                file, self.next_offset)
+            if timestamp is None:
+                break
+            if not self.offsets or position > self.offsets[-1]:
+                self.timestamps.append(timestamp)
+                self.offsets.append(position)
+                updated = True
+            self.next_offset += self.interval
+        return updated
+
+    def find_offset(self, start: datetime) -> int:
+        """
+        Find the first record logged at or after `start`
+        :param start: timestamp to look for
+        :return: byte offset of the first line to parse, the file size if
+            all records are older than `start`
+        """
+        with open(self.source, "rb") as file:
+            if self.update(file):
+                self.save()
+            idx = bisect_left(self.timestamps, start)
+            if idx == 0:
+                return 0
+            # the record is at most `interval` bytes past the previous entry
+            offset = self.offsets[idx - 1]
+            while True:
+                timestamp, position = OVOSLogParser.timestamp_at(file, offset)
+                if timestamp is None:
+                    return os.fstat(file.fileno()).st_size
+                if timestamp >= start:
+                    return position
+                offset = position + 1
+
+
+def get_last_load_time(directories: Optional[List[str]] = None) -> Optional[datetime]:
+    # if nothing's found return the beginning of unix time
+    last_timestamp = datetime.fromtimestamp(0)
+    if directories is None:
+        directory = get_log_path("skills")
+    else:
+        directory = get_log_path("skills", directories)
+    
+    if directory:
+        for line in read_lines_reversed(os.path.join(directory, "skills.log")):
+            if line.startswith("{"):
+                # JSON lines, see `LOG.init`
+                records = OVOSLogParser.parse_json(line)
+                logline = records[0] if records else LogLine()
+            else:
+                logline = OVOSLogParser.parse(line)
+            if logline.timestamp:
+                last_timestamp = logline.timestamp
+            if logline.message == "Loading message bus configs":
+                break
+    return last_timestamp
+
+
+COMPRESSED_EXTENSIONS = (".gz", ".zst")
+
+
+def is_compressed(path: str) -> bool:
+    return path.endswith(COMPRESSED_EXTENSIONS)
+
+
+def open_log(path: str) -> BinaryIO:
+    """
+    Open a log file for reading in binary mode, rotated logs compressed by
+    `LOG` (see the "compress" option) are decompressed while reading
+    :param path: path to the log file
+    :return: binary file object
+    """
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    if path.endswith(".zst"):
+        import zstandard
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(
+            open(path, "rb"), closefd=True))
+    return open(path, "rb")
+
+
+def get_rotated_logs(source: str) -> List[str]:
+    """
+    Get the rotated backups of a log file, `RotatingFileHandler` names them
+    `<log>.1` (newest) to `<log>.<backup_count>`, optionally compressed
+    :param source: path to the log file
+    :return: paths of the backups, newest first
+    """
+    directory, name = os.path.split(source)
+    pattern = re.compile(re.escape(name) + r"\.(\d+)(\.gz|\.zst)?$")
+    backups = {}
+    for file in os.listdir(directory or "."):
+        match = pattern.match(file)
+        if match:
+            index = int(match.group(1))
+            # prefer the uncompressed file while it is being compressed
+            if index not in backups or not match.group(2):
+                backups[index] = os.path.join(directory, file)
+    return [backups[index] for index in sorted(backups)]
+
+
+def read_lines_reversed(source: str, chunk_size: int = 64 * 1024
+                        ) -> Generator[str, None, None]:
+    """
+    Read a file line by line, starting from the end. Blocks of `chunk_size`
+    bytes are read backwards, so memory use does not depend on the file size
+    and nothing before the last requested line is read.
+    :param source: path to the file
+    :param chunk_size: number of bytes read at a time
+    :return: generator of lines (without line endings), last line first
+    """
+    with open(source, "rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        remainder = b""
+        last_chunk = True
+        while position > 0:
+            read_size = min(chunk_size, position)
+            position -= read_size
+            f.seek(position)
+            parts = (f.read(read_size) + remainder).split(b"\n")
+            # the first part may continue in the previous block
+            remainder = parts[0]
+            if last_chunk and parts[-1] == b"":
+                # trailing newline at the end of the file
+                parts.pop()
+            last_chunk = False
+            for part in reversed(parts[1:]):
+                yield part.decode(errors="replace")
+        if remainder or not last_chunk:
+            yield remainder.decode(errors="replace")
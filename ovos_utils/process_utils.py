@@ -399,6 +399,8 @@ class PIDLock:  # python 3+ 'class Lock'
                     os.unlink(self.path)
         except IOError:
             pass
+        # write out any log records still queued for output
+        LOG.flush()
 
 
 def reset_sigint_handler():
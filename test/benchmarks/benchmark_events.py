@@ -0,0 +1,53 @@
+"""
+Measure the overhead the skill handler wrappers add to each dispatched message.
+
+Usage:
+    python test/benchmarks/benchmark_events.py [iterations]
+"""
+import sys
+import timeit
+
+from ovos_utils.events import create_basic_wrapper, create_wrapper
+from ovos_utils.fakebus import FakeMessage as Message
+
+
+def handler(message):
+    pass
+
+
+def handler_no_args():
+    pass
+
+
+def on_start(message):
+    pass
+
+
+def on_end(message):
+    pass
+
+
+def on_error(e, message):
+    pass
+
+
+def main(iterations: int = 100000):
+    message = Message("test", {"utterance": "benchmark"})
+    cases = {
+        "handler (unwrapped)": handler,
+        "create_basic_wrapper": create_basic_wrapper(handler),
+        "create_basic_wrapper (no args)": create_basic_wrapper(handler_no_args),
+        "create_wrapper (no callbacks)": create_wrapper(handler, "skill.test", None, None, None),
+        "create_wrapper": create_wrapper(handler, "skill.test", on_start, on_end, on_error),
+        "create_wrapper (no args)": create_wrapper(handler_no_args, "skill.test", on_start, on_end, on_error),
+    }
+    results = {}
+    for name, case in cases.items():
+        best = min(timeit.repeat(lambda: case(message), number=iterations, repeat=5))
+        results[name] = best / iterations * 1e6
+    for name, usec in results.items():
+        print(f"{name:<35} {usec:8.2f} us/message")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:2]))
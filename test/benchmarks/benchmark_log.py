@@ -0,0 +1,47 @@
+"""
+Compare the per-call cost of `LOG` against a plain `logging.Logger`.
+
+Usage:
+    python test/benchmarks/benchmark_log.py [iterations]
+"""
+import io
+import logging
+import sys
+import timeit
+from contextlib import redirect_stdout
+
+from ovos_utils.log import LOG
+
+
+def _null_logger(name: str) -> logging.Logger:
+    logger = logging.getLogger(name)
+    logger.propagate = False
+    logger.handlers = [logging.StreamHandler(io.StringIO())]
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+def main(iterations: int = 20000):
+    plain = _null_logger("benchmark.plain")
+
+    # LOG writes to the current sys.stdout, redirected below
+    LOG.base_path = "stdout"
+    LOG.set_level("INFO")
+
+    cases = {
+        "logging.Logger.info": lambda: plain.info("benchmark %s", 1),
+        "logging.Logger.debug (filtered)": lambda: plain.debug("benchmark"),
+        "LOG.info": lambda: LOG.info("benchmark %s", 1),
+        "LOG.debug (filtered)": lambda: LOG.debug("benchmark"),
+    }
+    results = {}
+    with redirect_stdout(io.StringIO()):
+        for name, case in cases.items():
+            best = min(timeit.repeat(case, number=iterations, repeat=5))
+            results[name] = best / iterations * 1e6
+    for name, usec in results.items():
+        print(f"{name:<35} {usec:8.2f} us/call")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:2]))
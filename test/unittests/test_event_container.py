@@ -66,3 +66,68 @@ class TestEventContainer(unittest.TestCase):
 
         container.clear()
         self.assertEqual(len(container.events), 0)
+
+    def test_registration_order(self):
+        bus = mock.MagicMock()
+        container = EventContainer(bus)
+
+        def other_handler(message):
+            pass
+
+        container.add('test1', example_handler)
+        container.add('test2', example_handler)
+        container.add('test1', other_handler)
+        self.assertEqual(container.events, [('test1', example_handler),
+                                            ('test2', example_handler),
+                                            ('test1', other_handler)])
+        self.assertEqual(list(container), container.events)
+
+        # events is a copy of the registered events
+        container.events.clear()
+        self.assertEqual(len(container.events), 3)
+
+        # all handlers of a name are removed, others are kept in order
+        container.add('test3', example_handler)
+        self.assertTrue(container.remove('test1'))
+        bus.remove_all_listeners.assert_called_once_with('test1')
+        self.assertEqual(container.events, [('test2', example_handler),
+                                            ('test3', example_handler)])
+        self.assertFalse(container.remove('test1'))
+
+        container.add('test1', other_handler)
+        self.assertEqual(container.events[-1], ('test1', other_handler))
+
+        # assigning events replaces the tracked events
+        container.events = [('test4', example_handler)]
+        self.assertEqual(container.events, [('test4', example_handler)])
+        self.assertTrue(container.remove('test4'))
+        self.assertEqual(container.events, [])
+
+    def test_clear_many(self):
+        bus = mock.MagicMock()
+        container = EventContainer(bus)
+        for i in range(1000):
+            container.add(f'test{i}', example_handler)
+        container.clear()
+        self.assertEqual(bus.remove.call_count, 1000)
+        bus.remove.assert_called_with('test999', example_handler)
+        self.assertEqual(container.events, [])
+
+    def test_add_remove_many(self):
+        bus = mock.MagicMock()
+        container = EventContainer(bus)
+
+        container.add_many([('test1', example_handler),
+                            ('test2', example_handler),
+                            ('test3', None)])
+        self.assertEqual(bus.on.call_count, 2)
+        container.add_many([('test3', example_handler)], once=True)
+        bus.once.assert_called_once()
+        self.assertEqual([name for name, _ in container.events],
+                         ['test1', 'test2', 'test3'])
+        self.assertNotEqual(container.events[-1][1], example_handler)
+
+        self.assertEqual(container.remove_many(['test3', 'test4', 'test1']),
+                         ['test3', 'test1'])
+        self.assertEqual(bus.remove_all_listeners.call_count, 2)
+        self.assertEqual(container.events, [('test2', example_handler)])
@@ -44,7 +44,67 @@ class TestEvents(unittest.TestCase):
 
     def test_create_wrapper(self):
         from ovos_utils.events import create_wrapper
-        # TODO
+        test_message = Message("test", {"TESTSKILLdata": "value"})
+
+        calls = []
+        on_start = Mock(side_effect=lambda m: calls.append("start"))
+        on_end = Mock(side_effect=lambda m: calls.append("end"))
+        on_error = Mock()
+
+        # Test handler with message arg, start and end reported in order
+        def _with_arg(msg):
+            calls.append("handler")
+            self.assertEqual(msg.data, {"data": "value"})
+
+        wrapped = create_wrapper(_with_arg, "TESTSKILL", on_start, on_end,
+                                 on_error)
+        wrapped(test_message)
+        self.assertEqual(calls, ["start", "handler", "end"])
+        on_start.assert_called_once_with(test_message)
+        on_end.assert_called_once_with(test_message)
+        on_error.assert_not_called()
+
+        # Test handler without args, no callbacks
+        call_count = 0
+
+        def _no_args():
+            nonlocal call_count
+            call_count += 1
+
+        wrapped = create_wrapper(_no_args, "TESTSKILL", None, None, None)
+        wrapped(test_message)
+        wrapped(test_message)
+        self.assertEqual(call_count, 2)
+
+        # Test error callback with and without the message
+        def _internal_exception(msg):
+            raise RuntimeError
+
+        errors = []
+
+        def _error_with_message(e, message):
+            errors.append((e, message))
+
+        on_end.reset_mock()
+        wrapped = create_wrapper(_internal_exception, "TESTSKILL", None,
+                                 on_end, _error_with_message)
+        wrapped(test_message)
+        self.assertIsInstance(errors[0][0], RuntimeError)
+        self.assertEqual(errors[0][1], test_message)
+        on_end.assert_called_once_with(test_message)
+
+        error_handler = Mock(spec=lambda e: None)
+        wrapped = create_wrapper(_internal_exception, "TESTSKILL", None,
+                                 None, error_handler)
+        wrapped(test_message)
+        error_handler.assert_called_once()
+        self.assertEqual(len(error_handler.call_args[0]), 1)
+        self.assertIsInstance(error_handler.call_args[0][0], RuntimeError)
+
+        # Exceptions are swallowed without an error callback
+        wrapped = create_wrapper(_internal_exception, "TESTSKILL", None,
+                                 None, None)
+        wrapped(test_message)
 
     def test_create_basic_wrapper(self):
         from ovos_utils.events import create_basic_wrapper
@@ -329,6 +389,102 @@ class TestEventSchedulerInterface(unittest.TestCase):
 
         self.interface._schedule_event = real_schedule
 
+    def test_schedule_events(self):
+        from ovos_utils.events import EventSchedulerInterface
+        bus = FakeBus()
+        interface = EventSchedulerInterface(bus=bus, skill_id="batch")
+        messages = []
+        bus.on("mycroft.scheduler.schedule_event", messages.append)
+        bus.on("mycroft.scheduler.schedule_events", messages.append)
+        bus.on("mycroft.scheduler.remove_event", messages.append)
+        bus.on("mycroft.scheduler.remove_events", messages.append)
+
+        def acknowledge(message):
+            bus.emit(message.response())
+
+        # scheduler that supports batches
+        bus.on("mycroft.scheduler.schedule_events", acknowledge)
+        callback = Mock()
+        callback.__name__ = "test"
+        events = [{"handler": callback, "when": 60, "name": "one"},
+                  {"handler": callback, "when": 120, "name": "two",
+                   "data": {"test": True}},
+                  {"handler": callback, "when": None, "interval": 30,
+                   "name": "repeat"}]
+        interface.schedule_events(events, context={"test": "batch"})
+        # the empty batch checking for support, then the events
+        self.assertEqual(len(messages), 2)
+        self.assertEqual(messages[0].data, {"events": []})
+        batch = messages[1].data["events"]
+        self.assertEqual([e["event"] for e in batch],
+                         ["batch:one", "batch:two", "batch:repeat"])
+        self.assertEqual(batch[1]["data"], {"test": True})
+        self.assertEqual(batch[2]["repeat"], 30)
+        self.assertEqual(messages[1].context["test"], "batch")
+        self.assertEqual(messages[1].context["skill_id"], "batch")
+        self.assertEqual(interface.scheduled_repeats, ["repeat"])
+        self.assertEqual(len(interface.events.events), 3)
+
+        # repeating events are not scheduled twice
+        messages.clear()
+        interface.schedule_events(events[2:])
+        self.assertEqual(messages, [])
+
+        interface.cancel_scheduled_events(["one", "repeat", "unknown"])
+        self.assertEqual(len(messages), 1)
+        self.assertEqual(messages[0].msg_type,
+                         "mycroft.scheduler.remove_events")
+        self.assertEqual(messages[0].data["events"],
+                         ["batch:one", "batch:repeat"])
+        self.assertEqual(interface.scheduled_repeats, [])
+        self.assertEqual([name for name, _ in interface.events],
+                         ["batch:two"])
+
+        # legacy scheduler, one message per event
+        bus.remove("mycroft.scheduler.schedule_events", acknowledge)
+        interface = EventSchedulerInterface(bus=bus, skill_id="legacy")
+        messages.clear()
+        start = time()
+        interface.schedule_events(events)
+        # not waiting for the scheduler to answer the empty batch
+        self.assertLess(time() - start, 0.5)
+        self.assertEqual([m.msg_type for m in messages],
+                         ["mycroft.scheduler.schedule_events"] +
+                         ["mycroft.scheduler.schedule_event"] * 3)
+        self.assertEqual([m.data["event"] for m in messages[1:]],
+                         ["legacy:one", "legacy:two", "legacy:repeat"])
+        messages.clear()
+        interface.cancel_scheduled_events(["one", "two"])
+        self.assertEqual([m.data["event"] for m in messages],
+                         ["legacy:one", "legacy:two"])
+
+    def test_schedule_events_invalid(self):
+        from ovos_utils.events import EventSchedulerInterface
+        bus = FakeBus()
+        interface = EventSchedulerInterface(bus=bus, skill_id="invalid")
+        messages = []
+        bus.on("mycroft.scheduler.schedule_event", messages.append)
+        callback = Mock()
+        callback.__name__ = "test"
+
+        # an invalid event rejects the whole batch, leaving no state behind
+        with self.assertRaises(ValueError):
+            interface.schedule_events([
+                {"handler": callback, "when": 10, "interval": 5,
+                 "name": "rep"},
+                {"handler": callback, "when": -1, "name": "invalid"}])
+        self.assertEqual(interface.scheduled_repeats, [])
+        self.assertEqual(interface._scheduled, {})
+        self.assertEqual(interface.events.events, [])
+        self.assertEqual(messages, [])
+
+        # retrying schedules the repeating event
+        interface.schedule_repeating_event(callback, 10, 5, name="rep")
+        self.assertEqual(interface.scheduled_repeats, ["rep"])
+        self.assertEqual(len(messages), 1)
+        self.assertAlmostEqual(interface.get_scheduled_event_status("rep"),
+                               10, delta=1)
+
     def test_update_scheduled_event(self):
         # TODO
         pass
@@ -338,8 +494,86 @@ class TestEventSchedulerInterface(unittest.TestCase):
         pass
 
     def test_get_scheduled_event_status(self):
-        # TODO
-        pass
+        from ovos_utils.events import EventSchedulerInterface
+        bus = FakeBus()
+        interface = EventSchedulerInterface(bus=bus, skill_id="status")
+        queries = []
+        bus.on("mycroft.scheduler.get_event", queries.append)
+        callback = Mock()
+        callback.__name__ = "test"
+
+        # events scheduled here are answered locally
+        interface.schedule_event(callback, 60, name="single")
+        self.assertAlmostEqual(interface.get_scheduled_event_status("single"),
+                               60, delta=1)
+        start = datetime.datetime.now() - datetime.timedelta(seconds=25)
+        interface.schedule_repeating_event(callback, start, 10, name="repeat")
+        self.assertAlmostEqual(interface.get_scheduled_event_status("repeat"),
+                               5, delta=1)
+        interface.update_scheduled_event("single", {"test": True})
+        self.assertEqual(interface._scheduled["status:single"]["data"],
+                         {"test": True})
+        self.assertEqual(queries, [])
+
+        # single shot events are dropped once called
+        bus.emit(Message("status:single"))
+        callback.assert_called_once()
+        self.assertNotIn("status:single", interface._scheduled)
+        interface.cancel_scheduled_event("repeat")
+        self.assertEqual(interface._scheduled, {})
+
+        # other events are queried from the scheduler
+        def reply(message):
+            name = message.data["name"]
+            status = message.reply(f"mycroft.event_status.callback.{name}")
+            # the scheduler replies with the list of pending calls, which
+            # Message can't serialize, skip straight to the listeners
+            status.data = [(time() + 30, None, {}, {})]
+            bus.ee.emit(status.msg_type, status)
+
+        bus.on("mycroft.scheduler.get_event", reply)
+        self.assertAlmostEqual(interface.get_scheduled_event_status("other"),
+                               30, delta=1)
+        self.assertEqual(len(queries), 1)
+
+    def test_request_scheduled_event_status(self):
+        from ovos_utils.events import EventSchedulerInterface
+        bus = FakeBus()
+        interface = EventSchedulerInterface(bus=bus, skill_id="request")
+        callback = Mock()
+        callback.__name__ = "test"
+        interface.schedule_event(callback, 60, name="event")
+
+        answered = Event()
+        answers = []
+
+        def on_answer(time_left):
+            answers.append(time_left)
+            answered.set()
+
+        def reply(message):
+            name = message.data["name"]
+            status = message.reply(f"mycroft.event_status.callback.{name}")
+            # the scheduler replies with the list of pending calls, which
+            # Message can't serialize, skip straight to the listeners
+            status.data = [(time() + 120, None, {}, {})]
+            bus.ee.emit(status.msg_type, status)
+
+        # the scheduler is always asked, its answer updates the local copy
+        bus.on("mycroft.scheduler.get_event", reply)
+        interface.request_scheduled_event_status("event", on_answer)
+        self.assertTrue(answered.wait(2))
+        self.assertAlmostEqual(answers[0], 120, delta=1)
+        self.assertAlmostEqual(interface.get_scheduled_event_status("event"),
+                               120, delta=1)
+
+        # no answer within the timeout
+        bus.remove("mycroft.scheduler.get_event", reply)
+        answered.clear()
+        interface.request_scheduled_event_status("event", on_answer, 0.1)
+        self.assertTrue(answered.wait(2))
+        self.assertIsNone(answers[1])
+        self.assertEqual(len(answers), 2)
 
     def test_cancel_all_repeating_events(self):
         # TODO
@@ -357,3 +591,114 @@ class TestEventSchedulerInterface(unittest.TestCase):
 
         self.interface.cancel_all_repeating_events = real_cancel_repeating
         self.interface.events.clear = real_clear
+
+
+class TestLocalEventScheduler(unittest.TestCase):
+    def setUp(self):
+        from ovos_utils.events import LocalEventScheduler
+        self.scheduler = LocalEventScheduler()
+
+    def tearDown(self):
+        self.scheduler.shutdown()
+
+    def test_schedule_event(self):
+        called = Event()
+        messages = []
+
+        def handler(message):
+            messages.append(message)
+            called.set()
+
+        self.scheduler.schedule_event("test:event", time() + 0.1, handler,
+                                      data={"test": True},
+                                      context={"skill_id": "test"})
+        self.assertAlmostEqual(self.scheduler.get_event_time("test:event"),
+                               time() + 0.1, 1)
+        self.assertEqual(self.scheduler.get_event_names(), ["test:event"])
+        self.assertTrue(called.wait(2))
+        self.assertEqual(messages[0].msg_type, "test:event")
+        self.assertEqual(messages[0].data, {"test": True})
+        self.assertEqual(messages[0].context, {"skill_id": "test"})
+        # single shot events are dropped once called
+        self.assertIsNone(self.scheduler.get_event_time("test:event"))
+        self.assertFalse(self.scheduler.remove_event("test:event"))
+
+    def test_order(self):
+        called = []
+        done = Event()
+
+        def handler(message):
+            called.append(message.msg_type)
+            if len(called) == 3:
+                done.set()
+
+        now = time()
+        self.scheduler.schedule_event("third", now + 0.3, handler)
+        self.scheduler.schedule_event("first", now + 0.1, handler)
+        self.scheduler.schedule_event("past", now - 10, handler)
+        self.scheduler.schedule_event("cancelled", now + 0.2, handler)
+        self.assertTrue(self.scheduler.remove_event("cancelled"))
+        self.assertTrue(done.wait(2))
+        self.assertEqual(called, ["past", "first", "third"])
+
+    def test_repeating_event(self):
+        called = []
+        repeated = Event()
+
+        def handler(message):
+            called.append(message.data)
+            if len(called) == 3:
+                repeated.set()
+
+        self.scheduler.schedule_event("repeat", time(), handler, repeat=0.05,
+                                      data={"count": 0})
+        # already scheduled repeating events are not scheduled again
+        self.scheduler.schedule_event("repeat", time(), handler, repeat=0.05)
+        self.scheduler.update_event("repeat", {"count": 1})
+        self.assertTrue(repeated.wait(2))
+        self.assertTrue(self.scheduler.remove_event("repeat"))
+        count = len(called)
+        self.assertIn({"count": 1}, called)
+        self.assertTrue(all(data in ({"count": 0}, {"count": 1})
+                            for data in called))
+
+        self.assertGreaterEqual(count, 3)
+
+        # handler errors don't stop the dispatcher
+        after_error = Event()
+        self.scheduler.schedule_event("error", time(), Mock(
+            side_effect=RuntimeError))
+        self.scheduler.schedule_event("event", time() + 0.05,
+                                      lambda message: after_error.set())
+        self.assertTrue(after_error.wait(2))
+
+    def test_interface(self):
+        from ovos_utils.events import EventSchedulerInterface
+        bus = FakeBus()
+        bus.emit = Mock()
+        interface = EventSchedulerInterface(bus=bus, skill_id="test",
+                                            scheduler=self.scheduler)
+        called = Event()
+        callback = Mock(side_effect=lambda message: called.set())
+        callback.__name__ = "test"
+
+        interface.schedule_event(callback, 60, {"test": True}, "event")
+        self.assertAlmostEqual(interface.get_scheduled_event_status("event"),
+                               60, delta=1)
+        interface.update_scheduled_event("event", {"test": False})
+        interface.cancel_scheduled_event("event")
+        with self.assertRaises(Exception):
+            interface.get_scheduled_event_status("event")
+
+        interface.schedule_repeating_event(callback, None, 60, name="repeat")
+        interface.schedule_event(callback, 60, name="single")
+        self.assertEqual(sorted(self.scheduler.get_event_names()),
+                         ["test:repeat", "test:single"])
+        interface.shutdown()
+        self.assertEqual(self.scheduler.get_event_names(), [])
+
+        interface.schedule_event(callback, 0.05)
+        self.assertTrue(called.wait(2))
+        self.assertEqual(callback.call_args[0][0].context["skill_id"], "test")
+        # nothing goes over the messagebus
+        bus.emit.assert_not_called()
@@ -1,8 +1,11 @@
+import logging
 import os
 import shutil
+import sys
 import unittest
 import importlib
 
+from collections import OrderedDict
 from os.path import join, dirname, isdir, isfile
 from unittest.mock import patch, Mock
 
@@ -54,8 +57,10 @@ class TestLog(unittest.TestCase):
         log_file = join(LOG.base_path, f"{LOG.name}.log")
         self.assertFalse(isfile(log_file))
         LOG.info("This won't print")
-        self.assertTrue(isfile(log_file))
+        # Filtered messages never reach the logger
+        self.assertFalse(isfile(log_file))
         LOG.warning("This will print")
+        self.assertTrue(isfile(log_file))
         with open(log_file) as f:
             lines = f.readlines()
         self.assertEqual(len(lines), 1)
@@ -106,6 +111,396 @@ class TestLog(unittest.TestCase):
         self.assertEqual(len(lines), 1)
         self.assertTrue(lines[0].endswith("99\n"))
 
+    def test_caller_resolution(self):
+        from ovos_utils.log import LOG
+        LOG.init({"path": self.test_dir, "level": "INFO"})
+        LOG.name = "callers"
+        lineno = sys._getframe().f_lineno + 1
+        LOG.info("test %s", "args")
+        with open(join(self.test_dir, "callers.log")) as f:
+            lines = f.readlines()
+        self.assertEqual(len(lines), 1)
+        self.assertTrue(lines[0].endswith(
+            f" - callers - {__name__}:test_caller_resolution:{lineno} - "
+            f"INFO - test args\n"), lines[0])
+        code = sys._getframe().f_code
+        self.assertEqual(LOG._module_cache[code], __name__)
+
+        # Module name is resolved once per code object
+        with patch("ovos_utils.log.inspect.getmodule") as getmodule:
+            LOG.warning("test")
+            getmodule.assert_not_called()
+
+        # Exceptions include the traceback
+        try:
+            raise ValueError("test exception")
+        except ValueError:
+            LOG.exception("caught")
+        with open(join(self.test_dir, "callers.log")) as f:
+            lines = f.readlines()
+        self.assertIn(":test_caller_resolution:", lines[2])
+        self.assertTrue(lines[2].endswith("ERROR - caught\n"))
+        self.assertEqual(lines[3], "Traceback (most recent call last):\n")
+        self.assertEqual(lines[-1], "ValueError: test exception\n")
+
+    def test_shared_handlers(self):
+        from ovos_utils.log import LOG
+        LOG.init({"path": self.test_dir, "level": "INFO"})
+        LOG.name = "shared"
+
+        def _log(msg):
+            LOG.info(msg)
+
+        for i in range(10):
+            LOG.info(str(i))
+            _log(str(i))
+        # One logger per module, not per call site
+        shared = [logger for name, logger in LOG._loggers.items()
+                  if name.startswith("shared - ")]
+        self.assertEqual(len(shared), 1)
+        self.assertEqual(shared[0].name, f"shared - {__name__}")
+
+        # Loggers share one handler per output target
+        other = LOG.create_logger("shared - other")
+        self.assertEqual(other.handlers, shared[0].handlers)
+        self.assertTrue(all(h in LOG._handlers.values()
+                            for h in other.handlers))
+        file_handlers = [h for h in LOG._handlers
+                         if h.endswith("shared.log")]
+        self.assertEqual(len(file_handlers), 1)
+
+    def test_async_logging(self):
+        from logging.handlers import QueueHandler, RotatingFileHandler
+        from ovos_utils.log import LOG
+        config = {"path": self.test_dir, "level": "INFO", "async": True,
+                  "queue_size": 5, "overflow": "block"}
+        LOG.init(config)
+        LOG.name = "async"
+        for i in range(20):
+            LOG.info(str(i))
+        logger = LOG._loggers[f"async - {__name__}"]
+        self.assertTrue(all(isinstance(h, QueueHandler)
+                            for h in logger.handlers))
+        log_file = join(self.test_dir, "async.log")
+        LOG.flush()
+        with open(log_file) as f:
+            lines = f.readlines()
+        self.assertEqual(len(lines), 20)
+        self.assertTrue(lines[-1].endswith("INFO - 19\n"))
+
+        # Switch back to synchronous output
+        config["async"] = False
+        LOG.init(config)
+        self.assertEqual(LOG._listeners, {})
+        self.assertTrue(any(isinstance(h, RotatingFileHandler)
+                            for h in logger.handlers))
+        self.assertFalse(any(isinstance(h, QueueHandler)
+                             for h in logger.handlers))
+        LOG.info("sync")
+        with open(log_file) as f:
+            lines = f.readlines()
+        self.assertTrue(lines[-1].endswith("INFO - sync\n"))
+
+    def test_init_incremental(self):
+        from logging.handlers import RotatingFileHandler
+        from ovos_utils.log import LOG
+        config = {"path": self.test_dir, "level": "INFO"}
+        LOG.init(config)
+        LOG.name = "incremental"
+        LOG.info("first")
+        logger = LOG._loggers[f"incremental - {__name__}"]
+        handlers = list(logger.handlers)
+
+        # Unchanged config keeps handlers and does not resolve paths again
+        with patch("ovos_utils.log._get_default_log_path") as default_path:
+            LOG.init(config)
+            default_path.assert_not_called()
+        self.assertEqual(logger.handlers, handlers)
+
+        # Rotation settings are applied to the existing handler
+        LOG.init({**config, "max_bytes": 1234, "backup_count": 1})
+        self.assertEqual(logger.handlers, handlers)
+        file_handler = [h for h in handlers
+                        if isinstance(h, RotatingFileHandler)][0]
+        self.assertEqual(file_handler.maxBytes, 1234)
+        self.assertEqual(file_handler.backupCount, 1)
+
+        # Level changes only touch logger levels
+        LOG.init({**config, "level": "DEBUG"})
+        self.assertEqual(logger.level, logging.DEBUG)
+        self.assertEqual(logger.handlers, handlers)
+
+        # Path changes move the file output of existing loggers
+        new_dir = join(self.test_dir, "moved")
+        LOG.init({**config, "path": new_dir})
+        self.assertNotIn(file_handler, logger.handlers)
+        LOG.info("second")
+        with open(join(new_dir, "incremental.log")) as f:
+            self.assertTrue(f.read().endswith("INFO - second\n"))
+        with open(join(self.test_dir, "incremental.log")) as f:
+            self.assertTrue(f.read().endswith("INFO - first\n"))
+
+        # Paths configured with a trailing slash are moved as well
+        trailing_dir = join(self.test_dir, "trailing") + os.sep
+        LOG.init({**config, "path": trailing_dir})
+        LOG.info("third")
+        LOG.init({**config, "path": join(self.test_dir, "moved_again")})
+        LOG.info("fourth")
+        with open(join(trailing_dir, "incremental.log")) as f:
+            self.assertTrue(f.read().endswith("INFO - third\n"))
+        with open(join(self.test_dir, "moved_again", "incremental.log")) as f:
+            self.assertTrue(f.read().endswith("INFO - fourth\n"))
+
+    def test_init_after_logging(self):
+        from ovos_utils.log import LOG
+        with patch.multiple(LOG, base_path="stdout", name="early",
+                            _loggers={}, _handlers={}, _logger_modules={}):
+            LOG.info("before init")
+            logger = LOG._loggers[f"early - {__name__}"]
+            LOG.init({"path": self.test_dir, "level": "INFO"})
+            LOG.info("after init")
+            log_file = join(self.test_dir, "early.log")
+            self.assertIn(LOG._handlers[log_file], logger.handlers)
+            LOG.flush()
+            with open(log_file) as f:
+                lines = f.readlines()
+            self.assertEqual(len(lines), 1)
+            self.assertTrue(lines[0].endswith("INFO - after init\n"))
+            for target in list(LOG._handlers):
+                LOG._close_handler(target)
+
+    def test_compress_rotated(self):
+        import gzip
+        from ovos_utils.log import LOG
+        config = {"path": self.test_dir, "level": "INFO", "max_bytes": 2000,
+                  "backup_count": 2, "compress": "gzip"}
+        LOG.init(config)
+        LOG.name = "compressed"
+        for i in range(100):
+            LOG.info("message %s", i)
+        LOG.flush()
+        log_file = join(self.test_dir, "compressed.log")
+        self.assertTrue(os.path.isfile(log_file + ".1.gz"))
+        self.assertTrue(os.path.isfile(log_file + ".2.gz"))
+        self.assertFalse(os.path.isfile(log_file + ".1"))
+        self.assertFalse(os.path.isfile(log_file + ".3.gz"))
+        with gzip.open(log_file + ".2.gz", "rt") as older, \
+                gzip.open(log_file + ".1.gz", "rt") as newer, \
+                open(log_file) as current:
+            lines = older.readlines() + newer.readlines() + \
+                current.readlines()
+        numbers = [int(line.split("message ")[1]) for line in lines]
+        self.assertEqual(numbers, list(range(numbers[0], 100)))
+
+        # unsupported methods disable compression
+        LOG.init({**config, "compress": "lzma"})
+        self.assertIsNone(LOG._compressor)
+        self.assertIsNone(LOG.compression)
+
+        # zstd falls back to gzip without zstandard installed
+        with patch("importlib.util.find_spec", return_value=None) as find:
+            LOG.init({**config, "compress": "zstd"})
+            find.assert_called_once_with("zstandard")
+            self.assertEqual(LOG.compression, "gzip")
+            self.assertEqual(LOG._compressor.method, "gzip")
+            # an unchanged config does not resolve the method again
+            LOG.init({**config, "compress": "zstd"})
+            find.assert_called_once()
+        LOG.init({"path": self.test_dir})
+
+    def test_module_levels(self):
+        from ovos_utils.log import LOG
+        test_module = __name__.rsplit(".", 1)[0]
+        LOG.init({"path": self.test_dir, "level": "INFO",
+                  "modules": {test_module: "DEBUG",
+                              "ovos_utils": "ERROR"}})
+        LOG.name = "modules"
+        try:
+            self.assertEqual(LOG._get_module_level(__name__), "DEBUG")
+            self.assertEqual(LOG._get_module_level("ovos_utils.events"),
+                             "ERROR")
+            self.assertIsNone(LOG._get_module_level("ovos_utils_other"))
+            self.assertTrue(LOG.isEnabledFor(logging.DEBUG))
+
+            LOG.debug("module debug")
+            from ovos_utils.events import EventContainer
+            with patch("ovos_utils.events.LOG", LOG):
+                # LOG.debug in ovos_utils.events
+                EventContainer(Mock()).add("test", Mock())
+            with open(join(self.test_dir, "modules.log")) as f:
+                lines = f.readlines()
+            self.assertEqual(len(lines), 1)
+            self.assertTrue(lines[0].endswith("DEBUG - module debug\n"))
+
+            # Most specific prefix wins, levels of existing loggers update
+            LOG.set_module_levels({"ovos_utils": "ERROR",
+                                   "ovos_utils.events": "DEBUG"})
+            self.assertEqual(LOG._loggers[f"modules - {__name__}"].level,
+                             logging.INFO)
+            self.assertEqual(
+                LOG._loggers["modules - ovos_utils.events"].level,
+                logging.DEBUG)
+        finally:
+            LOG.set_module_levels({})
+        self.assertFalse(LOG.isEnabledFor(logging.DEBUG))
+
+    def test_rate_limit(self):
+        from ovos_utils.log import LOG, _BurstLimiter
+        config = {"path": self.test_dir, "level": "INFO",
+                  "rate_limit": 0.001, "rate_limit_burst": 2}
+        LOG.init(config)
+        LOG.name = "ratelimit"
+        log_file = join(self.test_dir, "ratelimit.log")
+        try:
+            for i in range(10):
+                LOG.error("crash loop %s", i)
+            LOG.info("other call site")
+            with open(log_file) as f:
+                lines = f.readlines()
+            self.assertEqual(len(lines), 3)
+            self.assertTrue(lines[1].endswith("ERROR - crash loop 1\n"))
+            self.assertTrue(lines[2].endswith("INFO - other call site\n"))
+
+            # Summary is logged once the burst ended (or on flush)
+            LOG.flush()
+            with open(log_file) as f:
+                lines = f.readlines()
+            self.assertEqual(len(lines), 4)
+            self.assertTrue(lines[3].endswith(
+                "ERROR - Previous message repeated 8 times\n"), lines[3])
+            self.assertEqual(lines[3].split(" - ")[2],
+                             lines[0].split(" - ")[2])
+        finally:
+            LOG.init({**config, "rate_limit": 0})
+        self.assertIsNone(LOG._limiter)
+
+        # Token bucket refills at `rate`, tracked sites are bounded
+        limiter = _BurstLimiter(rate=1, burst=2, max_sites=2)
+        self.assertTrue(limiter.allow("a", 0))
+        self.assertTrue(limiter.allow("a", 0))
+        self.assertFalse(limiter.allow("a", 0.5))
+        self.assertFalse(limiter.is_ready("a", 0.9))
+        self.assertTrue(limiter.is_ready("a", 1.0))
+        self.assertTrue(limiter.allow("a", 1.0))
+        limiter.allow("b", 1.0)
+        limiter.allow("c", 1.0)
+        self.assertEqual(list(limiter._buckets), ["b", "c"])
+
+    def test_dump_recent(self):
+        from ovos_utils.log import LOG
+        config = {"path": self.test_dir, "level": "INFO",
+                  "recent_records": 3}
+        LOG.init(config)
+        LOG.name = "recent"
+        try:
+            self.assertTrue(LOG.isEnabledFor(logging.DEBUG))
+            LOG.debug("debug %s", 1)
+            LOG.info("info")
+            for i in range(5):
+                LOG.warning(f"warning {i}")
+            try:
+                raise ValueError("test")
+            except ValueError:
+                LOG.exception("exception")
+
+            # DEBUG is only kept in memory
+            with open(join(self.test_dir, "recent.log")) as f:
+                self.assertNotIn("debug 1", f.read())
+
+            path = LOG.dump_recent()
+            self.assertEqual(path, join(self.test_dir, "recent_recent.txt"))
+            with open(path) as f:
+                lines = f.readlines()
+            messages = [l.split(" - ", 4)[-1].rstrip("\n") for l in lines
+                        if " - recent - " in l]
+            self.assertEqual(messages, ["debug 1", "info", "warning 2",
+                                        "warning 3", "warning 4",
+                                        "exception"])
+            self.assertIn(f"recent - {__name__}:test_dump_recent:", lines[0])
+            self.assertEqual(lines[-1], "ValueError: test\n")
+
+            custom = join(self.test_dir, "custom.txt")
+            self.assertEqual(LOG.dump_recent(custom), custom)
+            self.assertTrue(isfile(custom))
+        finally:
+            LOG.init({**config, "recent_records": 0})
+        self.assertIsNone(LOG.dump_recent())
+        self.assertFalse(LOG.isEnabledFor(logging.DEBUG))
+
+    def test_dump_on_exception_rate_limit(self):
+        from ovos_utils.log import LOG
+        config = {"path": self.test_dir, "level": "INFO",
+                  "recent_records": 10, "dump_on_exception": True,
+                  "rate_limit": 0.001, "rate_limit_burst": 2}
+        LOG.init(config)
+        LOG.name = "crashloop"
+        try:
+            with patch.object(LOG, "dump_recent") as dump_recent:
+                for _ in range(10):
+                    try:
+                        raise ValueError("test")
+                    except ValueError:
+                        LOG.exception("crash")
+                # only the records within the burst are dumped
+                self.assertEqual(dump_recent.call_count, 2)
+        finally:
+            LOG.init({"path": self.test_dir})
+
+    def test_queue_overflow(self):
+        import logging
+        from queue import Queue
+        from ovos_utils.log import _BoundedQueueHandler
+
+        def _record(msg, level=logging.INFO):
+            return logging.LogRecord("test", level, __file__, 1, msg,
+                                     None, None)
+
+        with self.assertRaises(ValueError):
+            _BoundedQueueHandler(Queue(), "invalid")
+
+        queue = Queue(maxsize=2)
+        handler = _BoundedQueueHandler(queue, "drop_oldest")
+        for msg in ("one", "two", "three"):
+            handler.handle(_record(msg))
+        self.assertEqual(handler.dropped, 1)
+        self.assertEqual([queue.get().msg, queue.get().msg],
+                         ["two", "three"])
+
+        queue = Queue(maxsize=2)
+        handler = _BoundedQueueHandler(queue, "drop_debug")
+        handler.handle(_record("one"))
+        handler.handle(_record("two", logging.DEBUG))
+        handler.handle(_record("three", logging.DEBUG))
+        self.assertEqual(handler.dropped, 1)
+        self.assertEqual([queue.get().msg, queue.get().msg],
+                         ["one", "two"])
+
+    @patch("ovos_utils.log.LOG._get_real_logger")
+    def test_level_short_circuit(self, get_real_logger):
+        import logging
+        from ovos_utils.log import LOG
+        level = LOG.level
+        LOG.level = "INFO"
+        self.assertFalse(LOG.isEnabledFor(logging.DEBUG))
+        self.assertTrue(LOG.isEnabledFor(logging.INFO))
+        LOG.debug("filtered")
+        get_real_logger.assert_not_called()
+        LOG.info("emitted")
+        get_real_logger.assert_called_once()
+
+        LOG.level = logging.ERROR
+        LOG.warning("filtered")
+        get_real_logger.assert_called_once()
+        LOG.exception("emitted")
+        self.assertEqual(get_real_logger.call_count, 2)
+
+        # Global `logging.disable` is respected
+        logging.disable(logging.ERROR)
+        LOG.error("filtered")
+        self.assertEqual(get_real_logger.call_count, 2)
+        logging.disable(logging.NOTSET)
+        LOG.level = level
+
     @patch("ovos_utils.log.get_logs_config")
     @patch("ovos_config.Configuration.set_config_watcher")
     def test_init_service_logger(self, set_config_watcher, log_config):
@@ -132,42 +527,44 @@ class TestLog(unittest.TestCase):
         LOG.debug("This will print")
         self.assertTrue(isfile(join(self.test_dir, "configured.log")))
 
-    @patch("ovos_utils.log.LOG.create_logger")
-    def test_log_deprecation(self, create_logger):
-        fake_log = Mock()
-        log_warning = fake_log.warning
-        create_logger.return_value = fake_log
+    @patch("ovos_utils.log.LOG._emit_record")
+    def test_log_deprecation(self, emit_record):
         from ovos_utils.log import log_deprecation
 
+        lineno = sys._getframe().f_lineno + 1
         log_deprecation("test")
-        create_logger.assert_called_once()
-        log_msg = log_warning.call_args[0][0]
+        emit_record.assert_called_once()
+        _, level, filename, line, func, module, log_msg = \
+            emit_record.call_args[0][:7]
+        # the record is reported at the call site
+        self.assertEqual(level, logging.WARNING)
+        self.assertEqual(filename, __file__)
+        self.assertEqual(line, lineno)
+        self.assertEqual(func, "test_log_deprecation")
+        self.assertEqual(module, __name__)
         self.assertIn('version=Unknown', log_msg, log_msg)
         self.assertIn('test', log_msg, log_msg)
 
         log_deprecation()
-        log_msg = log_warning.call_args[0][0]
+        log_msg = emit_record.call_args[0][6]
         self.assertIn('version=Unknown', log_msg, log_msg)
         self.assertIn('DEPRECATED', log_msg, log_msg)
 
-    @patch("ovos_utils.log.LOG.create_logger")
-    def test_deprecated_decorator(self, create_logger):
-        fake_log = Mock()
-        log_warning = fake_log.warning
-        create_logger.return_value = fake_log
+    @patch("ovos_utils.log.LOG._emit_record")
+    def test_deprecated_decorator(self, emit_record):
         from ovos_utils.log import deprecated
         import sys
         sys.path.insert(0, dirname(__file__))
         from deprecation_helper import deprecated_function, Deprecated
         deprecated_function()
-        log_warning.assert_called_once()
-        log_msg = log_warning.call_args[0][0]
+        emit_record.assert_called_once()
+        log_msg = emit_record.call_args[0][6]
         self.assertIn('version=0.1.0', log_msg, log_msg)
         self.assertIn('test_log', log_msg, log_msg)
         self.assertIn('imported deprecation', log_msg, log_msg)
 
         test_class = Deprecated()
-        log_msg = log_warning.call_args[0][0]
+        log_msg = emit_record.call_args[0][6]
         self.assertIn('version=0.2.0', log_msg, log_msg)
         self.assertIn('Class Deprecated', log_msg, log_msg)
 
@@ -180,10 +577,63 @@ class TestLog(unittest.TestCase):
 
         _deprecated_function("test")
         self.assertEqual(call_arg, "test")
-        log_msg = log_warning.call_args[0][0]
+        log_msg = emit_record.call_args[0][6]
         self.assertIn('version=1.0.0', log_msg, log_msg)
         self.assertIn('test deprecation', log_msg, log_msg)
 
+    @patch("ovos_utils.log.LOG._emit_record")
+    def test_log_deprecation_rate_limit(self, emit_record):
+        import ovos_utils.log
+        from ovos_utils.log import log_deprecation, deprecated, \
+            get_deprecation_counts, set_deprecation_log_interval
+
+        @deprecated("rate limited", "1.0.0")
+        def _deprecated():
+            pass
+
+        # Same call site is only logged once, but counted on every call
+        for _ in range(5):
+            _deprecated()
+        emit_record.assert_called_once()
+        hits = {k: v for k, v in get_deprecation_counts().items()
+                if k[2] == "rate limited"}
+        self.assertEqual(len(hits), 1)
+        location, call_site, _ = list(hits.keys())[0]
+        self.assertTrue(location.endswith("._deprecated"), location)
+        self.assertIn(":test_log_deprecation_rate_limit:", call_site)
+        self.assertEqual(list(hits.values()), [5])
+
+        # A different call site is logged again
+        _deprecated()
+        self.assertEqual(emit_record.call_count, 2)
+
+        # Origin is resolved once per call site
+        with patch("ovos_utils.log._resolve_deprecation_origin",
+                   wraps=ovos_utils.log._resolve_deprecation_origin) as r:
+            for _ in range(3):
+                log_deprecation("resolved once")
+            r.assert_called_once()
+
+        # Repeat warnings at a configured interval
+        set_deprecation_log_interval(0)
+        try:
+            emit_record.reset_mock()
+            for _ in range(3):
+                _deprecated()
+            self.assertEqual(emit_record.call_count, 3)
+        finally:
+            set_deprecation_log_interval(None)
+
+        # Hits are kept for a bounded number of call sites only
+        with patch("ovos_utils.log._deprecation_hits", OrderedDict()), \
+                patch("ovos_utils.log._deprecation_hits_size", 3):
+            for i in range(10):
+                log_deprecation(f"bounded {i}")
+            self.assertLessEqual(len(ovos_utils.log._deprecation_hits), 3)
+            counts = get_deprecation_counts()
+            self.assertIn("bounded 9", [k[2] for k in counts])
+            self.assertNotIn("bounded 0", [k[2] for k in counts])
+
     @patch("ovos_utils.log.get_logs_config")
     @patch("ovos_utils.log.LOG")
     def test_monitor_log_level(self, log, get_config):
@@ -255,6 +705,13 @@ class TestLog(unittest.TestCase):
         self.assertEqual(get_logs_config("test_service", logging_config),
                          expected_config)
 
+        # Test `logging.<service>.modules` level overrides
+        logging_config["logging"]["test_service"]["modules"] = \
+            {"ovos_workshop.skills": "DEBUG"}
+        self.assertEqual(get_logs_config("test_service", logging_config),
+                         {**expected_config,
+                          "modules": {"ovos_workshop.skills": "DEBUG"}})
+
     @patch("ovos_utils.log.get_logs_config")
     def test_get_log_path(self, get_config):
         from ovos_utils.log import get_log_path
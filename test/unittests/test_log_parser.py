@@ -0,0 +1,609 @@
+import gzip
+import io
+import os
+import shutil
+import sys
+import unittest
+from datetime import datetime, timedelta
+from threading import Lock
+from os.path import join, dirname, isdir, isfile
+from unittest.mock import patch
+
+import orjson
+from click.testing import CliRunner
+from rich.console import Console
+
+from ovos_utils.log import LOG
+from ovos_utils.log_parser import OVOSLogParser, Frame, LogFollower, \
+    LogIndex, LogLine, LogStats, Traceback, format_logline, \
+    get_last_load_time, get_rotated_logs, print_entries, read_lines_reversed, \
+    remove_log_head, ovos_logs
+
+
+class TestOVOSLogParser(unittest.TestCase):
+    test_dir = join(dirname(__file__), "log_parser_test")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        LOG.init({"path": cls.test_dir})
+        if isdir(cls.test_dir):
+            shutil.rmtree(cls.test_dir)
+
+    def _write_logs(self, name: str, log_format: str) -> str:
+        LOG.init({"path": self.test_dir, "level": "DEBUG",
+                  "format": log_format})
+        LOG.name = name
+        self.lineno = sys._getframe().f_lineno + 1
+        LOG.info("first message")
+        LOG.debug("second %s", "message")
+        try:
+            raise ValueError("test error")
+        except ValueError:
+            LOG.exception("caught")
+        LOG.warning("last message")
+        LOG.flush()
+        return join(self.test_dir, f"{name}.log")
+
+    def _check_entries(self, entries, name: str):
+        self.assertEqual(len(entries), 5)
+        self.assertTrue(all(e.timestamp for e in entries))
+        self.assertIsInstance(entries[0], LogLine)
+        self.assertEqual(entries[0].message.rstrip("\n"), "first message")
+        self.assertEqual(entries[0].source, name)
+        self.assertEqual(entries[0].location,
+                         f"{__name__}:_write_logs:{self.lineno}")
+        self.assertEqual(entries[0].level, "INFO")
+        self.assertEqual(entries[1].message.rstrip("\n"), "second message")
+        self.assertEqual(entries[1].level, "DEBUG")
+        self.assertEqual(entries[2].level, "ERROR")
+        self.assertIsInstance(entries[3], Traceback)
+        self.assertEqual(entries[3].exception, "ValueError: test error")
+        self.assertEqual(entries[3].frames[-1].name, "_write_logs")
+        self.assertEqual(entries[3].timestamp, entries[2].timestamp)
+        self.assertEqual(entries[4].level, "WARNING")
+
+    def test_parse_file_text(self):
+        log_file = self._write_logs("text", "text")
+        with open(log_file) as f:
+            self.assertTrue(f.readline()[0].isdigit())
+        self._check_entries(list(OVOSLogParser.parse_file(log_file)), "text")
+
+    def test_parse_file_jsonl(self):
+        log_file = self._write_logs("jsonl", "jsonl")
+        with open(log_file) as f:
+            self.assertTrue(f.readline().startswith("{"))
+        self._check_entries(list(OVOSLogParser.parse_file(log_file)),
+                            "jsonl")
+
+    def test_parse_json(self):
+        self.assertEqual(OVOSLogParser.parse_json("{not json"), [])
+        self.assertEqual(OVOSLogParser.parse_json('{"data": 1}'), [])
+        line = '{"timestamp": 0.5, "source": "skills", "module": "mod", ' \
+               '"function": "func", "line": 3, "level": "INFO", ' \
+               '"message": "hello"}'
+        log, = OVOSLogParser.parse_json(line)
+        self.assertEqual(log.timestamp, datetime.fromtimestamp(0.5))
+        self.assertEqual(log.location, "mod:func:3")
+        self.assertEqual(str(log).split(" - ", 1)[1],
+                         "skills - mod:func:3 - INFO - hello")
+
+    def _write_timed_log(self, name: str, count: int) -> str:
+        os.makedirs(self.test_dir, exist_ok=True)
+        log_file = join(self.test_dir, f"{name}.log")
+        base = datetime(2023, 12, 1, 12)
+        with open(log_file, "w") as f:
+            f.write("untimestamped header\n")
+            for i in range(count):
+                timestamp = (base + timedelta(seconds=i)).strftime(
+                    "%Y-%m-%d %H:%M:%S.%f")[:-3]
+                f.write(f"{timestamp} - {name} - mod:func:{i} - INFO - "
+                        f"message {i}\n")
+                if i % 100 == 0:
+                    f.write("Traceback (most recent call last):\n"
+                            '  File "/tmp/test.py", line 1, in func\n'
+                            "    raise ValueError()\n"
+                            "ValueError\n")
+        return log_file
+
+    def test_parse_file_time_range(self):
+        log_file = self._write_timed_log("timed", 5000)
+        base = datetime(2023, 12, 1, 12)
+        start = base + timedelta(seconds=1000)
+        end = base + timedelta(seconds=1500)
+        for use_index in (False, True):
+            entries = list(OVOSLogParser.parse_file(log_file, start, end,
+                                                    use_index))
+            lines = [e for e in entries if isinstance(e, LogLine)]
+            self.assertEqual(len(lines), 500)
+            self.assertEqual(lines[0].timestamp, start)
+            self.assertEqual(lines[-1].message.rstrip("\n"), "message 1499")
+            traces = [e for e in entries if isinstance(e, Traceback)]
+            self.assertEqual(len(traces), 5)
+            self.assertEqual(traces[0].timestamp, start)
+
+        # bounds outside of the file
+        offset = OVOSLogParser.find_offset(log_file, base)
+        self.assertEqual(offset, 0)
+        self.assertEqual(OVOSLogParser.find_offset(
+            log_file, base + timedelta(days=1)), os.path.getsize(log_file))
+        entries = list(OVOSLogParser.parse_file(
+            log_file, start=base + timedelta(seconds=4999)))
+        self.assertEqual(len(entries), 1)
+
+    def test_log_index(self):
+        log_file = self._write_timed_log("indexed", 2000)
+        base = datetime(2023, 12, 1, 12)
+        start = base + timedelta(seconds=1234)
+        offset = OVOSLogParser.find_offset(log_file, start)
+        index = LogIndex(log_file, interval=4096)
+        self.assertEqual(index.find_offset(start), offset)
+        self.assertTrue(isfile(index.path))
+        self.assertTrue(index.timestamps)
+
+        # reused and extended while the log grows
+        with open(log_file, "a") as f:
+            f.write("2023-12-01 13:00:00.000 - indexed - mod:func:0 - "
+                    "INFO - appended\n" * 1000)
+        index = LogIndex(log_file, interval=4096)
+        with open(log_file, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            f.seek(0)
+            self.assertTrue(index.load(f.readline(), size))
+        stored = len(index.offsets)
+        self.assertEqual(index.find_offset(start), offset)
+        self.assertGreater(len(index.offsets), stored)
+
+        # rebuilt after the log was rotated
+        self._write_timed_log("indexed", 10)
+        index = LogIndex(log_file, interval=4096)
+        self.assertEqual(index.find_offset(start),
+                         os.path.getsize(log_file))
+
+    def test_read_lines_reversed(self):
+        os.makedirs(self.test_dir, exist_ok=True)
+        test_file = join(self.test_dir, "reversed.txt")
+        for content in ("", "\n", "single", "a\nb\n", "a\n\nb",
+                        "".join(f"line {i} \u00e9\n" for i in range(500))):
+            with open(test_file, "w") as f:
+                f.write(content)
+            expected = content.split("\n")[::-1]
+            if content.endswith("\n") or not content:
+                expected = expected[1:]
+            for chunk_size in (1, 3, 64, 64 * 1024):
+                self.assertEqual(
+                    list(read_lines_reversed(test_file, chunk_size)),
+                    expected)
+
+    def test_get_last_load_time(self):
+        log_file = self._write_timed_log("skills", 300)
+        with open(log_file, "a") as f:
+            f.write("2023-12-01 13:00:00.000 - skills - mod:func:1 - INFO - "
+                    "Loading message bus configs\n")
+            f.write("2023-12-01 13:00:01.000 - skills - mod:func:2 - INFO - "
+                    "loaded\n")
+        self.assertEqual(get_last_load_time([self.test_dir]),
+                         datetime(2023, 12, 1, 13))
+
+        # logs written in "jsonl" format
+        load_time = datetime(2023, 12, 1, 14)
+        with open(log_file, "w") as f:
+            for offset, message in ((0, "before"),
+                                     (60, "Loading message bus configs"),
+                                     (61, "loaded")):
+                f.write(orjson.dumps({
+                    "timestamp": load_time.timestamp() + offset,
+                    "level": "INFO", "source": "skills", "module": "mod",
+                    "function": "func", "line": 1,
+                    "message": message}).decode() + "\n")
+        self.assertEqual(get_last_load_time([self.test_dir]),
+                         load_time + timedelta(seconds=60))
+
+    def test_parse_files(self):
+        first = self._write_timed_log("first", 3000)
+        second = self._write_timed_log("second", 1000)
+        base = datetime(2023, 12, 1, 12)
+        start = base + timedelta(seconds=500)
+        end = base + timedelta(seconds=2500)
+
+        expected = [str(e) for e in
+                    OVOSLogParser.parse_file(first, start, end)]
+        self.assertEqual(OVOSLogParser.split_range(first, 0, 100, 4096),
+                         [(0, 100)])
+        ranges = OVOSLogParser.split_range(first, 0, os.path.getsize(first),
+                                           4096)
+        self.assertGreater(len(ranges), 10)
+        self.assertEqual(ranges[0][0], 0)
+        self.assertEqual(ranges[-1][1], os.path.getsize(first))
+
+        for processes in (1, 2):
+            entries = list(OVOSLogParser.parse_files(
+                [first, second], start, end, processes=processes,
+                chunk_size=4096))
+            timestamps = [e.timestamp for _, e in entries]
+            self.assertEqual(timestamps, sorted(timestamps))
+            self.assertEqual([str(e) for s, e in entries if s == first],
+                             expected)
+            self.assertEqual(len([s for s, e in entries if s == second]),
+                             500 + 5)
+            traces = [e for _, e in entries if isinstance(e, Traceback)]
+            self.assertEqual(len(traces), 20 + 5)
+            self.assertEqual(traces[0].frames[0].lineno, "1")
+
+        entries = list(OVOSLogParser.parse_files(
+            [first, second], levels={"EXCEPTION"}, processes=2,
+            chunk_size=4096))
+        self.assertEqual(len(entries), 30 + 10)
+        self.assertTrue(all(isinstance(e, Traceback) for _, e in entries))
+
+    def test_parse(self):
+        line = "2023-12-01 12:00:05.123 - skills - ovos_core.skill_manager:" \
+               "_load_skill:42 - INFO - loaded skill - with dashes\n"
+        log = OVOSLogParser.parse(line)
+        self.assertEqual(log, LogLine(datetime(2023, 12, 1, 12, 0, 5, 123000),
+                                      "skills",
+                                      "ovos_core.skill_manager:_load_skill:42",
+                                      "INFO", "loaded skill - with dashes"))
+        self.assertFalse(hasattr(log, "__dict__"))
+
+        # continuation lines keep the last timestamp
+        log = OVOSLogParser.parse("  more text\n", log.timestamp)
+        self.assertEqual(log.message, "  more text")
+        self.assertEqual(log.timestamp, datetime(2023, 12, 1, 12, 0, 5, 123000))
+        self.assertEqual(OVOSLogParser.parse("text").timestamp, "")
+
+        for timestamp in ("2023-12-01 12:00:05.1", "2023-12-01 12:00:05.12",
+                          "2023-12-01 12:00:05.123456", "2024-02-29 23:59:59.999",
+                          "2023-12-01 12:00:06.000"):
+            self.assertEqual(OVOSLogParser.parse_timestamp(timestamp),
+                             datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S.%f"))
+
+    def test_log_follower(self):
+        os.makedirs(self.test_dir, exist_ok=True)
+        first = join(self.test_dir, "follow_a.log")
+        second = join(self.test_dir, "follow_b.log")
+        record = "2023-12-01 12:00:{:02d}.000 - {} - {} - {} - message {}\n"
+        with open(first, "w") as f:
+            f.write(record.format(0, "a", "mod:f:1", "INFO", "old"))
+
+        follower = LogFollower([first, second])
+        self.assertEqual(follower.poll(), [])
+
+        with open(first, "a") as f:
+            f.write(record.format(1, "a", "mod:f:1", "INFO", 1))
+            f.write(record.format(3, "a", "mod.sub:f:1", "ERROR", 3))
+            f.write("Traceback (most recent call last):\n"
+                    '  File "/tmp/test.py", line 1, in func\n'
+                    "    raise ValueError()\n"
+                    "ValueError\n")
+            # incomplete line
+            f.write(record.format(5, "a", "mod:f:1", "INFO", 5)[:20])
+        with open(second, "w") as f:
+            f.write(record.format(2, "b", "other:f:1", "DEBUG", 2))
+        entries = follower.poll()
+        self.assertEqual([source for source, _ in entries],
+                         [first, second, first])
+        self.assertEqual([e.message for _, e in entries],
+                         ["message 1", "message 2", "message 3"])
+        # the traceback is complete once nothing else was appended
+        (source, trace), = follower.poll()
+        self.assertIsInstance(trace, Traceback)
+        self.assertEqual(trace.exception, "ValueError")
+        self.assertEqual(trace.timestamp, datetime(2023, 12, 1, 12, 0, 3))
+
+        # rotation completes the pending line and follows the new file
+        with open(first, "a") as f:
+            f.write(record.format(5, "a", "mod:f:1", "INFO", 5)[20:-1])
+        os.rename(first, first + ".1")
+        with open(first, "w") as f:
+            f.write(record.format(6, "a", "mod:f:1", "INFO", 6))
+        self.assertEqual([e.message for _, e in follower.poll()],
+                         ["message 5", "message 6"])
+
+        # truncation restarts at the beginning of the file
+        with open(first, "w"):
+            pass
+        self.assertEqual(follower.poll(), [])
+        with open(first, "a") as f:
+            f.write(record.format(7, "a", "mod:f:1", "INFO", 7))
+        self.assertEqual([e.message for _, e in follower.poll()],
+                         ["message 7"])
+        follower.close()
+
+        entries = [LogLine(location="mod:f:1", level="ERROR"),
+                   Traceback([], "ValueError"),
+                   LogLine(location="module:f:1", level="ERROR"),
+                   Traceback([], "KeyError"),
+                   LogLine(location="mod.sub:f:1", level="INFO")]
+        filtered = list(OVOSLogParser.filter_entries(entries,
+                                                     modules=["mod"]))
+        self.assertEqual(len(filtered), 3)
+        self.assertEqual(filtered[1].exception, "ValueError")
+        filtered = list(OVOSLogParser.filter_entries(
+            entries, levels={"ERROR", "EXCEPTION"}, modules=["mod"]))
+        self.assertEqual(len(filtered), 2)
+
+        # tracebacks follow the record before them in the same log
+        merged = [("a", entries[0]), ("b", entries[2]), ("a", entries[1]),
+                  ("b", entries[3])]
+        filtered = list(OVOSLogParser.filter_source_entries(
+            merged, modules=["mod"]))
+        self.assertEqual(filtered, [merged[0], merged[2]])
+
+    def test_format_logline(self):
+        log = LogLine(datetime(2023, 12, 1, 12), "skills", "mod:train:1",
+                      "INFO", "[not markup]")
+        console = Console(file=io.StringIO(), width=200)
+        console.print(format_logline(log, "skills"), emoji=False)
+        output = console.file.getvalue()
+        self.assertIn("[not markup]", output)
+        self.assertIn("mod:train:1", output)
+        self.assertTrue(output.startswith("skills "))
+
+    def test_print_entries(self):
+        log_file = self._write_timed_log("printed", 300)
+        base = datetime(2023, 12, 1, 12)
+        start, end = base + timedelta(seconds=50), base + timedelta(seconds=250)
+        sources = {log_file: "printed"}
+        expected = [str(e) for e in
+                    OVOSLogParser.parse_file(log_file, start, end)]
+
+        output = join(self.test_dir, "printed_slice.log")
+        with patch("ovos_utils.log_parser.console",
+                   Console(file=io.StringIO())) as console:
+            count = print_entries(
+                OVOSLogParser.parse_files(sources, start, end), sources,
+                output)
+        self.assertEqual(count, 202)
+        self.assertIn("message 50", console.file.getvalue())
+        # the text output can be parsed again
+        self.assertEqual([str(e) for e in OVOSLogParser.parse_file(output)],
+                         expected)
+
+        output = join(self.test_dir, "printed_slice.jsonl")
+        with patch("ovos_utils.log_parser.console",
+                   Console(file=io.StringIO())):
+            print_entries(OVOSLogParser.parse_files(sources, start, end),
+                          sources, output, "json")
+        with open(output) as f:
+            lines = [orjson.loads(line) for line in f]
+        self.assertEqual(len(lines), 202)
+        self.assertEqual(lines[0]["message"], "message 50")
+        self.assertEqual(lines[0]["service"], "printed")
+        self.assertEqual(lines[51]["level"], "TRACEBACK")
+        self.assertEqual(lines[51]["frames"][0]["lineno"], "1")
+
+        # nothing is written without entries
+        output = join(self.test_dir, "empty_slice.log")
+        self.assertEqual(print_entries([], sources, output), 0)
+        self.assertFalse(isfile(output))
+
+    def test_remove_log_head(self):
+        log_file = self._write_timed_log("reduced", 200)
+        with open(log_file, "rb") as f:
+            content = f.read()
+        inode = os.stat(log_file).st_ino
+        # a running service keeps appending to the same file
+        with open(log_file, "ab") as service:
+            self.assertTrue(remove_log_head(log_file, 1000, chunk_size=64))
+            service.write(b"appended\n")
+        self.assertEqual(os.stat(log_file).st_ino, inode)
+        with open(log_file, "rb") as f:
+            self.assertEqual(f.read(), content[1000:] + b"appended\n")
+
+        # fallback when the kernel copy is not supported
+        log_file = self._write_timed_log("reduced", 200)
+        with patch("os.copy_file_range", side_effect=OSError, create=True):
+            self.assertTrue(remove_log_head(log_file, 1000, chunk_size=64))
+        with open(log_file, "rb") as f:
+            self.assertEqual(f.read(), content[1000:])
+        self.assertFalse(remove_log_head(log_file, 0))
+
+    # ComboLock creates its lock file in the working directory
+    @patch("ovos_utils.log_parser.get_log_lock", return_value=Lock())
+    def test_reduce(self, get_log_lock):
+        runner = CliRunner()
+        log_file = self._write_timed_log("reduce", 500)
+        with open(log_file, "rb") as f:
+            content = f.read()
+        args = ["reduce", "-p", self.test_dir, "-l", "reduce"]
+
+        # records before the date are removed, the rest is kept as written
+        result = runner.invoke(ovos_logs, args + ["-d", "2023-12-01 12:05"])
+        self.assertEqual(result.exit_code, 0, result.output)
+        cut = content.index(b"2023-12-01 12:05:00.000")
+        with open(log_file, "rb") as f:
+            self.assertEqual(f.read(), content[cut:])
+
+        # the size limit cuts at the start of a record
+        runner.invoke(ovos_logs, args + ["-s", "1000"])
+        with open(log_file, "rb") as f:
+            reduced = f.read()
+        self.assertLessEqual(len(reduced), 1000)
+        self.assertTrue(content.endswith(reduced))
+        self.assertTrue(reduced[:1].isdigit())
+
+        runner.invoke(ovos_logs, args)
+        self.assertEqual(os.path.getsize(log_file), 0)
+        get_log_lock.assert_called()
+
+    def test_log_stats(self):
+        base = datetime(2023, 12, 1, 12)
+        frame = Frame("/tmp/skill.py", "1", "handler", "raise")
+        stats = LogStats(bucket=60, max_keys=4, max_exceptions=2)
+        stats.add("skills", LogLine(base, "skills", "a.b:f:1", "ERROR", "x"))
+        stats.add("skills", LogLine(base + timedelta(seconds=59), "skills",
+                                    "a.b:f:2", "ERROR", "x"))
+        stats.add("skills", LogLine(base + timedelta(seconds=59), "", "",
+                                    "", "continued"))
+        stats.add("skills", Traceback([frame], "ValueError: x", base))
+        stats.add("skills", Traceback([frame], "ValueError: y", base))
+        stats.add("bus", LogLine(base + timedelta(seconds=61), "bus",
+                                 "c:f:1", "INFO", "x"))
+        self.assertEqual(stats.counts, {(base, "skills", "ERROR", "a.b"): 2,
+                                        (base + timedelta(minutes=1), "bus",
+                                         "INFO", "c"): 1})
+        self.assertEqual(stats.start, base)
+        self.assertEqual(stats.end, base + timedelta(seconds=61))
+        self.assertEqual(stats.top_exceptions(),
+                         [(("skills", ".tmp.skill:handler:1", "ValueError"),
+                           2)])
+
+        # bounded memory
+        for module in ("d", "e", "f"):
+            stats.add("bus", LogLine(base, "bus", f"{module}:f:1", "INFO"))
+        stats.add("bus", LogLine(base, "bus", "g:f:1", "INFO"))
+        self.assertEqual(len(stats.counts), 4)
+        self.assertEqual(stats.dropped, 2)
+        stats.add("bus", Traceback([frame], "KeyError", base))
+        stats.add("bus", Traceback([frame], "TypeError", base))
+        self.assertEqual(len(stats.exceptions), 2)
+        self.assertEqual(stats.top_exceptions(1)[0][1], 2)
+        self.assertEqual(stats.totals(1), {("skills",): {"ERROR": 2},
+                                           ("bus",): {"INFO": 3}})
+
+        # the number of counters does not grow with the time range
+        stats = LogStats(bucket=1, max_keys=10)
+        for i in range(5000):
+            stats.add("bus", LogLine(base + timedelta(seconds=i), "bus",
+                                     "c:f:1", "INFO"))
+        self.assertEqual(len(stats.counts), 10)
+        self.assertEqual(sum(stats.counts.values()) + stats.dropped, 5000)
+
+        # older buckets lose their module breakdown first
+        stats = LogStats(bucket=60, max_keys=6)
+        for i in range(180):
+            stats.add("bus", LogLine(base + timedelta(seconds=i), "bus",
+                                     f"m{i % 3}:f:1", "INFO"))
+        self.assertEqual(stats.dropped, 0)
+        self.assertEqual(stats.counts, {
+            (base, "bus", "INFO", "other"): 60,
+            (base + timedelta(minutes=1), "bus", "INFO", "other"): 60,
+            **{(base + timedelta(minutes=2), "bus", "INFO", f"m{i}"): 20
+               for i in range(3)}})
+        # late messages of merged buckets are counted as "other"
+        stats.add("bus", LogLine(base, "bus", "m4:f:1", "INFO"))
+        self.assertEqual(stats.counts[(base, "bus", "INFO", "other")], 61)
+        # messages without a counter are dropped once all are in use
+        for module in ("m4", "m5"):
+            stats.add("bus", LogLine(base + timedelta(minutes=2), "bus",
+                                     f"{module}:f:1", "INFO"))
+        self.assertEqual(len(stats.counts), 6)
+        self.assertEqual(stats.dropped, 1)
+        self.assertEqual(stats.as_dict()["dropped"], 1)
+
+    def test_tail_command(self):
+        sources = {self._write_timed_log(name, 3): name
+                   for name in ("alpha", "beta")}
+
+        def follow(follower, interval):
+            # yield what is in the logs instead of waiting for new lines
+            return OVOSLogParser.parse_files(sources)
+
+        with patch("ovos_utils.log_parser.console",
+                   Console(file=io.StringIO(), width=200)) as console, \
+                patch.object(LogFollower, "follow", follow):
+            result = CliRunner().invoke(ovos_logs, [
+                "tail", "-p", self.test_dir, "-l", "alpha", "-l", "beta",
+                "-i"])
+        self.assertEqual(result.exit_code, 0, result.output)
+        lines = console.file.getvalue().splitlines()
+        self.assertEqual(len(lines), 6)
+        # merged output of several logs names the service of each line
+        self.assertEqual(sorted(line.split(" ", 1)[0] for line in lines),
+                         ["alpha"] * 3 + ["beta"] * 3)
+        self.assertTrue(all(" I message " in line for line in lines))
+
+    def test_help_defaults(self):
+        # option defaults scan the log directories, not done to show help
+        result = CliRunner().invoke(ovos_logs, ["slice", "--help"])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("(dynamic)", result.output)
+
+    def test_stats_command(self):
+        self._write_timed_log("stats", 300)
+        result = CliRunner().invoke(ovos_logs, [
+            "stats", "-p", self.test_dir, "-l", "stats", "-s",
+            "2023-12-01 12:00", "-u", "2023-12-01 13:00", "-b", "60", "-j"])
+        self.assertEqual(result.exit_code, 0, result.output)
+        data = orjson.loads(result.output)
+        self.assertEqual(data["bucket"], 60)
+        self.assertEqual([c["count"] for c in data["counts"]],
+                         [60, 60, 60, 60, 60])
+        self.assertEqual(data["exceptions"],
+                         [{"service": "stats", "location": ".tmp.test:func:1",
+                           "exception": "ValueError", "count": 3}])
+
+    def test_slice_unwritable_file(self):
+        self._write_timed_log("unwritable", 3)
+        with patch("ovos_utils.log_parser.console",
+                   Console(file=io.StringIO(), width=200)) as console:
+            result = CliRunner().invoke(ovos_logs, [
+                "slice", "-p", self.test_dir, "-l", "unwritable", "-s",
+                "2023-12-01 12:00", "-u", "2023-12-01 13:00", "-f",
+                join(self.test_dir, "missing", "slice.log")])
+        self.assertEqual(result.exit_code, 1, result.output)
+        output = console.file.getvalue()
+        self.assertIn("is not writable. Aborted", output)
+        self.assertNotIn("No logs found", output)
+
+    def _write_segment(self, path: str, first: int, count: int):
+        base = datetime(2023, 12, 1, 12)
+        lines = "".join(
+            f"{(base + timedelta(seconds=i)).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}"
+            f" - rotated - mod:func:1 - INFO - message {i}\n"
+            for i in range(first, first + count))
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "wt") as f:
+            f.write(lines)
+
+    def test_rotated_logs(self):
+        directory = join(self.test_dir, "rotated")
+        os.makedirs(directory, exist_ok=True)
+        log_file = join(directory, "rotated.log")
+        self._write_segment(log_file + ".3.gz", 0, 100)
+        self._write_segment(log_file + ".2.gz", 100, 100)
+        self._write_segment(log_file + ".1", 200, 100)
+        self._write_segment(log_file, 300, 100)
+        self.assertEqual(get_rotated_logs(log_file),
+                         [log_file + ".1", log_file + ".2.gz",
+                          log_file + ".3.gz"])
+
+        messages = [e.message for e in
+                    OVOSLogParser.parse_file(log_file, rotated=True)]
+        self.assertEqual(messages, [f"message {i}" for i in range(400)])
+        self.assertEqual(len(list(OVOSLogParser.parse_file(log_file))), 100)
+
+        base = datetime(2023, 12, 1, 12)
+        start = base + timedelta(seconds=150)
+        end = base + timedelta(seconds=250)
+        self.assertEqual(OVOSLogParser.get_segments(log_file, start, end),
+                         [log_file + ".2.gz", log_file + ".1"])
+        self.assertEqual(OVOSLogParser.get_segments(
+            log_file, base + timedelta(seconds=350)), [log_file])
+        messages = [e.message for e in
+                    OVOSLogParser.parse_file(log_file, start, end,
+                                             rotated=True)]
+        self.assertEqual(messages, [f"message {i}" for i in range(150, 250)])
+        for processes in (1, 2):
+            entries = OVOSLogParser.parse_files([log_file], start, end,
+                                                processes=processes,
+                                                chunk_size=1024)
+            self.assertEqual([e.message for _, e in entries],
+                             [f"message {i}" for i in range(150, 250)])
+
+    def test_import_time(self):
+        import subprocess
+
+        # the parser must not pull in the dependencies of the cli, and the
+        # cli must not read the configuration or build a console on import
+        heavy = ["rich.console", "dateutil.parser", "ovos_config.config",
+                 "combo_lock", "concurrent.futures.process"]
+        for module, unwanted in (("ovos_utils.log_parsing", heavy + ["rich_click"]),
+                                 ("ovos_utils.log_parser", heavy)):
+            code = (f"import sys, time; start = time.perf_counter(); import {module}; "
+                    f"print(time.perf_counter() - start); "
+                    f"print([m for m in {unwanted!r} if m in sys.modules])")
+            output = subprocess.check_output([sys.executable, "-c", code],
+                                             text=True).splitlines()
+            self.assertEqual(output[1], "[]", module)
+            self.assertLess(float(output[0]), 2.0, module)